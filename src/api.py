@@ -8,10 +8,21 @@ Any modifications you make here will not work when it comes to a tournament.
 If you have found a bug, say, dont fix it yourself.
 
 """
+import asyncio
+import heapq
+import inspect
+import operator
 import time
-from copy import deepcopy
+import traceback
+from typing import Iterable, Iterator, NamedTuple, Optional
 
-from .dictionary import Dictionary
+from .board import BoardSnapshot
+from .dictionary import ReadOnlyDictionary
+from .movegen import GeneratedMove
+from .rack import Rack
+from .sandbox import BotCrashed, BotProcess, BotTimeout, in_bot_process
+from .tile import TileBag
+from .unseen import SLOTS, UnseenTiles, full_counts
 
 
 class NotReadyException(Exception):
@@ -24,6 +35,21 @@ class EarlyExitException(Exception):
     pass
 
 
+class PlayedMove(NamedTuple):
+    word: str
+    x: int
+    y: int
+    is_vertical: bool
+    score: int  # bingo included
+    player: str
+    placed: tuple[tuple[int, int, str], ...]  # (x, y, letter) of every new tile
+
+
+class PlacementCheck(NamedTuple):
+    valid: bool
+    score: int  # what place_word would award, bingo included. 0 if not valid
+
+
 class EarlyExitContextManager:
     def __enter__(self):
         return self
@@ -41,10 +67,21 @@ class Api:
         self.__player = None
         self.__game = None
         self.__board = None
+        self.__dictionary = None
 
         self.__task = None
+        self.__proposal = None  # best move so far this turn, played if the turn ends without an action
+        self.__forward_proposal = None  # in a bot process, sends proposals to the host as they're made
+        self.__in_bot_process = False
+        self.__turn_deadline = 0.0
+        self.__event_loop: Optional[asyncio.AbstractEventLoop] = None  # runs an async _on_turn in a blocking game
         self.__hooked = False
         self.__hand_is_visible = False
+        self.__history_seen = 0  # how much of the games history this bot has had a turn after
+        self.__process: Optional[BotProcess] = None
+        self.__synced = 0  # how much of the games history the bot process has been sent
+        self.__unseen = full_counts()  # every tile not on the board, kept up to date from the history
+        self.__unseen_synced = 0
 
     @staticmethod
     def __get_game_class(): # Cursed. But it stops a circular import error
@@ -58,6 +95,8 @@ class Api:
         self.__player = player
         self.__game = game
         self.__board = self.__game.board
+        self.__dictionary = self.__game.dictionary.read_only()
+        self.__history_seen = len(self.__game.history)
         self.__hooked = True
 
         self._init()
@@ -65,6 +104,48 @@ class Api:
         # After starting the bot, we can unhide some info ready for the first round
         self.__hand_is_visible = True
 
+    def isolate(self):
+        """Called by the game before the first turn, from then on the bot runs in its own process (see sandbox.py)"""
+        if not self.__hooked or self.__process is not None:
+            raise RuntimeError("Stop Messing with shit")
+
+        self.__synced = len(self.__game.history)
+        self.__process = BotProcess(self)
+
+    def release(self):
+        """Called by the game when it ends"""
+        if self.__process is not None:
+            self.__process.close()
+            self.__process = None
+        if self.__event_loop is not None:
+            self.__event_loop.close()
+            self.__event_loop = None
+
+    def serve(self, conn):
+        """
+        Main loop of the bot's own process (see sandbox.py): plays each turn
+        the host sends over conn until told to stop. Proposals are sent as
+        they're made, so they outlive the bot being stopped.
+        """
+        if not self.__hooked or not in_bot_process():
+            raise RuntimeError("Stop Messing with shit")
+
+        self.__forward_proposal = lambda proposal: conn.send(("proposal", proposal, 0.0))
+        self.__in_bot_process = True
+        while True:
+            try:
+                state = conn.recv()
+            except EOFError:
+                return
+            if state is None:
+                return
+            try:
+                self.__load_state(state)
+                task, elapsed = self.__decide()
+                conn.send(("ok", task, elapsed))
+            except Exception:
+                conn.send(("error", traceback.format_exc(), 0.0))
+
     # Helpers
 
     @property
@@ -75,16 +156,18 @@ class Api:
         return self.__board.rows, self.__board.cols
 
     @property
-    def board(self) -> list[list]:
+    def board(self) -> BoardSnapshot:
         """
-        Returns a copy of the board.
+        Returns a read only snapshot of the board, board[row][col] works like before.
+        It's the same object until the board changes, and board.version goes
+        up whenever it does, so anything you work out from it can be cached.
 
         THIS IS NOT THE ACTUAL BOARD CLASS BENEDICT DON'T TRY TO CALL RANDOM METHODS
         """
         if not self.__hooked:
             raise NotReadyException("Cannot access properties of the board. Game has not been started")
 
-        return deepcopy(self.__board.grid)
+        return self.__board.snapshot()
 
     def get_tiles_in_hand(self) -> list[str]:
         if not self.__hooked:
@@ -97,11 +180,29 @@ class Api:
             tile.letter for tile in self.__player.hand
         ]
 
-    def get_dictionary(self) -> Dictionary:
+    def get_rack(self) -> Rack:
+        """
+        Your hand as letter counts. rack.can_make(word) checks one word,
+        rack.formable(self.get_dictionary().word_counts) finds every word
+        your hand can make on its own in one go.
+        """
+        if not self.__hooked:
+            raise NotReadyException("Cannot access properties of the player. Game has not been started")
+
+        if not self.__hand_is_visible:
+            raise NotReadyException("Your hand has not yet been delt")
+
+        return self.__player.rack
+
+    def get_dictionary(self) -> ReadOnlyDictionary:
+        """
+        Returns a read only view of the games dictionary. Every call returns
+        the same shared object, so there is no need to cache it yourself.
+        """
         if not self.__hooked:
             raise NotReadyException("Cannot access properties of the game. Game has not been started")
 
-        return deepcopy(self.__game.dictionary)
+        return self.__dictionary
 
     def check_placement(self, word: str, is_vertical: bool, x: int, y: int) -> bool:
         if not self.__hooked:
@@ -109,8 +210,148 @@ class Api:
 
         return self.__game.is_placement_valid(y, x, word, is_vertical,
                                               raise_errors=False)
+
+    def check_placements(self, placements: Iterable[tuple]) -> list[PlacementCheck]:
+        """
+        check_placement for lots of candidates at once, each
+        (word, is_vertical, x, y), with the score place_word would give.
+        A malformed candidate is just not valid. The board is never touched.
+        """
+        if not self.__hooked:
+            raise NotReadyException("Cannot access properties of the board. Game has not been started")
+
+        # Checking a candidate measures it against the board, which scores it
+        # too, so there's nothing left over to batch score afterwards.
+        evaluate = self.__game.evaluate_move
+        results = []
+        for placement in placements:
+            try:
+                word, is_vertical, x, y, *_ = placement
+                x, y = operator.index(x), operator.index(y)
+            except (TypeError, ValueError):
+                results.append(PlacementCheck(False, 0))
+                continue
+            if type(word) is not str:
+                results.append(PlacementCheck(False, 0))
+                continue
+            evaluation = evaluate(y, x, word, bool(is_vertical))
+            results.append(PlacementCheck(True, evaluation.score) if evaluation.valid else PlacementCheck(False, 0))
+        return results
+
+    def get_moves_since_last_turn(self) -> list[PlayedMove]:
+        """
+        Every word played since the end of your last turn (since the start
+        of the game before your first), oldest first, with the squares each
+        one filled. Exchanges and passes don't change the board so aren't
+        listed. Enough to keep your own view of the board up to date
+        without looking at all of it.
+        """
+        if not self.__hooked:
+            raise NotReadyException("Cannot access properties of the game. Game has not been started")
+
+        cols = self.__board.cols
+        moves = []
+        for turn in self.__game.history[self.__history_seen:]:
+            if turn.move is None:
+                continue
+            move = turn.move
+            placed = tuple(
+                (index % cols, index // cols, letter) for index, letter in zip(move.placed, move.letters)
+            )
+            moves.append(PlayedMove(move.word, move.col, move.row, move.is_vertical, turn.score, turn.player, placed))
+        return moves
+
+    def get_unseen_tiles(self) -> UnseenTiles:
+        """
+        Every tile you haven't seen: the full set minus the board and your
+        hand, i.e. the bag plus the other players' hands. Also works out
+        the odds of drawing letters, e.g.
+            unseen.p_at_least(3)[TileBag.slots["s"]]  chance of an s in 3 draws
+            unseen.p_draw("es", 2)                     chance of both an e and an s
+        """
+        if not self.__hooked:
+            raise NotReadyException("Cannot access properties of the game. Game has not been started")
+
+        history = self.__game.history
+        unseen = self.__unseen
+        for turn in history[self.__unseen_synced:]:
+            move = turn.move
+            if move is None:
+                continue
+            for square, letter in zip(move.placed, move.letters):
+                unseen[SLOTS["?" if square in move.blanks else letter.lower()]] -= 1
+        self.__unseen_synced = len(history)
+
+        counts = unseen.copy()
+        for tile in self.__player.hand:
+            counts[SLOTS[tile.letter]] -= 1
+        return UnseenTiles(counts)
+
+    def iter_moves(self) -> Iterator[GeneratedMove]:
+        """
+        Every legal move for your hand, one at a time, as
+        (word, is_vertical, x, y, score) with score including any bingo bonus.
+        Stop whenever you like, moves are only worked out as you ask for them.
+        """
+        if not self.__hooked:
+            raise NotReadyException("Cannot access properties of the board. Game has not been started")
+
+        rack = [tile.letter for tile in self.__player.hand]
+        return map(self.__game.move_generator.as_tuple, self.__game.move_generator.generate(rack))
+
+    def generate_moves(self, best: Optional[int] = None) -> list[GeneratedMove]:
+        """
+        Every legal move for your hand, see iter_moves, all scored in one
+        batch (quicker than iter_moves when you want them all).
+        With best=k just the k highest scoring, best first.
+        """
+        if not self.__hooked:
+            raise NotReadyException("Cannot access properties of the board. Game has not been started")
+
+        rack = [tile.letter for tile in self.__player.hand]
+        candidates, scores = self.__game.move_generator.scored(rack)
+        scores = scores.tolist()
+        order = range(len(candidates))
+        if best is not None:
+            order = heapq.nlargest(best, order, key=scores.__getitem__)
+        moves = []
+        for i in order:
+            row, col, word, is_vertical = candidates[i]
+            moves.append(GeneratedMove(word, is_vertical, col, row, scores[i]))
+        return moves
+
+    def deadline(self) -> float:
+        """
+        The time.perf_counter() value at which your clock runs out this turn.
+        With isolated bots you are stopped there (propose_move first!).
+        """
+        if not self.__hooked:
+            raise NotReadyException("Cannot access properties of the player. Game has not been started")
+
+        return self.__turn_deadline
+
+    def time_left(self) -> float:
+        """Seconds left on your clock, counting down during your turn"""
+        return max(0.0, self.deadline() - time.perf_counter())
+
     # Actions
 
+    def propose_move(self, word: str, is_vertical: bool, x: int, y: int) -> None:
+        """
+        Remembers this as your best move so far WITHOUT ending your turn, so
+        you can keep searching for something better. If your turn ends
+        without place_word, discard_letters or pass_turn (you return, or you
+        run out of time) the last proposal is played. Proposals are only
+        checked when played, an invalid one is a pass (in every game, unlike
+        an invalid place_word which only passes in headless games).
+        """
+        if type(word) is not str or type(is_vertical) is not bool or type(x) is not int or type(y) is not int:
+            raise MoveException(f"Invalid arguments passed to Api.propose_move(word: str, is_vertical: bool, x: int, y: int)")
+
+        self.__proposal = ("propose", (y, x, word, is_vertical))
+        if self.__forward_proposal:
+            self.__forward_proposal(self.__proposal)
+
     def place_word(self, word: str, is_vertical: bool, x: int, y: int) -> None:
         """ Calling this method ends your turn instantly """
         if type(word) is not str or type(is_vertical) is not bool and type(x) is not int and type(y) is not int:
@@ -132,37 +373,154 @@ class Api:
         self.__task = ("pass", ())
         raise EarlyExitException
 
-    def on_turn(self):
-        self.__task = None
+    def __decide(self) -> tuple[Optional[tuple], float]:
+        """
+        runs the bot, returns what it chose to do (its last proposal if it
+        didn't choose, None if it didn't propose either) and how long it took
+        """
+        start = self.__start_turn()
 
-        start = time.perf_counter()
+        with EarlyExitContextManager():
+            turn = self._on_turn()
+            if inspect.isawaitable(turn):
+                if self.__event_loop is None:
+                    # the same loop every turn, so anything the bot made on it keeps working
+                    self.__event_loop = asyncio.new_event_loop()
+                self.__event_loop.run_until_complete(turn)
+
+        return self.__task or self.__proposal, time.perf_counter() - start
+
+    async def __decide_async(self) -> tuple[Optional[tuple], float]:
+        """__decide for a game on an event loop, an async _on_turn is awaited on it"""
+        start = self.__start_turn()
 
         with EarlyExitContextManager():
-            self._on_turn()
+            turn = self._on_turn()
+            if inspect.isawaitable(turn):
+                await turn
+
+        return self.__task or self.__proposal, time.perf_counter() - start
+
+    def __start_turn(self) -> float:
+        self.__task = None
+        self.__proposal = None
+        start = time.perf_counter()
+        self.__turn_deadline = start + self.__player.time_remaining_s
+        return start
+
+    def __state_for_process(self) -> tuple:
+        """everything the bot process's copy of the game is missing"""
+        game = self.__game
+        history = game.history[self.__synced:]
+        self.__synced = len(game.history)
+        return (
+            bytes(self.__board.cells),
+            bytes(self.__board.used),
+            [tile.letter for tile in self.__player.hand],
+            [(player.score, player.time_remaining_s) for player in game.players],
+            history,
+            self.__history_seen,
+            game.player_turn,
+        )
+
+    def __load_state(self, state: tuple):
+        """bot process side of __state_for_process, the host's game is never loaded into"""
+        if not self.__in_bot_process:
+            raise RuntimeError("Stop Messing with shit")
 
-        elapsed = time.perf_counter() - start
+        cells, used, hand, players, history, history_seen, player_turn = state
+        board, game = self.__board, self.__game
+        for index, (old, new) in enumerate(zip(board.cells, cells)):
+            if old != new:
+                board._write(index, new)
+        for index, (old, new) in enumerate(zip(board.used, used)):
+            if old != new:
+                board._set_used(index, new)
+        self.__player.hand = [TileBag.tiles[letter] for letter in hand]
+        for player, (score, time_remaining_s) in zip(game.players, players):
+            player.score = score
+            player.time_remaining_s = time_remaining_s
+        game.history.extend(history)
+        self.__history_seen = history_seen
+        game._set_player_turn(player_turn)
+
+    def __decide_in_process(self) -> tuple[Optional[tuple], float, bool]:
+        """
+        __decide in the bot's own process, killed if it takes longer than
+        its clock allows, then (task, elapsed, timed out). A bot that's been
+        stopped or crashed plays its last proposal, or passes without one.
+        A bot that's out of time or has been killed passes.
+        """
+        game, player = self.__game, self.__player
+        if player.time_remaining_s <= 0 or not self.__process.alive:
+            game.log(f"[WARNING] {player.name} is out of time. The turn has been passed")
+            return ("pass", ()), 0.0, False
+
+        try:
+            task, elapsed = self.__process.decide(
+                self.__state_for_process(), player.time_remaining_s + game.DEADLINE_GRACE_S
+            )
+            return task, elapsed, False
+        except BotTimeout as e:
+            game.log(f"[WARNING] {player.name} ran out of time and was stopped")
+            return e.proposal, player.time_remaining_s, True
+        except BotCrashed as e:
+            game.log(f"[WARNING] {player.name} crashed\n{e}")
+            return e.proposal, 0.0, False
 
+    def on_turn(self):
+        if self.__process is not None:
+            return self.__play(*self.__decide_in_process())
+        return self.__play(*self.__decide())
+
+    async def on_turn_async(self):
+        """on_turn for a game on an event loop, other games carry on while the bot awaits"""
+        if self.__process is not None:
+            return self.__play(*await asyncio.to_thread(self.__decide_in_process))
+        return self.__play(*await self.__decide_async())
+
+    def __play(self, task: Optional[tuple], elapsed: float, timed_out=False):
+        """charges the bot's clock and carries out what it decided"""
+        self.__task = task
         self.__player.time_remaining_s -= elapsed
 
         if not self.__task:
-            print("[WARNING] A action was not performed. The turn has been passed")
+            self.__game.log("[WARNING] A action was not performed. The turn has been passed")
             self.__task = ("pass", ())
 
         task, args = self.__task
-
-        if task == "place":
-            self.__game.place_word(*args)
-            return None
-
-        elif task == "discard":
-            self.__game.discard_letters(self.__player, *args)
-            return "pass"
-
-        elif task == "pass":
-            return "pass"
-
-        else:  # This should never get raised. But I know my coding skills.
-            raise NotImplementedError(f"A task '{task}' is not implemented or is not intended")
+        turns_before = len(self.__game.history)
+
+        try:
+            if task == "place":
+                self.__game.place_word(*args)
+                return None
+
+            elif task == "propose":
+                from .game import NotAWordException  # same circular import as __get_game_class
+                try:
+                    self.__game.place_word(*args)
+                    return None
+                except (NotAWordException, ValueError) as e:
+                    self.__game.log(f"[WARNING] {self.__player.name}'s proposal was invalid ({e}). The turn has been passed")
+                    return "pass"
+
+            elif task == "discard":
+                self.__game.discard_letters(self.__player, *args)
+                return "pass"
+
+            elif task == "pass":
+                return "pass"
+
+            else:  # This should never get raised. But I know my coding skills.
+                raise NotImplementedError(f"A task '{task}' is not implemented or is not intended")
+        finally:
+            if timed_out:
+                if len(self.__game.history) == turns_before:
+                    self.__game.record_pass(self.__player, timed_out=True)
+                else:
+                    self.__game.history[-1].timed_out = True
+            self.__history_seen = len(self.__game.history)
 
 
     def _init(self):
@@ -170,6 +528,6 @@ class Api:
         pass
 
     def _on_turn(self) -> None:
-        """ This is ur bit silly """
+        """ This is ur bit silly. Can be an async def too """
         raise NotImplementedError
 
@@ -2,40 +2,309 @@
 Main board file
 """
 
+import random
+from itertools import count
 from pathlib import Path
+from typing import Optional
+
 from colorama import init
 
-from src.tile import BoardTile
+from src.move import Move
+from src.tile import BoardTile, Tile, TileBag
 
 init()  # sets up colorama
 
+EMPTY = 0
+
+# Board versions come from one counter for the whole process, so a copy of
+# a board and the original never reuse a version for different positions.
+_versions = count(1)
+
+
+def letter_code(letter: Optional[str]) -> int:
+    """what a letter is stored as in Board.cells"""
+    return EMPTY if letter in (" ", "", None) else ord(letter)
+
+
+def _load_layout() -> tuple[int, int, bytes, bytes]:
+    """
+    Reads blankboard.txt into flat (row major) letter and word multiplier
+    arrays. Returns (rows, cols, letter_multipliers, word_multipliers).
+    """
+    board_file = Path(__file__).parent / "blankboard.txt"
+    with open(board_file, "rt") as f:
+        temp = [line.strip().split() for line in f.readlines() if line.strip()]
+    letter_multipliers = bytearray()
+    word_multipliers = bytearray()
+    for row in temp:
+        for col in row:
+            tile = BoardTile.quick_create(col)
+            if tile.is_word_multiplier:
+                letter_multipliers.append(1)
+                word_multipliers.append(tile.multiplier)
+            else:
+                letter_multipliers.append(tile.multiplier)
+                word_multipliers.append(1)
+    return len(temp), len(temp[0]), bytes(letter_multipliers), bytes(word_multipliers)
+
+
+# The premium layout never changes, every board shares one copy of it.
+LAYOUT_ROWS, LAYOUT_COLS, LETTER_MULTIPLIERS, WORD_MULTIPLIERS = _load_layout()
+
+# Zobrist keys: one random 64 bit number per (square, letter code) and one
+# per square for its used_up flag. A board's hash is the xor of the keys for
+# everything on it, so it can be updated one square at a time.
+_zobrist_random = random.Random(0x5C2A881E)
+ZOBRIST_LETTERS = [
+    [0] + [_zobrist_random.getrandbits(64) for _ in range(127)]
+    for _ in range(LAYOUT_ROWS * LAYOUT_COLS)
+]
+ZOBRIST_USED = [_zobrist_random.getrandbits(64) for _ in range(LAYOUT_ROWS * LAYOUT_COLS)]
+
+# TileBag.scores indexed by letter code
+LETTER_SCORES = [0] * 128
+for _letter, _score in TileBag.scores.items():
+    LETTER_SCORES[ord(_letter)] = LETTER_SCORES[ord(_letter.upper())] = _score
+
+
+class BoardSquare(BoardTile):
+    """
+    A square of a Board. It holds no state of its own, the letter and used_up
+    flag are read from and written to the board's arrays, so a square handed
+    out by Board.get always agrees with the board.
+    """
+
+    __slots__ = ("_board", "_index")
+
+    def __init__(self, board: "Board", index: int):
+        # no super().__init__(), all the state is on the board
+        self._board = board
+        self._index = index
+
+    @property
+    def letter(self) -> str:
+        code = self._board.cells[self._index]
+        return chr(code) if code else ""
+
+    @letter.setter
+    def letter(self, letter: Optional[str]):
+        self._board._write(self._index, letter_code(letter))
+
+    @property
+    def used_up(self) -> bool:
+        return bool(self._board.used[self._index])
+
+    @used_up.setter
+    def used_up(self, used_up: bool):
+        self._board._set_used(self._index, used_up)
+
+    @property
+    def multiplier(self) -> int:
+        word = self._board.word_multipliers[self._index]
+        return word if word > 1 else self._board.letter_multipliers[self._index]
+
+    @property
+    def is_word_multiplier(self) -> bool:
+        return self._board.word_multipliers[self._index] > 1
+
+
+class SnapshotSquare(BoardTile):
+    """A square of a BoardSnapshot, read only"""
+
+    __slots__ = ("_snapshot", "_index")
+
+    def __init__(self, snapshot: "BoardSnapshot", index: int):
+        # no super().__init__(), all the state is on the snapshot
+        self._snapshot = snapshot
+        self._index = index
+
+    @property
+    def letter(self) -> str:
+        code = self._snapshot.cells[self._index]
+        return chr(code) if code else ""
+
+    @property
+    def used_up(self) -> bool:
+        return bool(self._snapshot.used[self._index])
+
+    @property
+    def multiplier(self) -> int:
+        word = WORD_MULTIPLIERS[self._index]
+        return word if word > 1 else LETTER_MULTIPLIERS[self._index]
+
+    @property
+    def is_word_multiplier(self) -> bool:
+        return WORD_MULTIPLIERS[self._index] > 1
+
+
+class BoardSnapshot:
+    """
+    Frozen copy of a board: the letters and used_up flags as bytes, plus the
+    shared premium layout. version goes up every time the board changes and
+    is never reused, not even by a copy of the board, so two snapshots from
+    the same process with the same version are the same position and
+    anything worked out from one can be kept for the other.
+    Indexing gives rows of read only tiles, snapshot[row][col].letter, same
+    as Board.grid.
+    """
+
+    __slots__ = ("rows", "cols", "cells", "used", "version", "hash", "__grid")
+
+    letter_multipliers = LETTER_MULTIPLIERS
+    word_multipliers = WORD_MULTIPLIERS
+
+    def __init__(self, rows: int, cols: int, cells: bytes, used: bytes, version: int, hash: int):
+        for name, value in (
+            ("rows", rows), ("cols", cols), ("cells", bytes(cells)), ("used", bytes(used)),
+            ("version", version), ("hash", hash), ("_BoardSnapshot__grid", None),
+        ):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Board snapshots are read only")
+
+    def __delattr__(self, name):
+        raise AttributeError("Board snapshots are read only")
+
+    @property
+    def grid(self) -> tuple[tuple[SnapshotSquare, ...], ...]:
+        if self.__grid is None:
+            grid = tuple(
+                tuple(SnapshotSquare(self, row * self.cols + col) for col in range(self.cols))
+                for row in range(self.rows)
+            )
+            object.__setattr__(self, "_BoardSnapshot__grid", grid)
+        return self.__grid
+
+    def index(self, row, col) -> int:
+        """flat index into cells / used"""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row * self.cols + col
+        raise ValueError(f"Position {row=}, {col=} out of bounds")
+
+    def letter_at(self, row, col) -> str:
+        """letter on a square, "" if empty"""
+        code = self.cells[self.index(row, col)]
+        return chr(code) if code else ""
+
+    def is_empty(self) -> bool:
+        return not any(self.cells)
+
+    def __getitem__(self, row):
+        return self.grid[row]
+
+    def __iter__(self):
+        return iter(self.grid)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BoardSnapshot):
+            return NotImplemented
+        return self.cells == other.cells and self.used == other.used
+
+    def __hash__(self) -> int:
+        return self.hash
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return BoardSnapshot, (self.rows, self.cols, self.cells, self.used, self.version, self.hash)
+
+    def __repr__(self) -> str:
+        return f"<BoardSnapshot version {self.version}>"
+
 
 class Board:
     """
     Basic Scrabble board.
+
+    The state is two flat bytearrays indexed by row * cols + col: cells holds
+    the letter on each square as an ascii code (0 for empty) and used holds
+    the used_up flags. Premium squares are shared, read only arrays.
+    hash is a Zobrist hash of both, updated on every write, so positions
+    reached by different move orders get the same key.
+    grid / get / place are kept for convenience, hot code should use the
+    arrays and index() directly.
     """
 
     def __init__(self, rows=15, cols=15):
+        if (rows, cols) != (LAYOUT_ROWS, LAYOUT_COLS):
+            raise ValueError(f"blankboard.txt is {LAYOUT_ROWS}x{LAYOUT_COLS}, can't make a {rows}x{cols} board")
         self.rows = rows
         self.cols = cols
-        self.grid: list[list[BoardTile]] = self._create_empty_board()
+        self.cells = bytearray(rows * cols)
+        self.used = bytearray(rows * cols)
+        self.letter_multipliers = LETTER_MULTIPLIERS
+        self.word_multipliers = WORD_MULTIPLIERS
+        self.filled = 0  # number of squares with a letter on
+        self.hash = 0  # zobrist hash of letters and used_up flags, 0 when empty
+        self.moves: list[Move] = []  # undo stack for apply/undo
+        self.version = 0  # goes up on every change, unique in the process (0 for a new board)
+        self._grid: Optional[list[list[BoardSquare]]] = None
+        self._snapshot: Optional[BoardSnapshot] = None
+
+    @property
+    def grid(self) -> list[list[BoardSquare]]:
+        """the board as rows of tiles, views onto the arrays"""
+        if self._grid is None:
+            self._grid = [
+                [BoardSquare(self, row * self.cols + col) for col in range(self.cols)]
+                for row in range(self.rows)
+            ]
+        return self._grid
 
     def is_empty(self):
-        return not any(any(row) for row in self.grid)
-
-    def _create_empty_board(self):
-        board_file = Path(__file__).parent / "blankboard.txt"
-        with open(board_file, "rt") as f:
-            temp = [line.strip().split() for line in f.readlines()]
-        board = []
-        for row in temp:
-            new = []
-            for col in row:
-                tile = BoardTile.quick_create(col)
-                new.append(tile)
-            board.append(new)
+        return self.filled == 0
+
+    def _write(self, index: int, code: int):
+        """every change to a square's letter goes through here"""
+        old = self.cells[index]
+        self.version = next(_versions)
+        self.filled += (code != EMPTY) - (old != EMPTY)
+        self.hash ^= ZOBRIST_LETTERS[index][old] ^ ZOBRIST_LETTERS[index][code]
+        self.cells[index] = code
+
+    def _set_used(self, index: int, used_up: bool):
+        """every change to a square's used_up flag goes through here"""
+        if self.used[index] != used_up:
+            self.version = next(_versions)
+            self.hash ^= ZOBRIST_USED[index]
+            self.used[index] = used_up
+
+    def copy(self) -> "Board":
+        """cheap copy, just the two state arrays"""
+        board = Board.__new__(Board)
+        board.__dict__.update(self.__dict__)
+        board.cells = bytearray(self.cells)
+        board.used = bytearray(self.used)
+        board.moves = list(self.moves)
+        board._grid = None
         return board
 
+    def snapshot(self) -> BoardSnapshot:
+        """read only copy of the current position, the same object until the board changes"""
+        if self._snapshot is None or self._snapshot.version != self.version:
+            self._snapshot = BoardSnapshot(self.rows, self.cols, self.cells, self.used, self.version, self.hash)
+        return self._snapshot
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_grid"] = None
+        return state
+
+    def state(self) -> bytes:
+        """hashable snapshot of letters and used_up flags"""
+        return bytes(self.cells) + bytes(self.used)
+
     def display(self):
         """displays board with colours"""
         for i, row in enumerate(self.grid):
@@ -43,15 +312,166 @@ class Board:
             # if i < self.rows - 1:
             #     print("-" * (self.cols * 2 - 1))
 
-    def get(self, row, col):
-        """gets given tile"""
+    def index(self, row, col) -> int:
+        """flat array index of a square"""
         if 0 <= row < self.rows and 0 <= col < self.cols:
-            return self.grid[row][col]
+            return row * self.cols + col
         raise ValueError(f"Position {row=}, {col=} out of bounds")
 
-    def place(self, row, col, letter: str):
+    def letter_at(self, row, col) -> str:
+        """letter on a square, "" if empty"""
+        code = self.cells[self.index(row, col)]
+        return chr(code) if code else ""
+
+    def get(self, row, col) -> BoardSquare:
+        """gets given tile"""
+        self.index(row, col)  # bounds check
+        return self.grid[row][col]
+
+    def place(self, row, col, letter: str | Tile):
         """places a letter at given tile"""
-        self.get(row, col).place(letter)
+        index = self.index(row, col)
+        if self.cells[index]:
+            raise ValueError("Tile already has a letter")
+        if isinstance(letter, Tile):
+            letter = letter.letter
+        self._write(index, letter_code(letter))
+
+    def clear(self, row, col):
+        """removes the letter from a tile"""
+        self._write(self.index(row, col), EMPTY)
+
+    def word_squares(self, index: int, is_vertical: bool) -> tuple[int, ...]:
+        """squares of the run of tiles through index (which may be empty) going one way"""
+        cells = self.cells
+        step = self.cols if is_vertical else 1
+        if is_vertical:
+            first, last = index % self.cols, len(cells) - 1
+        else:
+            first = index - index % self.cols
+            last = first + self.cols - 1
+        start = index
+        while start - step >= first and cells[start - step]:
+            start -= step
+        end = index
+        while end + step <= last and cells[end + step]:
+            end += step
+        return tuple(range(start, end + 1, step))
+
+    def score_word(self, squares: tuple[int, ...], new: Optional[dict[int, int]] = None) -> int:
+        """
+        same as Game.calculate_word_score, straight off the arrays.
+        new maps empty squares to the letter codes about to go there.
+        """
+        cells, used = self.cells, self.used
+        letter_multipliers, word_multipliers = self.letter_multipliers, self.word_multipliers
+        total, word_multiplier = 0, 1
+        for index in squares:
+            code = cells[index] or (new[index] if new else EMPTY)
+            if used[index]:
+                total += LETTER_SCORES[code]
+            else:
+                total += LETTER_SCORES[code] * letter_multipliers[index]
+                word_multiplier *= word_multipliers[index]
+        return total * word_multiplier
+
+    def measure(self, move: Move) -> Move:
+        """
+        Works out what a move would do without playing it: fills in
+        move.placed, move.letters, move.words and move.score as apply would.
+        Raises ValueError if it doesn't fit.
+        """
+        cells, cols = self.cells, self.cols
+        word = move.word
+        first = self.index(move.row, move.col)
+        if move.is_vertical:
+            step, cross = cols, 1
+            if word:
+                self.index(move.row + len(word) - 1, move.col)
+        else:
+            step, cross = 1, cols
+            if word:
+                self.index(move.row, move.col + len(word) - 1)
+
+        new: dict[int, int] = {}
+        index = first
+        for letter in word:
+            code = cells[index]
+            if not code:
+                new[index] = ord(letter)
+            elif code != ord(letter):
+                raise ValueError(f"{word} has invalid placement at {divmod(index, cols)}")
+            index += step
+        last = index - step
+
+        # perpendicular words, only where a new tile has a neighbour that way
+        size = len(cells)
+        words = []
+        for index in new:
+            if cross == 1:
+                before = index % cols and cells[index - 1]
+                after = (index + 1) % cols and cells[index + 1]
+            else:
+                before = index >= cols and cells[index - cols]
+                after = index + cols < size and cells[index + cols]
+            if before or after:
+                words.append(self.word_squares(index, not move.is_vertical))
+
+        if word:
+            # the word runs on into any tiles touching either end
+            start, end = first, last
+            low = first % cols if move.is_vertical else first - first % cols
+            high = size - 1 if move.is_vertical else last - last % cols + cols - 1
+            while start - step >= low and cells[start - step]:
+                start -= step
+            while end + step <= high and cells[end + step]:
+                end += step
+            if end > start:
+                words.append(tuple(range(start, end + 1, step)))
+
+        move.placed = tuple(new)
+        move.letters = tuple(map(chr, new.values()))
+        move.used = ()
+        move.words = words
+        move.score = sum([self.score_word(squares, new) for squares in words])
+        move.measured_hash = self.hash
+        return move
+
+    def apply(self, move: Move) -> Move:
+        """
+        Plays a move: fills the empty squares under it, scores every word it
+        forms, then uses up the premiums of those words. What changed is
+        recorded on the move and pushed onto an undo stack, see undo.
+        Raises ValueError (and changes nothing) if it doesn't fit.
+        No dictionary or connection checks, that's Game's job.
+        A move already measured against this exact position isn't measured again.
+        """
+        if move.measured_hash != self.hash:
+            self.measure(move)
+
+        for index, letter in zip(move.placed, move.letters):
+            self._write(index, letter_code(letter))
+
+        used = []
+        for word in move.words:
+            for index in word:
+                if not self.used[index]:
+                    self._set_used(index, True)
+                    used.append(index)
+
+        move.used = tuple(used)
+        move.measured_hash = None
+        self.moves.append(move)
+        return move
+
+    def undo(self) -> Move:
+        """takes back the last applied move, returning it"""
+        move = self.moves.pop()
+        for index in move.placed:
+            self._write(index, EMPTY)
+        for index in move.used:
+            self._set_used(index, False)
+        return move
 
 
 if __name__ == "__main__":
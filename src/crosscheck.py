@@ -0,0 +1,148 @@
+"""
+Cross-check sets: for every empty square, which letters can be played there
+without making a bad word in the other direction.
+"""
+
+from array import array
+from typing import Optional
+
+from src.board import Board
+from src.dawg import ANY_LETTER, Dawg
+
+
+class CrossChecks:
+    """
+    Keeps a 26 bit letter mask per square for each play direction, bit n set
+    meaning chr(ord("a") + n) is allowed. A square with no tiles above/below
+    it allows anything when playing across, and so on.
+
+    Masks only change next to runs of tiles that changed, so after a move only
+    the squares at the ends of the lines through the new tiles are redone.
+    The masks of filled squares are meaningless.
+    """
+
+    def __init__(self, board: Board, dawg: Dawg):
+        self.board = board
+        self.dawg = dawg
+        size = board.rows * board.cols
+        self.__across = array("I", [ANY_LETTER]) * size  # playing horizontally, checks vertical words
+        self.__down = array("I", [ANY_LETTER]) * size  # playing vertically, checks horizontal words
+        self.__has_cross_across = bytearray(size)
+        self.__has_cross_down = bytearray(size)
+        self.__cells = bytes(size)
+        self.update()
+
+    def masks(self, is_vertical: bool) -> array:
+        """the mask array for playing a word in this direction, index with board.index()"""
+        self.update()
+        return self.__down if is_vertical else self.__across
+
+    def has_cross_word(self, is_vertical: bool) -> bytearray:
+        """1 for squares where a tile played in this direction also makes a cross word"""
+        self.update()
+        return self.__has_cross_down if is_vertical else self.__has_cross_across
+
+    def allows(self, row: int, col: int, letter: str, is_vertical: bool) -> bool:
+        code = ord(letter.lower()) - ord("a")
+        if not 0 <= code < 26:
+            return False
+        return bool(self.masks(is_vertical)[self.board.index(row, col)] >> code & 1)
+
+    def anchors(self) -> list[int]:
+        """empty squares next to a tile, or just the centre on an empty board"""
+        board = self.board
+        if board.is_empty():
+            return [board.index(board.rows // 2, board.cols // 2)]
+        cells, cols = board.cells, board.cols
+        anchors = []
+        for index, code in enumerate(cells):
+            if code:
+                continue
+            col = index % cols
+            if (
+                (index >= cols and cells[index - cols])
+                or (index + cols < len(cells) and cells[index + cols])
+                or (col > 0 and cells[index - 1])
+                or (col < cols - 1 and cells[index + 1])
+            ):
+                anchors.append(index)
+        return anchors
+
+    def update(self):
+        """
+        Brings the masks up to date with the board. Changed squares are found
+        by diffing against the last board seen, so any way of changing the
+        board is picked up, and nothing happens if it hasn't changed.
+        """
+        cells = self.board.cells
+        if cells == self.__cells:
+            return
+        changed = [i for i, (old, new) in enumerate(zip(self.__cells, cells)) if old != new]
+        self.__cells = bytes(cells)
+
+        cols = self.board.cols
+        redo_across: set[int] = set()
+        redo_down: set[int] = set()
+        for index in changed:
+            redo_across.add(index)
+            redo_down.add(index)
+            # the empty squares at each end of the line through index
+            for step, redo in ((cols, redo_across), (-cols, redo_across), (1, redo_down), (-1, redo_down)):
+                end = self.__run_end(index, step)
+                if end is not None:
+                    redo.add(end)
+
+        for index in redo_across:
+            self.__recompute(index, cols, self.__across, self.__has_cross_across)
+        for index in redo_down:
+            self.__recompute(index, 1, self.__down, self.__has_cross_down)
+
+    def __in_line(self, index: int, start: int, step: int) -> bool:
+        """is index on the board and in the same row/column as start"""
+        if not 0 <= index < len(self.board.cells):
+            return False
+        return abs(step) != 1 or index // self.board.cols == start // self.board.cols
+
+    def __run_end(self, index: int, step: int) -> Optional[int]:
+        """first empty square walking from index in steps of step"""
+        cells = self.board.cells
+        i = index + step
+        while self.__in_line(i, index, step):
+            if not cells[i]:
+                return i
+            i += step
+        return None
+
+    def __run(self, index: int, step: int) -> str:
+        """letters of the tiles touching index going one way"""
+        cells = self.board.cells
+        letters = []
+        i = index + step
+        while self.__in_line(i, index, step) and cells[i]:
+            letters.append(chr(cells[i]))
+            i += step
+        return "".join(letters)
+
+    def __recompute(self, index: int, step: int, masks: array, has_cross: bytearray):
+        if self.board.cells[index]:
+            masks[index] = 0
+            has_cross[index] = 0
+            return
+
+        before = self.__run(index, -step)[::-1].lower()
+        after = self.__run(index, step).lower()
+        if not before and not after:
+            masks[index] = ANY_LETTER
+            has_cross[index] = 0
+            return
+
+        has_cross[index] = 1
+        mask = 0
+        node = self.dawg.walk(before)
+        for letter, child, terminal in self.dawg.children(node) if node else ():
+            if after:
+                found = self.dawg.follow(after, child)
+                terminal = found is not None and found[1]
+            if terminal and letter != ">":
+                mask |= 1 << (ord(letter) - ord("a"))
+        masks[index] = mask
@@ -0,0 +1,625 @@
+"""
+Compiled word graphs (DAWG and GADDAG) used by the dictionary.
+
+Both graphs are stored as one flat array of packed 32 bit edges, in the
+style of Appel & Jacobson's move generator:
+
+    bits 0-4   letter index (0-25 for a-z, 26 for the GADDAG separator)
+    bit  5     terminal, the path ending with this edge spells a word
+    bit  6     last edge of its node
+    bits 7-31  index of the child's first edge (0 means no children)
+
+A node is just the index of its first edge, so walking the graph never
+allocates anything. Edge 0 is a dummy so that 0 can mean "no children".
+
+Walking the graph one letter at a time is slow for a plain "is this a
+word" check, so a Dawg also carries an open addressing hash table of its
+words, stored after the edges in the compiled file:
+
+    strings  every word in sorted order, each followed by a newline
+    table    uint32 slots, 0 for empty or 1 + offset of a word in strings,
+             a word starts looking at crc32(word) and probes linearly
+"""
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence
+
+LETTER_MASK = 0x1F
+TERMINAL_BIT = 0x20
+LAST_BIT = 0x40
+CHILD_SHIFT = 7
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz>"
+
+# magic, format version, root, edge count, word count, source size, source mtime,
+# strings size, table slots
+HEADER = struct.Struct("<4sIIIIQqQQ")
+HEADER_SIZE = 64
+FORMAT_VERSION = 2
+
+
+ANY_LETTER = (1 << 26) - 1
+
+
+def parse_pattern(pattern: str) -> list[tuple[int, bool]]:
+    """
+    Turns a pattern into one (letter mask, is_open) pair per square:
+        a-z     that letter, already on the board
+        ?       any letter
+        [aeiou] any one of these letters
+    Open squares are the ones a tile still has to be played on.
+    """
+    slots = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i].lower()
+        if char == "?":
+            slots.append((ANY_LETTER, True))
+        elif char == "[":
+            end = pattern.find("]", i)
+            if end == -1:
+                raise ValueError(f"Unclosed [ in pattern {pattern!r}")
+            mask = 0
+            for letter in pattern[i + 1:end].lower():
+                mask |= 1 << ALPHABET.index(letter)
+            slots.append((mask, True))
+            i = end
+        elif "a" <= char <= "z":
+            slots.append((1 << ALPHABET.index(char), False))
+        else:
+            raise ValueError(f"Unexpected {char!r} in pattern {pattern!r}")
+        i += 1
+    return slots
+
+
+class _BuildNode:
+    __slots__ = ("edges", "terminal")
+
+    def __init__(self):
+        self.edges: dict[str, "_BuildNode"] = {}
+        self.terminal = False
+
+
+def _build_edges(words: Iterable[str]) -> tuple[array, int, int]:
+    """
+    Builds a minimal graph from sorted words using Daciuk's incremental
+    algorithm, then packs it into an edge array.
+    Returns (edges, root, number of distinct words).
+    """
+    root = _BuildNode()
+    register: dict[tuple, _BuildNode] = {}
+    unchecked: list[tuple[_BuildNode, str, _BuildNode]] = []
+
+    def minimize(down_to: int):
+        while len(unchecked) > down_to:
+            parent, letter, child = unchecked.pop()
+            key = (child.terminal, tuple((l, id(c)) for l, c in child.edges.items()))
+            existing = register.get(key)
+            if existing is not None:
+                parent.edges[letter] = existing
+            else:
+                register[key] = child
+
+    previous = ""
+    count = 0
+    for word in words:
+        if word == previous:
+            continue
+        if word < previous:
+            raise ValueError(f"Words must be sorted, {word!r} came after {previous!r}")
+
+        common = 0
+        for a, b in zip(word, previous):
+            if a != b:
+                break
+            common += 1
+        minimize(common)
+
+        node = unchecked[-1][2] if unchecked else root
+        for letter in word[common:]:
+            child = _BuildNode()
+            node.edges[letter] = child
+            unchecked.append((node, letter, child))
+            node = child
+        node.terminal = True
+        previous = word
+        count += 1
+    minimize(0)
+
+    # Give every node with edges a slot in the flat array, then fill it in.
+    offsets: dict[int, int] = {}
+    order: list[_BuildNode] = []
+    next_offset = 1
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if not node.edges or id(node) in offsets:
+            continue
+        offsets[id(node)] = next_offset
+        next_offset += len(node.edges)
+        order.append(node)
+        stack.extend(node.edges.values())
+
+    edges = array("I", bytes(4 * next_offset))
+    for node in order:
+        position = offsets[id(node)]
+        # edges are ordered by letter index so lookups can stop early
+        items = sorted((ALPHABET.index(letter), child) for letter, child in node.edges.items())
+        for i, (edge, child) in enumerate(items):
+            edge |= offsets.get(id(child), 0) << CHILD_SHIFT
+            if child.terminal:
+                edge |= TERMINAL_BIT
+            if i == len(items) - 1:
+                edge |= LAST_BIT
+            edges[position + i] = edge
+
+    return edges, offsets.get(id(root), 0), count
+
+
+def _build_table(words: Sequence[str]) -> tuple[bytes, array]:
+    """
+    Lays out sorted, distinct words as (strings, table), see the module
+    docstring. The table is kept at most half full, so a lookup rarely
+    probes more than once.
+    """
+    strings = bytearray()
+    size = 1
+    while size < len(words) * 2:
+        size *= 2
+    mask = size - 1
+    table = array("I", bytes(4 * size))
+    for word in words:
+        key = word.encode()
+        slot = zlib.crc32(key) & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = len(strings) + 1
+        strings += key + b"\n"
+    return bytes(strings), table
+
+
+class Dawg:
+    """
+    Directed acyclic word graph. Nodes are ints, see the module docstring.
+    """
+
+    __slots__ = ("edges", "root", "word_count", "strings", "strings_start", "table")
+
+    MAGIC = b"DAWG"
+    SUFFIX = ".dawg"
+
+    def __init__(
+        self,
+        edges: Sequence[int],
+        root: int,
+        word_count: int = 0,
+        strings: Optional[bytes | mmap.mmap] = None,
+        table: Optional[Sequence[int]] = None,
+        strings_start: int = 0,
+    ):
+        # Graphs are shared between games and bots, so they are frozen and
+        # the edges are only reachable through a read only view.
+        object.__setattr__(self, "edges", memoryview(edges).toreadonly())
+        object.__setattr__(self, "root", root)
+        object.__setattr__(self, "word_count", word_count)
+        # The word table is optional, only plain Dawgs build one. strings is
+        # bytes or the read only mmap itself (its words from strings_start
+        # on), both slice straight to bytes, which is what lookups compare.
+        if table is not None and len(table):
+            object.__setattr__(self, "strings", strings)
+            object.__setattr__(self, "strings_start", strings_start)
+            object.__setattr__(self, "table", memoryview(table).toreadonly())
+        else:
+            object.__setattr__(self, "strings", None)
+            object.__setattr__(self, "strings_start", 0)
+            object.__setattr__(self, "table", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read only")
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "Dawg":
+        words = sorted(set(words))
+        edges, root, count = _build_edges(words)
+        return cls(edges, root, count, *_build_table([word for word in words if word]))
+
+    def save(self, path: Path, source: Path):
+        """
+        Writes the compiled graph to path, stamped with the size and mtime of
+        the source word list so stale files can be spotted. The file is
+        written next to the target and renamed, so concurrent readers never
+        see half a file.
+        """
+        stat = source.stat()
+        strings = b"" if self.strings is None else self.strings[self.strings_start:]
+        table = array("I", () if self.table is None else self.table)
+        header = HEADER.pack(
+            self.MAGIC, FORMAT_VERSION, self.root, len(self.edges),
+            self.word_count, stat.st_size, stat.st_mtime_ns,
+            len(strings), len(table),
+        )
+        edges = array("I", self.edges)
+        if sys.byteorder != "little":
+            edges.byteswap()
+            table.byteswap()
+
+        temp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with temp.open("wb") as f:
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            f.write(edges.tobytes())
+            f.write(table.tobytes())
+            f.write(strings)
+        os.replace(temp, path)
+
+    @classmethod
+    def open(cls, path: Path, source: Path) -> Optional["Dawg"]:
+        """
+        Memory maps a graph written by save. Nothing is copied, edges are read
+        straight out of the page cache. Returns None if the file is missing,
+        was built for another format, or is older than source.
+        """
+        try:
+            stat = source.stat()
+            with path.open("rb") as f:
+                header = f.read(HEADER_SIZE)
+                if len(header) < HEADER_SIZE:
+                    return None
+                (
+                    magic, version, root, edge_count, word_count, size, mtime, strings_size, table_size,
+                ) = HEADER.unpack_from(header)
+                if (magic, version, size, mtime) != (cls.MAGIC, FORMAT_VERSION, stat.st_size, stat.st_mtime_ns):
+                    return None
+                if sys.byteorder != "little":
+                    return None
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        table_start = HEADER_SIZE + 4 * edge_count
+        strings_start = table_start + 4 * table_size
+        if len(buffer) != strings_start + strings_size:
+            return None
+        view = memoryview(buffer)
+        edges = view[HEADER_SIZE:table_start].cast("I")
+        table = view[table_start:strings_start].cast("I")
+        return cls(edges, root, word_count, buffer, table, strings_start)
+
+    def children(self, node: int) -> Iterator[tuple[str, int, bool]]:
+        """yields (letter, child, is_terminal) for every edge leaving node"""
+        if not node:
+            return
+        edges = self.edges
+        i = node
+        while True:
+            edge = edges[i]
+            yield ALPHABET[edge & LETTER_MASK], edge >> CHILD_SHIFT, bool(edge & TERMINAL_BIT)
+            if edge & LAST_BIT:
+                return
+            i += 1
+
+    def child(self, node: int, letter: str) -> Optional[tuple[int, bool]]:
+        """follows one edge, returns (child, is_terminal) or None"""
+        if not node:
+            return None
+        code = ALPHABET.find(letter)
+        edges = self.edges
+        i = node
+        while True:
+            edge = edges[i]
+            edge_code = edge & LETTER_MASK
+            if edge_code == code:
+                return edge >> CHILD_SHIFT, bool(edge & TERMINAL_BIT)
+            if edge_code > code or edge & LAST_BIT:
+                return None
+            i += 1
+
+    def follow(self, letters: str, node: Optional[int] = None) -> Optional[tuple[int, bool]]:
+        """
+        Follows a run of letters from node (default root).
+        Returns (node, is_terminal) for the end of the path, or None.
+        """
+        node = self.root if node is None else node
+        terminal = False
+        edges = self.edges
+        for letter in letters:
+            if not node:
+                return None
+            code = ALPHABET.find(letter)
+            i = node
+            while True:
+                edge = edges[i]
+                edge_code = edge & LETTER_MASK
+                if edge_code == code:
+                    node = edge >> CHILD_SHIFT
+                    terminal = bool(edge & TERMINAL_BIT)
+                    break
+                if edge_code > code or edge & LAST_BIT:
+                    return None
+                i += 1
+        return node, terminal
+
+    def walk(self, prefix: str, node: Optional[int] = None) -> Optional[int]:
+        """returns the node reached by prefix, or None if no word starts with it"""
+        found = self.follow(prefix, node)
+        return None if found is None else found[0]
+
+    def is_prefix(self, prefix: str) -> bool:
+        return self.follow(prefix) is not None
+
+    def __contains__(self, word: str) -> bool:
+        table = self.table
+        if table is None:
+            found = self.follow(word)
+            return found is not None and found[1]
+        key = word.encode()
+        mask = len(table) - 1
+        slot = zlib.crc32(key) & mask
+        key += b"\n"  # so a prefix of a longer word doesn't match
+        strings, base, length = self.strings, self.strings_start - 1, len(key)
+        while True:
+            entry = table[slot]
+            if not entry:
+                return False
+            start = base + entry
+            if strings[start:start + length] == key:
+                return True
+            slot = (slot + 1) & mask
+
+    def iter_words(self, node: Optional[int] = None, prefix: str = "") -> Iterator[str]:
+        """yields every word below node in sorted order, each starting with prefix"""
+        if node is None and self.strings is not None:
+            # every word, the table already has them in order
+            yield from (prefix + word for word in self.strings[self.strings_start:].decode().splitlines())
+            return
+        node = self.root if node is None else node
+        stack = [(node, prefix, False)]
+        while stack:
+            node, prefix, terminal = stack.pop()
+            if terminal:
+                yield prefix
+            # reversed so that the stack pops in alphabetical order
+            for letter, child, terminal in reversed(list(self.children(node))):
+                stack.append((child, prefix + letter, terminal))
+
+    def match(
+        self,
+        pattern: str,
+        rack: Optional[str] = None,
+        must_contain: str = "",
+        lengths: Optional[Iterable[int]] = None,
+    ) -> Iterator[str]:
+        """
+        Yields words fitting pattern, see parse_pattern for the syntax.
+        A word of length n only has to fit the first n slots, lengths picks
+        which n are allowed (default: the full pattern).
+        With a rack, every open slot must be filled by a tile from the rack,
+        "?" tiles being blanks. must_contain letters must all appear.
+        """
+        slots = parse_pattern(pattern)
+        lengths = {len(slots)} if lengths is None else set(lengths)
+        longest = min(max(lengths, default=0), len(slots))
+
+        available = [0] * 26
+        blanks = 0
+        if rack is not None:
+            for letter in rack:
+                if letter == "?":
+                    blanks += 1
+                else:
+                    available[ALPHABET.index(letter)] += 1
+
+        needed = [0] * 26
+        for letter in must_contain:
+            needed[ALPHABET.index(letter)] += 1
+
+        edges = self.edges
+
+        def search(node: int, depth: int, word: str, blanks: int, missing: int) -> Iterator[str]:
+            mask, is_open = slots[depth]
+            i = node
+            while i:
+                edge = edges[i]
+                i = 0 if edge & LAST_BIT else i + 1
+                code = edge & LETTER_MASK
+                if not mask >> code & 1:
+                    continue
+
+                used_tile = used_blank = False
+                if is_open and rack is not None:
+                    if available[code]:
+                        used_tile = True
+                        available[code] -= 1
+                    elif blanks:
+                        used_blank = True
+                    else:
+                        continue
+                counted = needed[code] > 0
+                if counted:
+                    needed[code] -= 1
+
+                remaining = missing - counted
+                if remaining <= longest - depth - 1:
+                    child = edge >> CHILD_SHIFT
+                    letter = ALPHABET[code]
+                    if edge & TERMINAL_BIT and depth + 1 in lengths and not remaining:
+                        yield word + letter
+                    if child and depth + 1 < longest:
+                        yield from search(child, depth + 1, word + letter, blanks - used_blank, remaining)
+
+                if counted:
+                    needed[code] += 1
+                if used_tile:
+                    available[code] += 1
+
+        if longest:
+            yield from search(self.root, 0, "", blanks, len(must_contain))
+
+    def __len__(self) -> int:
+        return len(self.edges) - 1
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {len(self)} edges>"
+
+
+class Gaddag(Dawg):
+    """
+    GADDAG (Gordon 1994). Every word w is stored once for each split point
+    as reverse(w[:i]) + SEPARATOR + w[i:], and once fully reversed with no
+    separator. Walking the reversed letters of a board fragment and then
+    hooking onto the separator lets a generator grow a word both ways from
+    an anchor square.
+    """
+
+    __slots__ = ()
+
+    MAGIC = b"GDAG"
+    SUFFIX = ".gaddag"
+    SEPARATOR = ">"
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "Gaddag":
+        words = {word for word in words if word}
+        entries = []
+        for word in words:
+            for i in range(1, len(word)):
+                entries.append(word[i - 1::-1] + cls.SEPARATOR + word[i:])
+            entries.append(word[::-1])
+        entries.sort()
+        edges, root, _ = _build_edges(entries)
+        return cls(edges, root, len(words))
+
+    def __contains__(self, word: str) -> bool:
+        return Dawg.__contains__(self, word[::-1])
+
+    def words_with_suffix(self, suffix: str) -> Iterator[str]:
+        """yields every word ending in suffix"""
+        found = self.follow(suffix[::-1])
+        if found is None:
+            return
+        node, terminal = found
+        if terminal and suffix:
+            yield suffix
+        stack = [(node, suffix)]
+        while stack:
+            node, word = stack.pop()
+            for letter, child, terminal in self.children(node):
+                if letter == self.SEPARATOR:
+                    continue
+                if terminal:
+                    yield letter + word
+                stack.append((child, letter + word))
+
+    def words_through(self, fragment: str) -> Iterator[str]:
+        """
+        yields every word containing fragment, extending left then right
+        from it exactly like a move generator would around an anchor
+        """
+        found = self.follow(fragment[::-1])
+        if found is None:
+            return
+        node, terminal = found
+        seen = set()
+        if terminal and fragment:
+            seen.add(fragment)
+            yield fragment
+
+        # (node, left part, right part, crossed the separator yet)
+        stack = [(node, fragment, "", False)]
+        while stack:
+            node, left, right, crossed = stack.pop()
+            for letter, child, terminal in self.children(node):
+                if crossed:
+                    entry = (child, left, right + letter, True)
+                elif letter == self.SEPARATOR:
+                    entry = (child, left, right, True)
+                else:
+                    entry = (child, letter + left, right, False)
+                if terminal:
+                    word = entry[1] + entry[2]
+                    if word not in seen:
+                        seen.add(word)
+                        yield word
+                stack.append(entry)
+
+
+class AnagramIndex(Dawg):
+    """
+    Every word stored as sorted(word) + SEPARATOR + word, so the graph is a
+    trie of letter signatures with the matching words hanging off the end.
+    Finding what a rack can make is a pruned walk over signatures instead of
+    trying every permutation of the rack against the word list.
+    """
+
+    __slots__ = ()
+
+    MAGIC = b"ANAG"
+    SUFFIX = ".anagrams"
+    SEPARATOR = ">"
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "AnagramIndex":
+        words = {word for word in words if word}
+        entries = sorted("".join(sorted(word)) + cls.SEPARATOR + word for word in words)
+        edges, root, _ = _build_edges(entries)
+        return cls(edges, root, len(words))
+
+    def anagrams(self, letters: str) -> list[str]:
+        """words using exactly these letters"""
+        node = self.walk("".join(sorted(letters)) + self.SEPARATOR)
+        return [] if node is None else list(self.iter_words(node))
+
+    def formable(self, rack: str, through: str = "") -> Iterator[str]:
+        """
+        Yields every word that uses all the letters in through (e.g. tiles
+        already on the board) plus any of the letters in rack. "?" in the
+        rack is a blank and stands for any letter.
+        """
+        separator = ALPHABET.index(self.SEPARATOR)
+        available = [0] * 26
+        required = [0] * 26
+        blanks = 0
+        for letter in rack:
+            if letter == "?":
+                blanks += 1
+            else:
+                available[ALPHABET.index(letter)] += 1
+        for letter in through:
+            required[ALPHABET.index(letter)] += 1
+
+        edges = self.edges
+
+        def search(node: int, blanks: int, missing: int) -> Iterator[str]:
+            # missing is how many letters of through are still unused
+            i = node
+            while i:
+                edge = edges[i]
+                code = edge & LETTER_MASK
+                child = edge >> CHILD_SHIFT
+                if code == separator:
+                    if not missing:
+                        yield from self.iter_words(child)
+                elif any(required[:code]):
+                    # signatures are sorted, a skipped required letter never comes back
+                    break
+                elif required[code]:
+                    required[code] -= 1
+                    yield from search(child, blanks, missing - 1)
+                    required[code] += 1
+                elif available[code]:
+                    available[code] -= 1
+                    yield from search(child, blanks, missing)
+                    available[code] += 1
+                elif blanks:
+                    yield from search(child, blanks - 1, missing)
+                i = 0 if edge & LAST_BIT else i + 1
+
+        yield from search(self.root, blanks, len(through))
@@ -1,17 +1,274 @@
+"""
+Word lists are compiled into binary graphs the first time they are opened
+(dicts/sowpods.txt -> dicts/sowpods.dawg, .gaddag and .anagrams) and memory
+mapped after that, so a new game attaches to the lexicon without reading or
+splitting the text file. Compiling all three takes about a minute for
+SOWPODS, once per checkout, and happens when the host opens the Dictionary
+so bots never pay for it on their clock. The compiled files are rebuilt
+whenever the .txt changes. To build them by hand, e.g. as a deploy step:
+
+    python -m src.dictionary dicts/sowpods.txt
+"""
+import sys
+from itertools import chain
 from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from src.dawg import AnagramIndex, Dawg, Gaddag
+from src.rack import WordCounts
+
+# Graphs are read only, so every Dictionary in the process shares them.
+# Keyed by (source, graph class, source size, source mtime).
+_graphs: dict[tuple[Path, type, int, int], Dawg] = {}
+# Letter count vectors of every word, per graph, same reason.
+_word_counts: dict[Dawg, WordCounts] = {}
+# Python sets of every word, per graph, same reason.
+_word_sets: dict[Dawg, frozenset[str]] = {}
+
+
+def read_words(path: Path) -> list[str]:
+    with path.open() as f:
+        return f.read().splitlines()
+
+
+def load_graph(source: Path, graph_class: type[Dawg] = Dawg, rebuild: bool = False) -> Dawg:
+    """
+    Returns the compiled graph for a word list, mapping the cached binary if
+    it is up to date and compiling (and saving) it otherwise.
+    """
+    stat = source.stat()
+    key = (source.resolve(), graph_class, stat.st_size, stat.st_mtime_ns)
+    if not rebuild and key in _graphs:
+        return _graphs[key]
+
+    compiled = source.with_suffix(graph_class.SUFFIX)
+    graph = None if rebuild else graph_class.open(compiled, source)
+    if graph is None:
+        graph = graph_class.from_words(read_words(source))
+        try:
+            graph.save(compiled, source)
+        except OSError:
+            pass  # read only checkout, keep the in-memory copy
+
+    _graphs[key] = graph
+    return graph
 
 
 class Dictionary:
     def __init__(self, path: Path):
+        """
+        Opens (or compiles) every graph and builds the word set up front,
+        all shared with every other Dictionary on the same file
+        """
         self.path = path
-        with self.path.open() as f:
-            self.words = set(f.read().splitlines())
+        self.__dawg = load_graph(self.path)
+        # up front, not on some bot's clock
+        self.__gaddag = load_graph(self.path, Gaddag)
+        self.__anagram_index = load_graph(self.path, AnagramIndex)
+        if self.__dawg not in _word_sets:
+            _word_sets[self.__dawg] = frozenset(self.__dawg.iter_words())
+        self.__words = _word_sets[self.__dawg]
+
+    @property
+    def words(self) -> frozenset[str]:
+        """Every word as a python set, shared by every Dictionary on the same file"""
+        return self.__words
+
+    @property
+    def dawg(self) -> Dawg:
+        return self.__dawg
+
+    @property
+    def word_counts(self) -> WordCounts:
+        """Letter counts of every word, for Rack.formable. Built on first use (~0.7s), shared after"""
+        if self.__dawg not in _word_counts:
+            _word_counts[self.__dawg] = WordCounts(self.__dawg.iter_words())
+        return _word_counts[self.__dawg]
+
+    @property
+    def gaddag(self) -> Gaddag:
+        return self.__gaddag
+
+    @property
+    def anagram_index(self) -> AnagramIndex:
+        return self.__anagram_index
+
+    def walk(self, prefix: str, node: Optional[int] = None) -> Optional[int]:
+        """DAWG node reached by prefix (from root or node), None if nothing starts with it"""
+        return self.__dawg.walk(prefix.lower(), node)
+
+    def children(self, node: int) -> Iterator[tuple[str, int, bool]]:
+        """(letter, child node, is_word) for every edge out of a DAWG node"""
+        return self.__dawg.children(node)
+
+    def is_prefix(self, prefix: str) -> bool:
+        return self.__dawg.is_prefix(prefix.lower())
+
+    def words_with_prefix(self, prefix: str) -> Iterator[str]:
+        prefix = prefix.lower()
+        found = self.__dawg.follow(prefix)
+        if found is None:
+            return iter(())
+        node, is_word = found
+        below = self.__dawg.iter_words(node, prefix)
+        return chain([prefix], below) if is_word else below
+
+    def words_with_suffix(self, suffix: str) -> Iterator[str]:
+        return self.__gaddag.words_with_suffix(suffix.lower())
+
+    def words_through(self, fragment: str) -> Iterator[str]:
+        """every word containing fragment, e.g. letters already on the board"""
+        return self.__gaddag.words_through(fragment.lower())
+
+    def anagrams(self, letters: str) -> list[str]:
+        """words using exactly these letters"""
+        return self.__anagram_index.anagrams(letters.lower())
+
+    def formable(self, rack: str | list[str], through: str = "", min_length: int = 2) -> Iterator[str]:
+        """
+        Every word that can be made from any of the letters in rack plus all
+        of the letters in through (e.g. tiles on the board to play through).
+        "?" in the rack is a blank.
+        """
+        words = self.__anagram_index.formable("".join(rack).lower(), through.lower())
+        return (word for word in words if len(word) >= min_length)
+
+    def match(
+        self,
+        pattern: str,
+        rack: Optional[str | list[str]] = None,
+        must_contain: str = "",
+        length: Optional[int | Iterable[int]] = None,
+    ) -> Iterator[str]:
+        """
+        Words fitting a pattern, e.g. match("?a??e") or a board lane like
+        match("??t[aeiou]", rack=hand, length=range(2, 5)).
+        Pattern squares are a letter (already on the board), "?" for any
+        letter or "[abc]" for one of a few letters. With a rack every "?" or
+        "[...]" square has to be filled from it, "?" tiles being blanks.
+        length (an int or a range) lets a word stop before the end of the
+        pattern, by default it must fill all of it.
+        """
+        if rack is not None:
+            rack = "".join(rack).lower()
+        if isinstance(length, int):
+            length = (length,)
+        return self.__dawg.match(pattern, rack, must_contain.lower(), length)
 
     def __contains__(self, word: str) -> bool:
-        return word.lower() in self.words
+        return word.lower() in self.__words
 
     def __len__(self) -> int:
-        return len(self.words)
+        return self.__dawg.word_count
+
+    def __reduce__(self):
+        # mmaps can't be pickled or deep copied, reopening is just as cheap
+        return Dictionary, (self.path,)
+
+    def read_only(self) -> "ReadOnlyDictionary":
+        return ReadOnlyDictionary(self)
 
     def __repr__(self) -> str:
         return f"<Dictionary {self.path}>"
+
+
+class ReadOnlyDictionary:
+    """
+    Read only view of a Dictionary, this is what bots are handed.
+    The word set is frozen and the graphs live in read only memory, so the
+    view can be shared with every bot for free instead of being copied.
+    """
+
+    __slots__ = ("__dictionary",)
+
+    def __init__(self, dictionary: Dictionary):
+        object.__setattr__(self, "_ReadOnlyDictionary__dictionary", dictionary)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Dictionary is read only")
+
+    def __delattr__(self, name):
+        raise AttributeError("Dictionary is read only")
+
+    @property
+    def path(self) -> Path:
+        return self.__dictionary.path
+
+    @property
+    def words(self) -> frozenset[str]:
+        return self.__dictionary.words
+
+    @property
+    def dawg(self) -> Dawg:
+        return self.__dictionary.dawg
+
+    @property
+    def word_counts(self) -> WordCounts:
+        return self.__dictionary.word_counts
+
+    @property
+    def anagram_index(self) -> AnagramIndex:
+        return self.__dictionary.anagram_index
+
+    @property
+    def gaddag(self) -> Gaddag:
+        return self.__dictionary.gaddag
+
+    def walk(self, prefix: str, node: Optional[int] = None) -> Optional[int]:
+        return self.__dictionary.walk(prefix, node)
+
+    def children(self, node: int) -> Iterator[tuple[str, int, bool]]:
+        return self.__dictionary.children(node)
+
+    def is_prefix(self, prefix: str) -> bool:
+        return self.__dictionary.is_prefix(prefix)
+
+    def words_with_prefix(self, prefix: str) -> Iterator[str]:
+        return self.__dictionary.words_with_prefix(prefix)
+
+    def words_with_suffix(self, suffix: str) -> Iterator[str]:
+        return self.__dictionary.words_with_suffix(suffix)
+
+    def words_through(self, fragment: str) -> Iterator[str]:
+        return self.__dictionary.words_through(fragment)
+
+    def anagrams(self, letters: str) -> list[str]:
+        return self.__dictionary.anagrams(letters)
+
+    def formable(self, rack: str | list[str], through: str = "", min_length: int = 2) -> Iterator[str]:
+        return self.__dictionary.formable(rack, through, min_length)
+
+    def match(
+        self,
+        pattern: str,
+        rack: Optional[str | list[str]] = None,
+        must_contain: str = "",
+        length: Optional[int | Iterable[int]] = None,
+    ) -> Iterator[str]:
+        return self.__dictionary.match(pattern, rack, must_contain, length)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.__dictionary
+
+    def __len__(self) -> int:
+        return len(self.__dictionary)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return ReadOnlyDictionary, (self.__dictionary,)
+
+    def __repr__(self) -> str:
+        return f"<ReadOnlyDictionary {self.path}>"
+
+
+if __name__ == "__main__":
+    for arg in sys.argv[1:]:
+        source = Path(arg)
+        for graph_class in (Dawg, Gaddag, AnagramIndex):
+            graph = load_graph(source, graph_class, rebuild=True)
+            print(f"{source} -> {source.with_suffix(graph_class.SUFFIX)}: {graph.word_count} words, {graph}")
@@ -1,34 +1,126 @@
+import asyncio
 import random
+import time
 from pathlib import Path
 from typing import List, Optional
 
 from src.board import Board
+from src.crosscheck import CrossChecks
 from src.dictionary import Dictionary
+from src.move import Evaluation, Move
+from src.movegen import MoveGenerator
 from src.player import Player
+from src.rack import Rack, letter_counts
 from src.tile import BoardTile, TileBag, Tile
-from src.gui import GUI
 
 
 class NotAWordException(Exception):
     pass
 
 
+class TurnRecord:
+    """What happened on one turn"""
+
+    __slots__ = ("player", "action", "move", "score", "elapsed_s", "timed_out")
+
+    def __init__(self, player: str, action: str, move: Optional[Move] = None, score: int = 0):
+        self.player = player
+        self.action = action  # "place", "exchange" or "pass"
+        self.move = move
+        self.score = score  # including any bingo bonus
+        self.elapsed_s = 0.0
+        self.timed_out = False  # the bot was stopped for taking too long
+
+    def __repr__(self) -> str:
+        timed_out = " timed out" if self.timed_out else ""
+        return f"<TurnRecord {self.player} {self.action}{timed_out} {self.move or ''} {self.score}>"
+
+
+class GameResult:
+    """Returned by Game.start, everything you need to know about a finished game"""
+
+    def __init__(
+        self,
+        players: list[Player],
+        history: list[TurnRecord],
+        duration_s: float,
+        seed: Optional[int] = None,
+        clocks_s: Optional[list[float]] = None,
+    ):
+        """clocks_s is what each player's clock started the game on, Player.CLOCK_S by default"""
+        if clocks_s is None:
+            clocks_s = [Player.CLOCK_S] * len(players)
+        self.seed = seed  # replaying with this seed and the same bots gives the same game
+        self.players = [player.name for player in players]
+        self.scores = [player.score for player in players]
+        self.time_used_s = [start - player.time_remaining_s for start, player in zip(clocks_s, players)]
+        self.history = history
+        self.duration_s = duration_s
+
+        best = max(self.scores, default=0)
+        self.winners = [i for i, score in enumerate(self.scores) if score == best]
+
+    @property
+    def winner(self) -> Optional[str]:
+        """name of the winner, None for a draw"""
+        return self.players[self.winners[0]] if len(self.winners) == 1 else None
+
+    @property
+    def moves(self) -> list[Move]:
+        return [turn.move for turn in self.history if turn.move]
+
+    def __repr__(self) -> str:
+        scores = ", ".join(f"{name}={score}" for name, score in zip(self.players, self.scores))
+        return f"<GameResult {scores} turns={len(self.history)} {self.duration_s:.3f}s>"
+
+
 class Game:
     HAND_SIZE = 7
+    DICTIONARY_PATH = Path(__file__).parent.parent / "dicts" / "sowpods.txt"
+    DEADLINE_GRACE_S = 0.25  # on top of a bots clock before an isolated bot is stopped
+
+    def __init__(
+        self,
+        players: Optional[List[Player]] = None,
+        have_gui=True,
+        headless=False,
+        seed: Optional[int | random.Random] = None,
+        isolate_bots=False,
+    ):
+        """
+        headless games have no GUI and print nothing, start() just plays the
+        game out as fast as the bots allow and returns a GameResult.
+        Every player needs a bot.
 
-    def __init__(self, players: Optional[List[Player]] = None, have_gui=True):
+        seed (an int or a random.Random) drives all of the game's randomness,
+        the same seed and bots play the same game again.
+
+        isolate_bots runs every bot in its own process (see sandbox.py). A bot
+        that goes over its clock is killed and passes for the rest of the game.
+        """
         if not players:
             players = []
+        if isinstance(seed, random.Random):
+            self.seed, self.rng = None, seed
+        else:
+            self.seed, self.rng = seed, random.Random(seed)
         self.board = Board()
-        self.tile_bag = TileBag()
-        dict_path = Path(__file__).parent.parent / "dicts" / "sowpods.txt"
-        self.dictionary = Dictionary(dict_path)
+        self.tile_bag = TileBag(self.rng)
+        self.dictionary = Dictionary(Game.DICTIONARY_PATH)
+        self.cross_checks = CrossChecks(self.board, self.dictionary.dawg)
+        self.move_generator = MoveGenerator(self.board, self.dictionary.dawg, self.cross_checks)
         self.players: list[Player] = players
         self.current_player: Player = self.players[0] if self.players else None
         self.player_turn: int = 0
+        self.history: list[TurnRecord] = []
+        self.__clocks_s: Optional[list[float]] = None  # each player's clock when the game started
+        self.headless = headless
+        self.isolate_bots = isolate_bots
 
         self.gui = None
-        if have_gui:
+        if have_gui and not headless:
+            from src.gui import GUI  # pygame is only needed if there's a window
+
             self.gui = GUI(self)
             self.gui.update()
 
@@ -42,36 +134,114 @@ class Game:
         self.current_player = self.players[set_to]
 
 
-    def start(self):
+    def log(self, *args):
+        """print, unless the game is headless"""
+        if not self.headless:
+            print(*args)
+
+    def start(self) -> GameResult:
         """Sets up the game, and starts the main game loop"""
-        self._set_player_turn(random.randint(0, len(self.players) - 1))
-        print("Drawing hands...")
-        for _ in self.players:
-            assert self.current_player
-            self.current_player.hand.extend(self.tile_bag.draw_n(Game.HAND_SIZE))
-            self.__increment_turn_counter()
+        started = self.__deal()
+        bots = [player.api for player in self.players if player.api]
+        try:
+            if self.isolate_bots:
+                for bot in bots:
+                    bot.isolate()
 
-        # INFO: Main game loop is here!
-        consecutive_passes = 0
-        while not self.is_game_over(consecutive_passes):
-            passed = self.turn_cycle()
-            if passed:
-                consecutive_passes += 1
+            # INFO: Main game loop is here!
+            consecutive_passes = 0
+            while not self.is_game_over(consecutive_passes):
+                passed = self.turn_cycle()
+                consecutive_passes = consecutive_passes + 1 if passed else 0
+        finally:
+            for bot in bots:
+                bot.release()
 
-        print("Game over!")
-        print([(player.name, player.score) for player in self.players])
+        result = self.__finish(started)
 
         if self.gui:
             while True:
                 self.gui.update()
 
+        return result
+
+    async def play(self) -> GameResult:
+        """
+        start() for an event loop (see scheduler.py): bots with an async
+        _on_turn are awaited, so other games carry on while they wait.
+        """
+        started = self.__deal()
+        bots = [player.api for player in self.players if player.api]
+        try:
+            if self.isolate_bots:
+                for bot in bots:
+                    bot.isolate()
+
+            consecutive_passes = 0
+            while not self.is_game_over(consecutive_passes):
+                passed = await self.turn_cycle_async()
+                consecutive_passes = consecutive_passes + 1 if passed else 0
+                await asyncio.sleep(0)  # let other games have a go, even between blocking bots
+        finally:
+            for bot in bots:
+                bot.release()
+
+        return self.__finish(started)
+
+    def __deal(self) -> float:
+        """picks who goes first and deals the hands, returns when the game started"""
+        if self.headless and not all(player.api for player in self.players):
+            raise ValueError("Every player in a headless game needs a bot.")
+
+        started = time.perf_counter()
+        self.__clocks_s = [player.time_remaining_s for player in self.players]
+        self._set_player_turn(self.rng.randint(0, len(self.players) - 1))
+        self.log("Drawing hands...")
+        for _ in self.players:
+            assert self.current_player
+            self.current_player.hand.extend(self.tile_bag.draw_n(Game.HAND_SIZE))
+            self.__increment_turn_counter()
+        return started
+
+    def __finish(self, started: float) -> GameResult:
+        self.log("Game over!")
+        self.log([(player.name, player.score) for player in self.players])
+        return GameResult(self.players, self.history, time.perf_counter() - started, self.seed, self.__clocks_s)
 
     def turn_cycle(self):
         """Main turn cycle of the game"""
+        turns_before, started = self.__begin_turn()
+        try:
+            passed = self.current_player.play_turn(self) is not None
+        except (NotAWordException, ValueError):
+            if not self.headless:
+                raise
+            # a bad move from a bot shouldn't end a simulation, it's a pass
+            passed = True
+        return self.__end_turn(passed, turns_before, started)
+
+    async def turn_cycle_async(self):
+        """turn_cycle, awaiting the player"""
+        turns_before, started = self.__begin_turn()
+        try:
+            passed = await self.current_player.play_turn_async(self) is not None
+        except (NotAWordException, ValueError):
+            if not self.headless:
+                raise
+            passed = True
+        return self.__end_turn(passed, turns_before, started)
+
+    def __begin_turn(self) -> tuple[int, float]:
         assert self.current_player
-        print(f"{self.current_player.name}'s turn")
-        self.board.display()
-        passed = self.current_player.play_turn(self) is not None
+        self.log(f"{self.current_player.name}'s turn")
+        if not self.headless:
+            self.board.display()
+        return len(self.history), time.perf_counter()
+
+    def __end_turn(self, passed: bool, turns_before: int, started: float) -> bool:
+        if len(self.history) == turns_before:
+            self.record_pass(self.current_player)
+        self.history[-1].elapsed_s = time.perf_counter() - started
 
         self.refill_hand(self.current_player)
         self.__increment_turn_counter()
@@ -81,6 +251,10 @@ class Game:
 
         return passed
 
+    def record_pass(self, player: Player, timed_out=False):
+        self.history.append(TurnRecord(player.name, "pass"))
+        self.history[-1].timed_out = timed_out
+
     def refill_hand(self, player: Player):
         """
         Refills a given players hand
@@ -202,108 +376,72 @@ class Game:
                 total_overlaps += 1
         return total_overlaps
 
-    def is_placement_valid(self, start_row: int, start_col: int, word: str, is_vertical: bool, raise_errors=False):
-        # raises error if word does not fit / overlaps incorrectly
+    def evaluate_move(self, start_row: int, start_col: int, word: str, is_vertical: bool) -> Evaluation:
+        """
+        Checks and scores a placement in one pass, without touching the
+        board. Any overlap should be included, same as place_word. The
+        dictionary doesn't care about case and neither does this, tiles
+        always go on the board lower case.
+        """
+        word = word.lower()
+        move = Move(start_row, start_col, word, is_vertical)
+        board = self.board
+        evaluation = Evaluation(move, board.cells)
         try:
-            total_overlaps = self._check_word_fits(
-                start_row, start_col, word, is_vertical
-            )
-        except Exception as e:
-            if raise_errors:
-                raise e
-
-            return False
+            board.measure(move)
+        except ValueError as e:
+            evaluation.error = e
+            return evaluation
 
-        if total_overlaps == len(word):
-            return False
+        placed = move.placed
+        if not placed:
+            evaluation.error = ValueError(f"{word} doesn't place any new tiles.")
+            return evaluation
 
         # Check Scrabble placement rules
-        if self.board.is_empty():
-            # First word must cover center square (7, 7)
-            center_covered = False
-            for i in range(len(word)):
-                check_row = start_row + (i if is_vertical else 0)
-                check_col = start_col + (i if not is_vertical else 0)
-                if check_row == 7 and check_col == 7:
-                    center_covered = True
-                    break
-
-            if not center_covered:
-                if raise_errors:
-                    raise ValueError("First word must cover the center square at position (7, 7).")
-                return False
-        else:
+        cells = board.cells
+        if board.is_empty():
+            # First word must cover center square
+            centre = (board.rows // 2, board.cols // 2)
+            if board.index(*centre) not in placed:
+                evaluation.error = ValueError(f"First word must cover the center square at position {centre}.")
+                return evaluation
+        elif not any(cells[index] for squares in move.words for index in squares):
             # Subsequent words must connect to existing tiles
-            # Either through overlap or by being adjacent
-
-            if total_overlaps == 0:
-                # No overlap, so check if adjacent to any existing tile
-                has_adjacent = False
-                for i in range(len(word)):
-                    check_row = start_row + (i if is_vertical else 0)
-                    check_col = start_col + (i if not is_vertical else 0)
-
-                    # Check all 4 directions for adjacent tiles
-                    for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                        try:
-                            adjacent_tile = self.board.get(check_row + dr, check_col + dc)
-                            if not adjacent_tile.is_empty():
-                                has_adjacent = True
-                                break
-                        except ValueError:
-                            # Out of bounds, skip
-                            pass
-
-                    if has_adjacent:
-                        break
-
-                if not has_adjacent:
-                    if raise_errors:
-                        raise ValueError("Word must connect to existing tiles on the board.")
-                    return False
+            evaluation.error = ValueError("Word must connect to existing tiles on the board.")
+            return evaluation
 
         # Validate that the word itself is in the dictionary
-        if word.lower() not in self.dictionary:
-            if raise_errors:
-                raise NotAWordException(f"{word} is not in {self.dictionary}.")
-            return False
-
-        # place the letters on the board then remove them again
-        over_written = []
-        for i, char in enumerate(word):
-            if is_vertical:
-                tile = self.board.get(start_row + i, start_col)
-            else:
-                tile = self.board.get(start_row, start_col + i)
-
-            # Only place if the tile is empty (not an overlap)
-            if tile.is_empty():
-                self.board.place(
-                    start_row + i if is_vertical else start_row,
-                    start_col if is_vertical else start_col + i,
-                    char
-                )
-                over_written.append((start_row + i if is_vertical else start_row,
-                                     start_col if is_vertical else start_col + i))
-
+        if word not in self.dictionary:
+            evaluation.error = NotAWordException(f"{word} is not in {self.dictionary}.")
+            return evaluation
+
+        # Every new letter has to be allowed by the cross checks of its
+        # square, which covers all the perpendicular words.
+        masks = self.cross_checks.masks(is_vertical)
+        for index, letter in zip(placed, move.letters):
+            code = ord(letter) - 97  # "a"
+            if not 0 <= code < 26 or not masks[index] >> code & 1:
+                cross_word = next(formed for formed, squares in zip(evaluation.words, move.words) if index in squares)
+                evaluation.error = NotAWordException(f"{cross_word} is not in {self.dictionary}.")
+                return evaluation
+
+        # The word itself also runs on into any tiles touching either end,
+        # if so it's the last word formed
+        main = move.words[-1] if move.words else ()
+        if len(main) > len(word) and main[1] - main[0] == (board.cols if is_vertical else 1):
+            main_word = evaluation.words[-1]
+            if main_word not in self.dictionary:
+                evaluation.error = NotAWordException(f"{main_word} is not in {self.dictionary}.")
+                return evaluation
+
+        return evaluation
 
-        connecting_words = self.get_connecting_words(
-            start_row, start_col, word, is_vertical
-        )
-
-        for connecting in connecting_words:
-            parsed_connecting_word = "".join(char.letter for char in connecting)
-            if parsed_connecting_word not in self.dictionary:
-                for (row, col) in over_written:
-                    self.board.get(row, col).clear()
-
-                if raise_errors:
-                    raise NotAWordException(f"{parsed_connecting_word} is not in {self.dictionary}.")
-                return False
-
-        for (row, col) in over_written:
-            self.board.get(row, col).clear()
-        return True
+    def is_placement_valid(self, start_row: int, start_col: int, word: str, is_vertical: bool, raise_errors=False):
+        evaluation = self.evaluate_move(start_row, start_col, word, is_vertical)
+        if evaluation.error and raise_errors:
+            raise evaluation.error
+        return evaluation.valid
 
     def place_word(self, start_row: int, start_col: int, word: str, is_vertical: bool):
         """
@@ -313,82 +451,53 @@ class Game:
         Ends the current players turn afterwards.
         """
 
-        valid = self.is_placement_valid(start_row, start_col, word, is_vertical, raise_errors=True)
-
-        if not valid:
-            return
-
-        total_overlaps = self._check_word_fits(
-            start_row, start_col, word, is_vertical
-        )
-
-        chars_to_remove_from_hand = []
-        # Actually place the letters on the board
-        for i, char in enumerate(word):
-            if is_vertical:
-                tile = self.board.get(start_row + i, start_col)
+        evaluation = self.evaluate_move(start_row, start_col, word, is_vertical)
+        if evaluation.error:
+            raise evaluation.error
+        move = evaluation.move
+
+        # check the tiles before touching anything, blanks stand in for missing letters
+        hand = self.current_player.hand
+        rack = Rack.from_tiles(hand)
+        blanked = rack.blanked(move.letters)
+        if sum(blanked) > rack.blanks:
+            raise ValueError(f"{''.join(move.letters)} not in {[tile.letter for tile in hand]}")
+        move.blanks = tuple(square for square, blank in zip(move.placed, blanked) if blank)
+
+        self.board.apply(move)
+        taking = letter_counts("?" if blank else letter for letter, blank in zip(move.letters, blanked)).tolist()
+        kept = []
+        for tile in hand:
+            slot = TileBag.slots[tile.letter]
+            if taking[slot]:
+                taking[slot] -= 1
             else:
-                tile = self.board.get(start_row, start_col + i)
-
-            # Only place if the tile is empty (not an overlap)
-            if tile.is_empty():
-                self.board.place(
-                    start_row + i if is_vertical else start_row,
-                    start_col if is_vertical else start_col + i,
-                    char
-                )
-                chars_to_remove_from_hand.append(char)
-
-        # check if bingo
-        score = 0
-        total_used_letters = len(word) - total_overlaps
-        if total_used_letters == 7:  # hand size
-            score += 50  # + 50 if bingo
-
-        connecting_words = self.get_connecting_words(
-            start_row, start_col, word, is_vertical
-        )
-
-        all_used_tiles = []
-        for connecting in connecting_words:
-            parsed_connecting_word = "".join(char.letter for char in connecting)
-            if parsed_connecting_word not in self.dictionary:
-                raise NotAWordException(f"{parsed_connecting_word} is not in {self.dictionary}.")
-
-            # score all words
-            score += Game.calculate_word_score(connecting)
-            for char in connecting:
-                # use it up later
-                if char not in all_used_tiles:
-                    all_used_tiles.append(char)
-
-        for char in all_used_tiles:
-            char.use_up()
-
-        hand_letters = [c.letter for c in self.current_player.hand]
-        for char in chars_to_remove_from_hand:
-            try:
-                idx = hand_letters.index(char)
-            except ValueError:
-                idx = hand_letters.index("?")
-            hand_letters.pop(idx)
-            self.current_player.hand.pop(idx)
+                kept.append(tile)
+        hand[:] = kept
 
+        score = evaluation.score
         self.current_player.score += score
+        self.cross_checks.update()
+        self.history.append(TurnRecord(self.current_player.name, "place", move, score))
 
 
     def discard_letters(self, player: Player, letters: list[str]):
         temp_hand = [tile.letter for tile in player.hand]
-        popped = []
-        for letter in letters:
+        for letter in letters:  # check them all first, so a bad exchange leaves the hand alone
             try:
-                index = temp_hand.index(letter)
-                popped.append(player.hand.pop(index))
-                temp_hand.pop(index) # as long as no race conditions this is OK
+                temp_hand.remove(letter)
             except ValueError:
                 raise ValueError(
                     f"{letter} not in {[tile.letter for tile in player.hand]}")
 
+        temp_hand = [tile.letter for tile in player.hand]
+        popped = []
+        for letter in letters:
+            index = temp_hand.index(letter)
+            popped.append(player.hand.pop(index))
+            temp_hand.pop(index) # as long as no race conditions this is OK
+
         # puts all removed back into tile bag - this is exact same Tile obj
         self.tile_bag.add(popped)
 
+        self.history.append(TurnRecord(player.name, "exchange"))
@@ -0,0 +1,106 @@
+from typing import Optional
+
+BINGO_TILES = 7  # play a whole hand at once...
+BINGO_BONUS = 50  # ...for this on top
+
+class Move:
+    """
+    A word placement. Any overlap with tiles already on the board is part of
+    the word, same as Game.place_word.
+
+    Board.apply (or Board.measure, without playing it) fills in what the
+    move did, which is also everything Board.undo needs to take it back:
+        placed  squares that got a new tile
+        letters the letters that went on them, i.e. what left the hand
+        used    squares whose premium got used up by this move (apply only)
+        words   squares of every word formed, perpendicular ones first
+        score   score of those words, not counting any bingo bonus
+        blanks  squares of placed that got a blank (Game.place_word only)
+    Squares are flat board indices, see Board.index.
+    """
+
+    __slots__ = (
+        "row", "col", "word", "is_vertical", "placed", "letters", "used", "words", "score", "blanks", "measured_hash"
+    )
+
+    def __init__(self, row: int, col: int, word: str, is_vertical: bool):
+        self.row = row
+        self.col = col
+        self.word = word
+        self.is_vertical = is_vertical
+
+        self.placed: tuple[int, ...] = ()
+        self.letters: tuple[str, ...] = ()
+        self.used: tuple[int, ...] = ()
+        self.words: list[tuple[int, ...]] = []
+        self.score = 0
+        self.blanks: tuple[int, ...] = ()
+        self.measured_hash: Optional[int] = None  # Board.hash when measured, so apply can skip it
+
+    @property
+    def bingo(self) -> bool:
+        return len(self.placed) == BINGO_TILES
+
+    @property
+    def total_score(self) -> int:
+        """score including any bingo bonus"""
+        return self.score + (BINGO_BONUS if self.bingo else 0)
+
+    def squares(self) -> list[tuple[int, int]]:
+        """(row, col) of every letter in the word"""
+        if self.is_vertical:
+            return [(self.row + i, self.col) for i in range(len(self.word))]
+        return [(self.row, self.col + i) for i in range(len(self.word))]
+
+    def __repr__(self) -> str:
+        direction = "down" if self.is_vertical else "across"
+        return f"<Move {self.word} {direction} at {self.row}, {self.col}>"
+
+
+class Evaluation:
+    """
+    What Game.evaluate_move found out about a move, all in one go:
+        valid   whether it can be played
+        error   why not, the exception place_word would raise (None if valid)
+        words   every word formed, perpendicular ones first
+        score   what playing it is worth, bingo bonus included
+    The measured Move is kept as .move, Board.apply can play it without
+    measuring again.
+    """
+
+    def __init__(self, move: Move, cells: bytes | bytearray):
+        self.move = move
+        self.error: Optional[Exception] = None
+        self.__cells = bytes(cells)  # the board as it was, for spelling out words
+        self.__words: Optional[list[str]] = None
+
+    @property
+    def valid(self) -> bool:
+        return self.error is None
+
+    @property
+    def bingo(self) -> bool:
+        return self.move.bingo
+
+    @property
+    def score(self) -> int:
+        return self.move.total_score
+
+    @property
+    def words(self) -> list[str]:
+        if self.__words is None:
+            cells = self.__cells
+            letters = dict(zip(self.move.placed, self.move.letters))
+            self.__words = [
+                "".join(chr(cells[index]) if cells[index] else letters[index] for index in squares)
+                for squares in self.move.words
+            ]
+        return self.__words
+
+    def __bool__(self) -> bool:
+        return self.valid
+
+    def __repr__(self) -> str:
+        if self.error:
+            return f"<Evaluation {self.move} invalid: {self.error}>"
+        return f"<Evaluation {self.move} {self.words} {self.score}>"
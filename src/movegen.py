@@ -0,0 +1,229 @@
+"""
+Move generation (Appel & Jacobson, "The World's Fastest Scrabble Program").
+
+Every move has to touch an anchor, an empty square next to a tile (or the
+centre on an empty board). For each anchor the letters to its left are
+either the tiles already there or any rack letters spelling a DAWG prefix,
+then the word is extended right through the anchor, each new tile allowed
+only if the DAWG continues with it and the square's cross check lets it
+through. Columns are done the same way as rows.
+"""
+import heapq
+from typing import Iterator, NamedTuple, Optional
+
+import numpy as np
+
+from src.board import Board
+from src.crosscheck import CrossChecks
+from src.dawg import CHILD_SHIFT, LAST_BIT, LETTER_MASK, TERMINAL_BIT, Dawg
+from src.move import Move
+from src.scoring import PlacementScorer
+
+BLANK = 26  # rack slot for "?"
+
+
+class GeneratedMove(NamedTuple):
+    """a legal move, the first four line up with Api.place_word"""
+
+    word: str
+    is_vertical: bool
+    x: int  # column
+    y: int  # row
+    score: int  # including any bingo bonus
+
+
+class MoveGenerator:
+    """
+    Finds every legal move for a rack. Moves come out measured against the
+    board (placed, words, score filled in), so they score exactly as
+    Game.place_word would and Board.apply can play them as they are.
+    """
+
+    def __init__(self, board: Board, dawg: Dawg, cross_checks: CrossChecks):
+        self.board = board
+        self.dawg = dawg
+        self.cross_checks = cross_checks
+        self.scorer = PlacementScorer(board)
+
+    def generate(self, rack: str | list[str]) -> Iterator[Move]:
+        """every legal move, lazily, one anchor at a time"""
+        board = self.board
+        for row, col, word, is_vertical in self.candidates(rack):
+            yield board.measure(Move(row, col, word, is_vertical))
+
+    def candidates(self, rack: str | list[str]) -> Iterator[tuple[int, int, str, bool]]:
+        """every legal move as (row, col, word, is_vertical), unmeasured and unscored"""
+        counts = [0] * 27
+        for letter in "".join(rack).lower():
+            if letter == "?":
+                counts[BLANK] += 1
+            elif "a" <= letter <= "z":
+                counts[ord(letter) - 97] += 1
+
+        board = self.board
+        rows, cols = board.rows, board.cols
+        anchors = set(self.cross_checks.anchors())
+        for is_vertical in (False, True):
+            masks = self.cross_checks.masks(is_vertical)
+            if is_vertical:
+                lines = [range(col, rows * cols, cols) for col in range(cols)]
+            else:
+                lines = [range(row * cols, (row + 1) * cols) for row in range(rows)]
+            for line in lines:
+                for pos, index in enumerate(line):
+                    if index not in anchors:
+                        continue
+                    found: list[tuple[int, str]] = []
+                    _LineSearch(self.dawg, board.cells, line, masks, counts, pos, found).run(anchors)
+                    for start, word in found:
+                        if is_vertical and self.__found_across(board.cells, line, start, len(word)):
+                            continue
+                        row, col = divmod(line[start], cols)
+                        yield row, col, word, is_vertical
+
+    @staticmethod
+    def __found_across(cells: bytearray, line: range, start: int, length: int) -> bool:
+        """
+        whether a down move is one tile that also makes an across word, the
+        across pass already found that same placement
+        """
+        new = [line[i] for i in range(start, start + length) if not cells[line[i]]]
+        if len(new) != 1:
+            return False
+        index = new[0]
+        cols = line.step
+        col = index % cols
+        return bool(col > 0 and cells[index - 1] or col < cols - 1 and cells[index + 1])
+
+    def scored(self, rack: str | list[str]) -> tuple[list[tuple[int, int, str, bool]], np.ndarray]:
+        """every legal move and its score (bingo included), scored in one go"""
+        candidates = list(self.candidates(rack))
+        return candidates, self.scorer.score(candidates)
+
+    def best(self, rack: str | list[str], k: int = 1) -> list[Move]:
+        """the k highest scoring moves, best first"""
+        candidates, scores = self.scored(rack)
+        top = heapq.nlargest(k, range(len(candidates)), key=scores.__getitem__)
+        return [self.board.measure(Move(*candidates[i])) for i in top]
+
+    @staticmethod
+    def as_tuple(move: Move) -> GeneratedMove:
+        return GeneratedMove(move.word, move.is_vertical, move.col, move.row, move.total_score)
+
+
+class _LineSearch:
+    """The left part / extend right search for one anchor of one line"""
+
+    def __init__(self, dawg: Dawg, cells: bytearray, line: range, masks, counts: list[int], anchor: int, found: list):
+        self.edges = dawg.edges
+        self.root = dawg.root
+        self.cells = cells
+        self.line = line
+        self.masks = masks
+        self.counts = counts
+        self.anchor = anchor
+        self.found = found
+
+    def run(self, anchors: set[int]):
+        cells, line, anchor = self.cells, self.line, self.anchor
+        if anchor > 0 and cells[line[anchor - 1]]:
+            # the left part is the tiles already there
+            start = anchor - 1
+            while start > 0 and cells[line[start - 1]]:
+                start -= 1
+            prefix = "".join(chr(cells[line[i]]) for i in range(start, anchor))
+            node = self.__follow(prefix.lower())
+            if node is not None:
+                self.__extend_right(prefix, node, anchor, False)
+            return
+
+        # the left part comes from the rack, over empty squares that aren't
+        # anchors themselves (those moves are found from that anchor)
+        limit = 0
+        while limit < anchor and not cells[line[anchor - 1 - limit]] and line[anchor - 1 - limit] not in anchors:
+            limit += 1
+        self.__left_part("", self.root, limit)
+
+    def __follow(self, letters: str) -> Optional[int]:
+        edges, node = self.edges, self.root
+        for letter in letters:
+            code = ord(letter) - 97
+            i = node
+            while node:
+                edge = edges[i]
+                if edge & LETTER_MASK == code:
+                    node = edge >> CHILD_SHIFT
+                    break
+                if edge & LETTER_MASK > code or edge & LAST_BIT:
+                    return None
+                i += 1
+            else:
+                return None
+        return node
+
+    def __take(self, code: int) -> int:
+        """rack slot to play code from (the letter, else a blank), -1 if neither"""
+        if self.counts[code]:
+            return code
+        if self.counts[BLANK]:
+            return BLANK
+        return -1
+
+    def __left_part(self, partial: str, node: int, limit: int):
+        self.__extend_right(partial, node, self.anchor, False)
+        if not limit or not node:
+            return
+        edges, counts = self.edges, self.counts
+        i = node
+        while True:
+            edge = edges[i]
+            code = edge & LETTER_MASK
+            slot = self.__take(code)
+            if slot >= 0:
+                counts[slot] -= 1
+                self.__left_part(partial + chr(code + 97), edge >> CHILD_SHIFT, limit - 1)
+                counts[slot] += 1
+            if edge & LAST_BIT:
+                return
+            i += 1
+
+    def __extend_right(self, partial: str, node: int, pos: int, is_word: bool):
+        line, cells = self.line, self.cells
+        if pos == len(line) or not cells[line[pos]]:
+            if is_word and pos > self.anchor:
+                self.found.append((pos - len(partial), partial))
+            if pos == len(line) or not node:
+                return
+            mask = self.masks[line[pos]]
+            edges, counts = self.edges, self.counts
+            i = node
+            while True:
+                edge = edges[i]
+                code = edge & LETTER_MASK
+                if mask >> code & 1:
+                    slot = self.__take(code)
+                    if slot >= 0:
+                        counts[slot] -= 1
+                        self.__extend_right(
+                            partial + chr(code + 97), edge >> CHILD_SHIFT, pos + 1, bool(edge & TERMINAL_BIT)
+                        )
+                        counts[slot] += 1
+                if edge & LAST_BIT:
+                    return
+                i += 1
+
+        # a tile already on the board, the word has to go through it
+        if not node:
+            return
+        letter = chr(cells[line[pos]])
+        code = ord(letter.lower()) - 97
+        edges = self.edges
+        i = node
+        while True:
+            edge = edges[i]
+            if edge & LETTER_MASK == code:
+                self.__extend_right(partial + letter, edge >> CHILD_SHIFT, pos + 1, bool(edge & TERMINAL_BIT))
+                return
+            if edge & LETTER_MASK > code or edge & LAST_BIT:
+                return
+            i += 1
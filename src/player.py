@@ -1,18 +1,26 @@
 from typing import Optional
 
 from src.api import Api
+from src.rack import Rack
 from src.tile import Tile, TileBag
 
 
 class Player:
+    CLOCK_S = 3 * 60  # thinking time for the whole game
+
     def __init__(self, name):
         """main player object, also where bots are assigned"""
         self.name = name
         self.score = 0
         self.hand: list[Tile] = []
-        self.time_remaining_s: float = 3 * 60
+        self.time_remaining_s: float = Player.CLOCK_S
         self.api: Optional[Api] = None
 
+    @property
+    def rack(self) -> Rack:
+        """the hand as letter counts"""
+        return Rack.from_tiles(self.hand)
+
     def assign_bot(self, game, bot_class):  # how does this work
         self.api = bot_class()
         self.api.hook(game, self)
@@ -60,12 +68,9 @@ class Player:
                 ))
                 is_vertical = True if (input("Is your word vertical ("
                                              "y/n)").lower() == "y") else False
-                hand_str = [char.letter for char in self.hand]
-                for char in word:
-                    if char not in hand_str:
-                        print("Invalid word, please try again!")
-                        return self.play_human_turn(game)
-                    hand_str.remove(char)
+                if not self.rack.can_make(word):
+                    print("Invalid word, please try again!")
+                    return self.play_human_turn(game)
 
                 return game.place_word(start_col, start_row, word, is_vertical)
             case _:
@@ -76,3 +81,8 @@ class Player:
         if self.api:
             return self.api.on_turn()
         return self.play_human_turn(game)
+
+    async def play_turn_async(self, game) -> str | None:
+        if self.api:
+            return await self.api.on_turn_async()
+        return self.play_human_turn(game)
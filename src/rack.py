@@ -0,0 +1,139 @@
+"""
+Racks as letter counts. A rack is a 27 count vector (a-z, then blanks, the
+order of TileBag.letters) and every word in the lexicon has its own 26
+count vector, so "can this rack make these words" is one NumPy comparison
+over all of them: a word fits if the letters it's short of are no more
+than the blanks.
+"""
+from typing import Iterable, Optional
+
+import numpy as np
+
+from src.tile import Tile, TileBag
+
+LETTERS = TileBag.letters
+SLOTS = TileBag.slots
+BLANK = SLOTS["?"]
+
+
+def letter_counts(letters: Iterable[str]) -> np.ndarray:
+    """27 counts for some letters, "?" being a blank"""
+    slots = [SLOTS[letter.lower()] for letter in letters]
+    return np.bincount(slots, minlength=len(LETTERS)).astype(np.int16)
+
+
+class WordCounts:
+    """
+    Count vectors for a list of words, shortest words first:
+        words   the words, in that order (a tuple)
+        counts  (words, 26) uint8, counts[i] is how many of each letter words[i] has
+        lengths length of each word
+    """
+
+    def __init__(self, words: Iterable[str]):
+        # stable, so alphabetical within a length stays that way. Shared by
+        # every game in the process, so nothing here can be written to
+        words = tuple(sorted(words, key=len))
+        self.words = words
+        self.lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+        self.lengths.flags.writeable = False
+        codes = np.frombuffer("".join(words).lower().encode(), dtype=np.uint8) - ord("a")
+        rows = np.repeat(np.arange(len(words)), self.lengths)
+        self.counts = (
+            np.bincount(rows * 26 + codes, minlength=len(words) * 26).reshape(len(words), 26).astype(np.uint8)
+        )
+        self.counts.flags.writeable = False
+
+    def up_to(self, length: int) -> int:
+        """how many words are no longer than length, they're the first ones"""
+        return int(np.searchsorted(self.lengths, length, side="right"))
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __repr__(self) -> str:
+        return f"<WordCounts {len(self.words)} words>"
+
+
+class Rack:
+    """
+    A hand as letter counts, read only. Rack("ab?") or Rack.from_tiles(hand).
+    """
+
+    __slots__ = ("counts",)
+
+    def __init__(self, letters: Iterable[str] = ""):
+        counts = letter_counts(letters)
+        counts.flags.writeable = False
+        object.__setattr__(self, "counts", counts)
+
+    @classmethod
+    def from_tiles(cls, tiles: Iterable[Tile]) -> "Rack":
+        return cls(tile.letter for tile in tiles)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Racks are read only")
+
+    @property
+    def blanks(self) -> int:
+        return int(self.counts[BLANK])
+
+    def __getitem__(self, letter: str) -> int:
+        return int(self.counts[SLOTS[letter]])
+
+    def __len__(self) -> int:
+        return int(self.counts.sum())
+
+    def letters(self) -> str:
+        return "".join(letter * int(count) for letter, count in zip(LETTERS, self.counts))
+
+    def shortfall(self, letters: Iterable[str]) -> int:
+        """how many of letters aren't in the rack as themselves, i.e. need a blank"""
+        return sum(self.blanked(letters))
+
+    def can_make(self, letters: Iterable[str]) -> bool:
+        """
+        whether the rack holds all of letters, blanks standing in for missing
+        ones. False for anything that isn't a letter or "?"
+        """
+        letters = list(letters)
+        if not all(letter.lower() in SLOTS for letter in letters):
+            return False
+        return self.shortfall(letters) <= self.blanks
+
+    def can_make_all(self, word_counts: np.ndarray) -> np.ndarray:
+        """can_make for every row of a (words, 26) count array at once"""
+        short = np.maximum(word_counts.astype(np.int16) - self.counts[:BLANK], 0).sum(axis=1)
+        return short <= self.blanks
+
+    def formable(self, word_counts: WordCounts, min_length: int = 2, max_length: Optional[int] = None) -> list[str]:
+        """every word of word_counts (e.g. Dictionary.word_counts) the rack can make on its own"""
+        end = word_counts.up_to(len(self) if max_length is None else min(max_length, len(self)))
+        start = word_counts.up_to(min_length - 1)
+        fits = self.can_make_all(word_counts.counts[start:end])
+        return [word_counts.words[i] for i in np.flatnonzero(fits) + start]
+
+    def blanked(self, letters: Iterable[str]) -> list[bool]:
+        """
+        for each of letters, whether it has to come from a blank: real
+        tiles are used first, in order, then blanks
+        """
+        left = self.counts.tolist()  # one word at a time is quicker in plain python
+        needs_blank = []
+        for letter in letters:
+            slot = SLOTS[letter.lower()]
+            if left[slot] and slot != BLANK:
+                left[slot] -= 1
+                needs_blank.append(False)
+            else:
+                needs_blank.append(True)
+        return needs_blank
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Rack) and bool((self.counts == other.counts).all())
+
+    def __hash__(self) -> int:
+        return hash(self.counts.tobytes())
+
+    def __repr__(self) -> str:
+        return f"<Rack {self.letters()}>"
@@ -0,0 +1,107 @@
+"""
+Runs a bot in its own process, so a bot that hangs or crashes only costs
+it its turn instead of taking the game (or a whole tournament) down.
+
+The bot is forked off with a copy of the game when the game starts and is
+kept for the whole game, so anything it keeps on self between turns is
+still there. Each turn the host sends over what changed, then waits for
+the bot's decision until its deadline, after which the process is killed.
+Moves the bot proposes along the way are sent as they're made, so the
+host still has the best one if it has to stop the bot.
+Needs fork, so POSIX only.
+"""
+import multiprocessing
+import time
+from typing import Optional
+
+# host ends of the pipes of every bot process started from this process
+_host_connections: set = set()
+_in_bot_process = False
+
+
+def in_bot_process() -> bool:
+    """whether this is a bot's own process, rather than a game host"""
+    return _in_bot_process
+
+
+class BotTimeout(Exception):
+    def __init__(self, message: str, proposal: Optional[tuple] = None):
+        super().__init__(message)
+        self.proposal = proposal  # the bot's best move so far, if it proposed one
+
+
+class BotCrashed(Exception):
+    def __init__(self, message: str, proposal: Optional[tuple] = None):
+        super().__init__(message)
+        self.proposal = proposal
+
+
+class BotProcess:
+    def __init__(self, api):
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("Running bots in their own process needs fork, which this platform doesn't have.")
+        context = multiprocessing.get_context("fork")
+        self.__conn, child_conn = context.Pipe()
+        _host_connections.add(self.__conn)
+        self.process = context.Process(target=_serve, args=(api, child_conn), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def decide(self, state: tuple, timeout: float) -> tuple[Optional[tuple], float]:
+        """
+        Sends the state over and waits up to timeout seconds for the bot's
+        (task, elapsed). Raises BotTimeout (after killing it) if the bot is
+        too slow, BotCrashed if it raised or died, both carrying the last
+        move the bot proposed.
+        """
+        deadline = time.perf_counter() + timeout
+        proposal = None
+        try:
+            self.__conn.send(state)
+            while True:
+                if not self.__conn.poll(max(deadline - time.perf_counter(), 0)):
+                    self.kill()
+                    raise BotTimeout(f"no move after {timeout:.3f}s", proposal)
+                status, payload, elapsed = self.__conn.recv()
+                if status != "proposal":
+                    break
+                proposal = payload
+        except (EOFError, OSError):
+            self.kill()
+            raise BotCrashed("bot process died", proposal)
+        if status == "error":
+            raise BotCrashed(payload, proposal)
+        return payload, elapsed
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+
+    def close(self):
+        """asks the bot process to stop, killing it if it won't"""
+        try:
+            self.__conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        self.kill()
+        _host_connections.discard(self.__conn)
+        self.__conn.close()
+
+
+def _serve(api, conn):
+    """start of the bot process"""
+    global _in_bot_process
+    _in_bot_process = True
+    # The fork copied the host's end of every bot's pipe made so far (this
+    # one's included). Close them, so this bot can't read another bot's
+    # decisions or send it fake turns.
+    for host_conn in _host_connections:
+        host_conn.close()
+    _host_connections.clear()
+    api.serve(conn)
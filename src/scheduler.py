@@ -0,0 +1,37 @@
+"""
+Plays lots of games at once on one event loop. Each game is a task, and
+whenever a bot awaits (a model server, a socket, asyncio.sleep) the other
+games carry on, so one process can keep hundreds of I/O bound games going.
+
+    results = run_games(games, concurrency=200)
+
+Blocking bots work too, they just hold up every other game while they
+think. A bot's clock is wall time, including time spent waiting for other
+games to give the loop back, so don't put slow blocking bots on the same
+loop as bots that are timed tightly.
+"""
+import asyncio
+from typing import Iterable, Optional
+
+from src.game import Game, GameResult
+
+
+async def play_games(games: Iterable[Game], concurrency: Optional[int] = None) -> list[GameResult]:
+    """
+    Plays every game on the running loop, at most concurrency at a time
+    (all at once by default). Results come back in the order of games.
+    """
+    limit = asyncio.Semaphore(concurrency) if concurrency else None
+
+    async def play(game: Game) -> GameResult:
+        if limit is None:
+            return await game.play()
+        async with limit:
+            return await game.play()
+
+    return list(await asyncio.gather(*(play(game) for game in games)))
+
+
+def run_games(games: Iterable[Game], concurrency: Optional[int] = None) -> list[GameResult]:
+    """play_games on a new event loop, for when you aren't already in one"""
+    return asyncio.run(play_games(games, concurrency))
@@ -0,0 +1,142 @@
+"""
+Scores whole batches of placements at once with NumPy, for ranking lots of
+candidate moves. Gives exactly what Board.measure (and so Game.place_word)
+would: every word formed, premiums that aren't used up, bingo bonus.
+
+For each square and direction the runs of tiles already on the board just
+before and just after it are tabled (length, letter total, word multiplier)
+once per position, so a placement's main word is its own squares plus the
+runs off either end, and each new tile's crossword is that tile plus the
+runs either side of it the other way. Candidates are padded to the longest
+word and scored as (candidates, longest) arrays.
+"""
+from typing import Iterable, Optional
+
+import numpy as np
+
+from src.board import LETTER_SCORES, Board
+from src.move import BINGO_BONUS, BINGO_TILES
+
+_LETTER_SCORES = np.array(LETTER_SCORES, dtype=np.int64)
+
+
+class PlacementScorer:
+    """
+    Batch scoring against one board. The tables follow the board, they're
+    rebuilt (a fraction of a millisecond) whenever it changes.
+    """
+
+    def __init__(self, board: Board):
+        self.board = board
+        self.__version: Optional[int] = None
+        self.__letter_multipliers = np.frombuffer(board.letter_multipliers, dtype=np.uint8).astype(np.int64)
+        self.__word_multipliers = np.frombuffer(board.word_multipliers, dtype=np.uint8).astype(np.int64)
+
+    def score(self, placements: Iterable[tuple[int, int, str, bool]]) -> np.ndarray:
+        """
+        Scores of (row, col, word, is_vertical) placements, bingo included, as
+        an int array. The placements have to fit on the board (in bounds,
+        agreeing with tiles already there) but aren't checked any further,
+        that's Game.evaluate_move's job. Raises ValueError for one that
+        doesn't fit.
+        """
+        placements = list(placements)
+        if not placements:
+            return np.zeros(0, dtype=np.int64)
+        self.__update()
+        board = self.board
+        rows, cols = board.rows, board.cols
+
+        row = np.fromiter((p[0] for p in placements), dtype=np.int64, count=len(placements))
+        col = np.fromiter((p[1] for p in placements), dtype=np.int64, count=len(placements))
+        vertical = np.fromiter((p[3] for p in placements), dtype=bool, count=len(placements))
+        words = [p[2] for p in placements]
+        length = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+        longest = max(int(length.max()), 1)
+        codes = np.array([word.encode() for word in words], dtype=f"S{longest}").view(np.uint8).reshape(-1, longest)
+        codes = codes.astype(np.int64)
+
+        last_row = row + np.where(vertical, length - 1, 0)
+        last_col = col + np.where(vertical, 0, length - 1)
+        outside = (row < 0) | (col < 0) | (last_row >= rows) | (last_col >= cols)
+        if outside.any():
+            bad = placements[int(np.flatnonzero(outside)[0])]
+            raise ValueError(f"Position {bad[:2]} out of bounds for {bad[2]}")
+
+        # (candidates, longest) grids of squares, the word's own letters and what's there already
+        step = np.where(vertical, cols, 1)
+        offsets = np.arange(longest)
+        in_word = offsets < length[:, None]
+        squares = np.where(in_word, (row * cols + col)[:, None] + offsets * step[:, None], 0)
+        on_board = self.__cells[squares] * in_word
+        new = in_word & (on_board == 0)
+        clash = in_word & (on_board != 0) & (on_board != codes)
+        if clash.any():
+            bad = placements[int(np.flatnonzero(clash.any(axis=1))[0])]
+            raise ValueError(f"{bad[2]} has invalid placement at {bad[:2]}")
+
+        free = ~self.__used[squares]
+        letters = _LETTER_SCORES[codes] * np.where(free, self.__letter_multipliers[squares], 1)
+        word_multipliers = np.where(free & in_word, self.__word_multipliers[squares], 1)
+
+        # main word, running on into any tiles touching either end
+        along = vertical.astype(np.int64)
+        first = squares[:, 0]
+        last = squares[np.arange(len(words)), np.maximum(length - 1, 0)]
+        before_length, before_total, before_multiplier = self.__before[:, along, first]
+        after_length, after_total, after_multiplier = self.__after[:, along, last]
+        main = (
+            ((letters * in_word).sum(axis=1) + before_total + after_total)
+            * word_multipliers.prod(axis=1) * before_multiplier * after_multiplier
+        )
+        main = np.where(length + before_length + after_length > 1, main, 0)
+
+        # crosswords, one per new tile with a tile next to it the other way
+        across = (1 - along)[:, None]
+        before_length, before_total, before_multiplier = self.__before[:, across, squares]
+        after_length, after_total, after_multiplier = self.__after[:, across, squares]
+        crossing = new & (before_length + after_length > 0)
+        cross = (letters + before_total + after_total) * word_multipliers * before_multiplier * after_multiplier
+        cross = (cross * crossing).sum(axis=1)
+
+        bingo = np.where(new.sum(axis=1) == BINGO_TILES, BINGO_BONUS, 0)
+        return main + cross + bingo
+
+    def __update(self):
+        """rebuilds the run tables if the board has changed"""
+        board = self.board
+        if board.version == self.__version:
+            return
+        self.__version = board.version
+        self.__cells = np.frombuffer(bytes(board.cells), dtype=np.uint8).astype(np.int64)
+        self.__used = np.frombuffer(bytes(board.used), dtype=np.uint8).astype(bool)
+
+        free = ~self.__used
+        tile_total = _LETTER_SCORES[self.__cells] * np.where(free, self.__letter_multipliers, 1)
+        tile_multiplier = np.where(free & (self.__cells != 0), self.__word_multipliers, 1)
+
+        # [length / total / word multiplier, direction (0 across, 1 down), square]
+        rows, cols = board.rows, board.cols
+        before = np.zeros((3, 2, rows * cols), dtype=np.int64)
+        before[2] = 1
+        after = before.copy()
+        cells = board.cells
+        lines = [
+            [range(row * cols, (row + 1) * cols) for row in range(rows)],
+            [range(col, rows * cols, cols) for col in range(cols)],
+        ]
+        for direction, direction_lines in enumerate(lines):
+            for line in direction_lines:
+                for table, squares in ((before, list(line)), (after, list(line)[::-1])):
+                    length, total, multiplier = 0, 0, 1
+                    for index in squares:
+                        table[0, direction, index] = length
+                        table[1, direction, index] = total
+                        table[2, direction, index] = multiplier
+                        if cells[index]:
+                            length += 1
+                            total += int(tile_total[index])
+                            multiplier *= int(tile_multiplier[index])
+                        else:
+                            length, total, multiplier = 0, 0, 1
+        self.__before, self.__after = before, after
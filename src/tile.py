@@ -9,6 +9,8 @@ class Tile:
     Basic scrabble tile, can either be blank or have a letter.
     """
 
+    __slots__ = ("letter",)
+
     def __init__(self, letter: str = ""):
         """Initialize a tile with an optional letter (default is blank). Use "?" for blank tiles."""
         self.letter = letter
@@ -92,11 +94,17 @@ class TileBag:
         "z": 10,
     }
 
-    def __init__(self):
+    # slot of each letter in counts(), blank last
+    letters = "abcdefghijklmnopqrstuvwxyz?"
+    slots = {letter: slot for slot, letter in enumerate(letters)}
+    # tiles only differ by letter, so every bag hands out these same 27
+    tiles = {letter: Tile(letter) for letter in letters}
+
+    def __init__(self, rng: Optional[random.Random] = None):
         # Scrabble tile distribution:
         """
-        Makes a shuffled list of tiles, also look here for all tile score
-        values and distributions.
+        Bag of tiles, also look here for all tile score values and
+        distributions.
 
         From wikipedia:
         2 blank tiles (scoring 0 points)
@@ -107,39 +115,62 @@ class TileBag:
         5 points: K ×1
         8 points: J ×1, X ×1
         10 points: Q ×1, Z ×1
+
+        Only how many of each letter are left is kept, and a draw picks a
+        letter weighted by those counts, the same odds as drawing from a
+        shuffled bag without ever shuffling anything.
+        rng is used for every draw, pass a seeded one for repeatable games.
         """
-        self.__tiles = []
+        self.rng = rng if rng is not None else random.Random()
+        self.__counts = [0] * len(self.letters)
         for letter, count in self.distribution.items():
-            self.__tiles.extend([Tile(letter) for _ in range(count)])
-        random.shuffle(self.__tiles)
+            self.__counts[self.slots[letter]] = count
+        self.__total = sum(self.__counts)
 
     def is_empty(self):
-        return len(self.__tiles) == 0
+        return self.__total == 0
+
+    def counts(self) -> list[int]:
+        """how many of each letter are left, in the order of TileBag.letters"""
+        return self.__counts.copy()
+
+    def copy(self, rng: Optional[random.Random] = None) -> "TileBag":
+        """
+        Another bag with the same tiles left, to draw from without touching
+        this one. It gets its own rng (an unseeded one by default).
+        """
+        bag = TileBag.__new__(TileBag)
+        bag.rng = rng if rng is not None else random.Random()
+        bag.__counts = self.__counts.copy()
+        bag.__total = self.__total
+        return bag
 
     def add(self, tiles: Tile | list[Tile]):
-        """add a list or one tile to the bag, it gets reshuffled"""
-        if isinstance(tiles, list):
-            self.__tiles.extend(tiles)
-        else:
-            self.__tiles.append(tiles)
-        random.shuffle(self.__tiles)
+        """add a list or one tile to the bag"""
+        for tile in tiles if isinstance(tiles, list) else (tiles,):
+            self.__counts[self.slots[tile.letter]] += 1
+            self.__total += 1
 
     def draw(self) -> Optional[Tile]:
         """draw a tile"""
-        return self.__tiles.pop() if self.__tiles else None
+        if not self.__total:
+            return None
+        counts = self.__counts
+        pick = self.rng.randrange(self.__total)
+        slot = 0
+        while pick >= counts[slot]:
+            pick -= counts[slot]
+            slot += 1
+        counts[slot] -= 1
+        self.__total -= 1
+        return self.tiles[self.letters[slot]]
 
     def draw_n(self, n: int) -> list[Tile]:
         """draw n tiles"""
-        i = 0
-        tiles: list[Tile] = []
-        while self.__tiles and i < n:
-            i += 1
-            tiles.append(self.draw())
-        return tiles
+        return [self.draw() for _ in range(min(n, self.__total))]
 
     def __len__(self) -> int:
-        return len(self.__tiles)
-
+        return self.__total
 
 
 class BoardTile(Tile):
@@ -147,6 +178,8 @@ class BoardTile(Tile):
     A tile on the Scrabble board that may have special properties.
     """
 
+    __slots__ = ("multiplier", "is_word_multiplier", "used_up")
+
     def __init__(self, multiplier: int = 1, is_word_multiplier: bool = False):
         super().__init__()
         self.multiplier = multiplier
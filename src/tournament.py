@@ -0,0 +1,276 @@
+"""
+Plays bots against each other over lots of headless games, spread over
+every core, e.g.
+
+    python -m src.tournament src.my_bot:MyBot src.other_bot:OtherBot --games 1000
+    python -m src.tournament a:Bot b:Bot c:Bot d:Bot --swiss 5
+    python -m src.tournament a:Bot b:Bot --isolate
+
+--isolate runs every bot in its own process with a hard deadline, so a bot
+that hangs only loses its clock instead of stalling the tournament.
+
+Bot classes are sent to the worker processes by name, so they have to be
+defined at the top level of an importable module.
+"""
+import argparse
+import importlib
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from src.api import Api
+from src.dictionary import Dictionary
+from src.game import Game
+from src.player import Player
+
+
+class SeatResult(NamedTuple):
+    """how one seat did in one game"""
+
+    score: int
+    turns: int
+    total_latency_s: float
+    max_latency_s: float
+    timeouts: int
+
+
+def play_game(
+    bots: tuple[type[Api], ...], names: tuple[str, ...], seed: int, isolate_bots: bool = False
+) -> list[SeatResult]:
+    """Plays one headless game, returns how each seat did in seat order. Runs in a worker process"""
+    game = Game(headless=True, seed=seed, isolate_bots=isolate_bots)
+    for name, bot in zip(names, bots):
+        player = Player(name)
+        game.add_player(player)
+        player.assign_bot(game, bot)
+    result = game.start()
+    seats = []
+    for name, score in zip(result.players, result.scores):
+        latencies = [turn.elapsed_s for turn in result.history if turn.player == name]
+        timeouts = sum(turn.timed_out for turn in result.history if turn.player == name)
+        seats.append(SeatResult(score, len(latencies), sum(latencies), max(latencies, default=0.0), timeouts))
+    return seats
+
+
+def round_robin(count: int) -> list[tuple[int, int]]:
+    """every pair of entrants once"""
+    return list(combinations(range(count), 2))
+
+
+def swiss_pairings(standings: list["Standing"], played: set[tuple[int, int]]) -> list[tuple[int, int]]:
+    """
+    Pairs entrants with similar points, avoiding rematches where possible.
+    With an odd number of entrants the lowest unpaired one sits the round out.
+    """
+    waiting = sorted(range(len(standings)), key=lambda i: -standings[i].points)
+    pairs = []
+    while len(waiting) > 1:
+        first = waiting.pop(0)
+        opponent = next((i for i in waiting if (min(first, i), max(first, i)) not in played), waiting[0])
+        waiting.remove(opponent)
+        pairs.append((min(first, opponent), max(first, opponent)))
+    return pairs
+
+
+class Standing:
+    """One entrant's record, a draw is worth half a win"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.total_score = 0
+        self.total_spread = 0
+        self.turns = 0
+        self.total_latency_s = 0.0
+        self.max_latency_s = 0.0
+        self.timeouts = 0
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def points(self) -> float:
+        return self.wins + self.draws / 2
+
+    @property
+    def win_rate(self) -> float:
+        return self.points / self.games if self.games else 0.0
+
+    @property
+    def mean_score(self) -> float:
+        return self.total_score / self.games if self.games else 0.0
+
+    @property
+    def mean_spread(self) -> float:
+        return self.total_spread / self.games if self.games else 0.0
+
+    @property
+    def mean_latency_s(self) -> float:
+        """average time taken per turn"""
+        return self.total_latency_s / self.turns if self.turns else 0.0
+
+    def confidence_interval(self, z: float = 1.96) -> tuple[float, float]:
+        """Wilson score interval for the win rate, 95% by default"""
+        n = self.games
+        if not n:
+            return 0.0, 1.0
+        p = self.win_rate
+        centre = (p + z * z / (2 * n)) / (1 + z * z / n)
+        margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        return max(0.0, centre - margin), min(1.0, centre + margin)
+
+    def record(self, score: int, opponent_score: int):
+        self.total_score += score
+        self.total_spread += score - opponent_score
+        if score > opponent_score:
+            self.wins += 1
+        elif score < opponent_score:
+            self.losses += 1
+        else:
+            self.draws += 1
+
+    def record_latency(self, seat: SeatResult):
+        self.turns += seat.turns
+        self.total_latency_s += seat.total_latency_s
+        self.max_latency_s = max(self.max_latency_s, seat.max_latency_s)
+        self.timeouts += seat.timeouts
+
+    def __repr__(self) -> str:
+        low, high = self.confidence_interval()
+        return (
+            f"<Standing {self.name} {self.wins}-{self.draws}-{self.losses} "
+            f"win rate {self.win_rate:.3f} [{low:.3f}, {high:.3f}]>"
+        )
+
+
+class Tournament:
+    """
+    Round robin (every pair plays games_per_pair games) or, given a number
+    of rounds, a Swiss tournament (each round pairs entrants on similar
+    points, and each pairing plays games_per_pair games).
+    Seats are swapped every other game of a pairing, and both games of a
+    swapped pair use the same seed (same bag order, same first seat) so luck
+    of the draw mostly cancels out.
+    workers=1 plays everything in this process, handy for debugging a bot.
+    isolate_bots=True runs each bot in its own process with a hard deadline
+    (see Game), for tournaments left running unattended.
+    """
+
+    def __init__(
+        self,
+        bots: Iterable[type[Api]],
+        games_per_pair: int = 2,
+        swiss_rounds: Optional[int] = None,
+        workers: Optional[int] = None,
+        seed: int = 0,
+        isolate_bots: bool = False,
+    ):
+        self.bots = list(bots)
+        if len(self.bots) < 2:
+            raise ValueError("A tournament needs at least two bots.")
+        self.games_per_pair = games_per_pair
+        self.swiss_rounds = swiss_rounds
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+        self.isolate_bots = isolate_bots
+        self.games_played = 0
+
+        names = [bot.__name__ for bot in self.bots]
+        self.names = [
+            f"{name}#{names[:i].count(name) + 1}" if names.count(name) > 1 else name
+            for i, name in enumerate(names)
+        ]
+        self.standings = [Standing(name) for name in self.names]
+
+    def run(self) -> list[Standing]:
+        """Plays the whole tournament, returns the standings best first"""
+        # compile the lexicon once here, so the workers just map it instead
+        # of all compiling it at the same time
+        Dictionary(Game.DICTIONARY_PATH)
+        if self.workers == 1:
+            self.__run(map)
+        else:
+            with ProcessPoolExecutor(self.workers) as pool:
+                self.__run(lambda *args: pool.map(*args, chunksize=8))
+        return self.table()
+
+    def table(self) -> list[Standing]:
+        return sorted(self.standings, key=lambda standing: (-standing.win_rate, -standing.mean_spread))
+
+    def __run(self, map_games):
+        if self.swiss_rounds is None:
+            self.__play(map_games, round_robin(len(self.bots)))
+            return
+
+        played: set[tuple[int, int]] = set()
+        for _ in range(self.swiss_rounds):
+            pairs = swiss_pairings(self.standings, played)
+            played.update(pairs)
+            self.__play(map_games, pairs)
+
+    def __games(self, pairs: list[tuple[int, int]]) -> Iterator[tuple[int, int, int]]:
+        """(first seat, second seat, seed) for every game"""
+        seed = self.seed + self.games_played
+        for first, second in pairs:
+            for game in range(self.games_per_pair):
+                if game % 2 == 0:
+                    yield first, second, seed + game
+                else:
+                    yield second, first, seed + game - 1
+            seed += self.games_per_pair
+
+    def __play(self, map_games, pairs: list[tuple[int, int]]):
+        games = list(self.__games(pairs))
+        seats = [(a, b) for a, b, _ in games]
+        seeds = [seed for _, _, seed in games]
+        results = map_games(
+            play_game,
+            [(self.bots[a], self.bots[b]) for a, b in seats],
+            [(self.names[a], self.names[b]) for a, b in seats],
+            seeds,
+            [self.isolate_bots] * len(seats),
+        )
+        for (a, b), (seat_a, seat_b) in zip(seats, results):
+            self.standings[a].record(seat_a.score, seat_b.score)
+            self.standings[b].record(seat_b.score, seat_a.score)
+            self.standings[a].record_latency(seat_a)
+            self.standings[b].record_latency(seat_b)
+        self.games_played += len(seats)
+
+
+def load_bot(spec: str) -> type[Api]:
+    """"package.module:ClassName" -> the class"""
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play bots against each other")
+    parser.add_argument("bots", nargs="+", help="bot classes as module:ClassName")
+    parser.add_argument("--games", type=int, default=2, help="games per pairing")
+    parser.add_argument("--swiss", type=int, metavar="ROUNDS", help="Swiss rounds instead of a round robin")
+    parser.add_argument("--workers", type=int, help="processes to use, every core by default")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--isolate", action="store_true", help="run each bot in its own process with a hard deadline")
+    args = parser.parse_args()
+
+    tournament = Tournament(
+        [load_bot(spec) for spec in args.bots], args.games, args.swiss, args.workers, args.seed, args.isolate
+    )
+    print(
+        f"{'bot':<20} {'W-D-L':>12} {'win rate':>9} {'95% CI':>15} {'score':>7} {'spread':>7} "
+        f"{'ms/turn':>8} {'max ms':>8} {'timeouts':>8}"
+    )
+    for standing in tournament.run():
+        low, high = standing.confidence_interval()
+        print(
+            f"{standing.name:<20} {f'{standing.wins}-{standing.draws}-{standing.losses}':>12} "
+            f"{standing.win_rate:>9.3f} {f'{low:.3f}-{high:.3f}':>15} "
+            f"{standing.mean_score:>7.1f} {standing.mean_spread:>+7.1f} "
+            f"{standing.mean_latency_s * 1000:>8.1f} {standing.max_latency_s * 1000:>8.1f} {standing.timeouts:>8}"
+        )
@@ -0,0 +1,57 @@
+"""
+Transposition table for bots searching ahead, keyed by Board.hash and rack.
+"""
+
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional
+
+
+class TranspositionTable:
+    """
+    Bounded cache of search results. A position is the board's Zobrist hash
+    plus a rack, the order of the letters in the rack doesn't matter.
+    Once full, the least recently used entry is dropped.
+    """
+
+    def __init__(self, max_size: int = 100_000):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.__entries: OrderedDict[Hashable, Any] = OrderedDict()
+
+    @staticmethod
+    def key(board_hash: int, rack: Iterable[str] = ()) -> tuple[int, str]:
+        return board_hash, "".join(sorted(rack))
+
+    def get(self, board_hash: int, rack: Iterable[str] = (), default: Optional[Any] = None) -> Any:
+        key = self.key(board_hash, rack)
+        try:
+            value = self.__entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.__entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, board_hash: int, rack: Iterable[str], value: Any):
+        key = self.key(board_hash, rack)
+        self.__entries[key] = value
+        self.__entries.move_to_end(key)
+        if len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+
+    def clear(self):
+        self.__entries.clear()
+        self.hits = self.misses = 0
+
+    def __contains__(self, position: tuple[int, Iterable[str]]) -> bool:
+        return self.key(*position) in self.__entries
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __repr__(self) -> str:
+        return f"<TranspositionTable {len(self)}/{self.max_size} hits={self.hits} misses={self.misses}>"
@@ -0,0 +1,107 @@
+"""
+The tiles a player hasn't seen yet (the bag plus everyone else's hands),
+and the odds of drawing them.
+
+Draws really come from the bag alone, but a player can't tell the bag
+from the other hands, so the unseen pool stands in for it, the usual
+approximation. Probabilities are hypergeometric (drawing without
+replacement) and worked out for every letter at once with NumPy.
+"""
+from math import comb
+from typing import Iterable
+
+import numpy as np
+
+from src.tile import TileBag
+
+LETTERS = TileBag.letters
+SLOTS = TileBag.slots
+_TOTAL = sum(TileBag.distribution.values())
+
+# _CHOOSE[n, k] = n choose k, 0 when k > n
+_CHOOSE = np.array([[comb(n, k) for k in range(_TOTAL + 1)] for n in range(_TOTAL + 1)], dtype=np.float64)
+
+
+def full_counts() -> list[int]:
+    """counts of a whole set of tiles, in the order of TileBag.letters"""
+    counts = [0] * len(LETTERS)
+    for letter, count in TileBag.distribution.items():
+        counts[SLOTS[letter]] = count
+    return counts
+
+
+class UnseenTiles:
+    """
+    How many of each letter are unseen, counts in the order of
+    TileBag.letters ("?" last). n is always how many tiles get drawn.
+    """
+
+    def __init__(self, counts: Iterable[int]):
+        self.counts = np.array(counts, dtype=np.int64)
+        self.counts.flags.writeable = False
+        self.total = int(self.counts.sum())
+
+    def __getitem__(self, letter: str) -> int:
+        return int(self.counts[SLOTS[letter]])
+
+    def __len__(self) -> int:
+        return self.total
+
+    def as_dict(self) -> dict[str, int]:
+        """letter -> count, letters with none left included"""
+        return {letter: int(count) for letter, count in zip(LETTERS, self.counts)}
+
+    def pmf(self, n: int) -> np.ndarray:
+        """
+        table[slot, j] is the chance of drawing exactly j of that letter in
+        n draws, shape (27, n + 1)
+        """
+        n = self.__draws(n)
+        j = np.arange(n + 1)
+        counts = self.counts[:, None]
+        return _CHOOSE[counts, j] * _CHOOSE[self.total - counts, n - j] / _CHOOSE[self.total, n]
+
+    def p_at_least(self, n: int, k: int = 1) -> np.ndarray:
+        """chance of drawing at least k of each letter in n draws, shape (27,)"""
+        if k <= 0:
+            return np.ones(len(LETTERS))
+        return self.pmf(n)[:, k:].sum(axis=1)
+
+    def p_any(self, letters: str, n: int) -> float:
+        """chance of drawing at least one tile that is any of letters, e.g. "s?" """
+        n = self.__draws(n)
+        wanted = int(sum(self.counts[SLOTS[letter]] for letter in set(letters)))
+        return float(1 - _CHOOSE[self.total - wanted, n] / _CHOOSE[self.total, n])
+
+    def p_draw(self, letters: str, n: int) -> float:
+        """
+        chance n draws include every one of letters (repeats count), e.g.
+        p_draw("es", 2) for the two tiles that turn a leave into a bingo
+        """
+        n = self.__draws(n)
+        needed = np.zeros(len(LETTERS), dtype=np.int64)
+        for letter in letters:
+            needed[SLOTS[letter]] += 1
+        if needed.sum() > n or (needed > self.counts).any():
+            return 0.0
+
+        # ways to pick the n tiles, as a polynomial in how many are picked:
+        # at least needed of each wanted letter times anything of the rest
+        wanted = np.flatnonzero(needed)
+        rest = self.total - int(self.counts[wanted].sum())
+        ways = _CHOOSE[rest, : n + 1]
+        for slot in wanted:
+            count = int(self.counts[slot])
+            picks = _CHOOSE[count, : n + 1].copy()
+            picks[: needed[slot]] = 0
+            ways = np.convolve(ways, picks)[: n + 1]
+        return float(ways[n] / _CHOOSE[self.total, n])
+
+    def __draws(self, n: int) -> int:
+        if n < 0:
+            raise ValueError(f"Can't draw {n} tiles")
+        return min(n, self.total)
+
+    def __repr__(self) -> str:
+        letters = " ".join(f"{letter}{count}" for letter, count in self.as_dict().items() if count)
+        return f"<UnseenTiles {self.total}: {letters}>"
@@ -0,0 +1,33 @@
+"""Bots shared by the tests, kept at the top level of a module so they can be sent to worker processes"""
+from src.api import Api
+
+
+class PassingBot(Api):
+    def _on_turn(self):
+        self.pass_turn()
+
+
+class OpeningBot(Api):
+    """plays the first word it can make across the centre, then passes"""
+
+    def _on_turn(self):
+        if self.board[7][7].letter:
+            self.pass_turn()
+        hand = "".join(self.get_tiles_in_hand()).replace("?", "")
+        for word in self.get_dictionary().formable(hand):
+            self.place_word(word, False, 7, 7)
+        self.pass_turn()
+
+
+class BestMoveBot(Api):
+    """plays the best move it can"""
+
+    def _on_turn(self):
+        for word, is_vertical, x, y, _ in self.generate_moves(best=1):
+            self.place_word(word, is_vertical, x, y)
+        self.pass_turn()
+
+
+class ExchangingBot(Api):
+    def _on_turn(self):
+        self.discard_letters(self.get_tiles_in_hand()[:1])
@@ -32,3 +32,16 @@ def game():
 def player():
     """Provides a test player"""
     return Player("TestPlayer")
+@pytest.fixture
+def make_game():
+    """Provides a factory for headless games with one player per bot, named Bot0, Bot1, ..."""
+    def make_game(*bots, seed=None, isolate_bots=False, time_s=None) -> Game:
+        game = Game(headless=True, seed=seed, isolate_bots=isolate_bots)
+        for i, bot in enumerate(bots):
+            player = Player(f"Bot{i}")
+            if time_s is not None:
+                player.time_remaining_s = time_s
+            game.add_player(player)
+            player.assign_bot(game, bot)
+        return game
+    return make_game
@@ -0,0 +1,304 @@
+"""Tests for the bot Api"""
+import time
+
+import pytest
+from copy import deepcopy
+from src.api import Api, MoveException, NotReadyException
+from src.game import Game
+from src.dictionary import ReadOnlyDictionary
+from src.player import Player
+from src.tile import Tile
+from tests.bots import PassingBot
+
+
+class RecordingBot(Api):
+    """plays the best move it can and keeps every delta it's handed"""
+
+    def _init(self):
+        self.deltas = []
+
+    def _on_turn(self):
+        self.deltas.append(self.get_moves_since_last_turn())
+        for word, is_vertical, x, y, _ in self.generate_moves(best=1):
+            self.place_word(word, is_vertical, x, y)
+        self.pass_turn()
+
+
+class ProposingBot(Api):
+    """proposes each move better than the last, then stops searching"""
+
+    def _init(self):
+        self.clocks = []
+
+    def _on_turn(self):
+        self.clocks.append((self.time_left(), self.deadline() - time.perf_counter()))
+        best = 0
+        for word, is_vertical, x, y, score in self.iter_moves():
+            if score > best:
+                best = score
+                self.propose_move(word, is_vertical, x, y)
+
+
+class CountingBot(Api):
+    """plays the best move it can, checking the unseen tiles against the board first"""
+
+    def _on_turn(self):
+        unseen = self.get_unseen_tiles()
+        board = sum(1 for code in self.board.cells if code)
+        assert unseen.total == 100 - board - len(self.get_tiles_in_hand())
+        for word, is_vertical, x, y, _ in self.generate_moves(best=1):
+            self.place_word(word, is_vertical, x, y)
+        self.pass_turn()
+
+
+class ChangeOfHeartBot(Api):
+    """proposes a move, then passes anyway"""
+
+    def _on_turn(self):
+        for word, is_vertical, x, y, _ in self.generate_moves(best=1):
+            self.propose_move(word, is_vertical, x, y)
+        self.pass_turn()
+
+
+class BadProposalBot(Api):
+    """proposes something that isn't a word and returns"""
+
+    def _on_turn(self):
+        self.propose_move("zqzqz", False, 7, 7)
+
+
+@pytest.fixture
+def bot(game):
+    """Provides a bot hooked into a fresh game"""
+    player = Player("Bot")
+    game.add_player(player)
+    player.assign_bot(game, PassingBot)
+    return player.api
+
+
+class TestApi:
+    """Test Api functionality"""
+
+    def test_api_not_ready_before_hook(self):
+        """Test that the Api refuses to answer before the game hooks it"""
+        with pytest.raises(NotReadyException):
+            PassingBot().get_dictionary()
+
+    def test_get_dictionary_is_read_only_view(self, bot, game):
+        """Test that bots get a read only view of the real dictionary"""
+        dictionary = bot.get_dictionary()
+        assert isinstance(dictionary, ReadOnlyDictionary)
+        assert "quiz" in dictionary
+        assert len(dictionary) == len(game.dictionary)
+
+    def test_get_dictionary_is_shared(self, bot):
+        """Test that every call returns the same object without copying"""
+        dictionary = bot.get_dictionary()
+        assert bot.get_dictionary() is dictionary
+        assert deepcopy(dictionary) is dictionary
+
+    def test_get_dictionary_cannot_be_mutated(self, bot, game):
+        """Test that bots can't change the hosts word list"""
+        dictionary = bot.get_dictionary()
+        with pytest.raises(AttributeError):
+            dictionary.path = None
+        with pytest.raises(AttributeError):
+            dictionary.words.add("notaword")
+        with pytest.raises(AttributeError):
+            dictionary.dawg.root = 0
+        with pytest.raises(TypeError):
+            dictionary.dawg.edges[1] = 0
+        assert "notaword" not in game.dictionary
+        assert "quiz" in game.dictionary
+
+    def test_get_dictionary_queries(self, bot):
+        """Test that the query methods work through the view"""
+        dictionary = bot.get_dictionary()
+        assert dictionary.is_prefix("scrab")
+        assert "scrabble" in dictionary.words_with_prefix("scrab")
+        node = dictionary.walk("qi")
+        assert node is not None
+        assert "s" in {letter for letter, _, _ in dictionary.children(node)}
+
+    def test_generate_moves(self, bot, game):
+        """Test that every generated move is legal and scored like place_word"""
+        bot_player = game.players[0]
+        bot_player.hand = [Tile(letter) for letter in "quizers"]
+        moves = bot.generate_moves()
+        assert moves
+        for word, is_vertical, x, y, score in moves:
+            assert bot.check_placement(word, is_vertical, x, y)
+            assert game.evaluate_move(y, x, word, is_vertical).score == score
+
+    def test_generate_best_moves(self, bot, game):
+        """Test best-k comes back best first"""
+        game.players[0].hand = [Tile(letter) for letter in "quizers"]
+        scores = sorted((move.score for move in bot.generate_moves()), reverse=True)
+        best = bot.generate_moves(best=5)
+        assert [move.score for move in best] == scores[:5]
+
+    def test_iter_moves_is_lazy(self, bot, game):
+        """Test moves can be pulled one at a time"""
+        game.players[0].hand = [Tile(letter) for letter in "quizers"]
+        moves = bot.iter_moves()
+        word, is_vertical, x, y, score = next(moves)
+        assert bot.check_placement(word, is_vertical, x, y)
+
+    def test_check_placements(self, bot, game):
+        """Test batch checks give validity and the place_word score"""
+        game.players[0].hand = [Tile(letter) for letter in "quizers"]
+        results = bot.check_placements([
+            ("quiz", False, 7, 7),
+            ("quiz", False, 0, 0),  # misses the centre
+            ("zzzz", False, 7, 7),
+            ("quizers", False, 4, 7),  # not a word
+            (None, False, 7, 7),
+            ("quiz", False, "a", 7),
+            ("quiz", False, 7.5, 7),
+            ("quiz", False, 7),
+            None,
+        ])
+        assert [result.valid for result in results] == [True] + [False] * 8
+        assert results[0].score == game.evaluate_move(7, 7, "quiz", False).score
+        assert all(result.score == 0 for result in results[1:])
+        assert game.board.is_empty()
+
+    def test_check_placements_matches_place_word(self, bot, game):
+        """Test the previewed score, bingo included, is what place_word awards"""
+        player = game.players[0]
+        player.hand = [Tile(letter) for letter in "example"]
+        game._set_player_turn(0)
+        [result] = bot.check_placements([("example", True, 7, 5)])
+        assert result.valid
+        game.place_word(5, 7, "example", True)
+        assert player.score == result.score > 50
+
+    def test_check_placements_takes_generated_moves(self, bot, game):
+        """Test generated moves can be fed straight back in"""
+        game.players[0].hand = [Tile(letter) for letter in "quizers"]
+        moves = bot.generate_moves()
+        results = bot.check_placements(moves)
+        assert all(result.valid for result in results)
+        assert [result.score for result in results] == [move.score for move in moves]
+
+    def test_board_snapshot(self, bot, game):
+        """Test the board is a cheap read only snapshot"""
+        board = bot.board
+        assert bot.board is board
+        assert board[7][7].letter == ""
+        game.board.place(7, 7, "a")
+        assert bot.board[7][7].letter == "a"
+        assert bot.board.version > board.version
+        with pytest.raises(AttributeError):
+            bot.board[7][7].letter = "b"
+
+
+class TestMovesSinceLastTurn:
+    """Test the feed of moves played between a bot's turns"""
+
+    def test_nothing_before_any_moves(self, bot):
+        """Test a fresh game has no moves to report"""
+        assert bot.get_moves_since_last_turn() == []
+
+    def test_deltas_cover_opponent_moves(self, make_game):
+        """Test each bot is told about exactly the other bot's moves, in order"""
+        game = make_game(RecordingBot, RecordingBot, seed=11)
+        result = game.start()
+
+        for player in game.players:
+            told = [move for delta in player.api.deltas for move in delta]
+            assert all(move.player != player.name for move in told)
+            last_turn = max(i for i, turn in enumerate(result.history) if turn.player == player.name)
+            expected = [
+                turn for turn in result.history[:last_turn]
+                if turn.move is not None and turn.player != player.name
+            ]
+            assert [(m.word, m.x, m.y, m.is_vertical, m.score) for m in told] == [
+                (t.move.word, t.move.col, t.move.row, t.move.is_vertical, t.score) for t in expected
+            ]
+
+    def test_placed_squares(self, make_game):
+        """Test the placed squares are the new tiles of the move"""
+        game = make_game(RecordingBot, RecordingBot, seed=3)
+        game.start()
+        for player in game.players:
+            for delta in player.api.deltas:
+                for move in delta:
+                    for x, y, letter in move.placed:
+                        assert game.board.letter_at(y, x) == letter
+
+
+class TestAnytime:
+    """Test proposing moves and the turn deadline"""
+
+    def test_proposal_is_played(self, make_game):
+        """Test a turn ending without an action plays the last proposal"""
+        game = make_game(ProposingBot, PassingBot, seed=2)
+        result = game.start()
+        played = [turn for turn in result.history if turn.player == "Bot0" and turn.move]
+        assert played
+        assert all(turn.action == "place" for turn in result.history if turn.player == "Bot0")
+
+    def test_proposal_is_the_best(self, make_game):
+        """Test the last proposal is the one played, not the first"""
+        first_turns = []
+        for bot in (ProposingBot, RecordingBot):
+            result = make_game(bot, PassingBot, seed=2).start()
+            first_turns.append(next(turn for turn in result.history if turn.player == "Bot0"))
+        assert first_turns[0].score == first_turns[1].score > 0
+
+    def test_action_beats_proposal(self, make_game):
+        """Test an explicit action overrides the proposal"""
+        result = make_game(ChangeOfHeartBot, PassingBot, seed=2).start()
+        assert all(turn.action == "pass" for turn in result.history)
+
+    def test_invalid_proposal_is_a_pass(self, capsys):
+        """Test a bad proposal passes rather than ending a normal (not headless) game"""
+        game = Game(have_gui=False, seed=2)
+        for i, bot in enumerate((BadProposalBot, PassingBot)):
+            player = Player(f"Bot{i}")
+            game.add_player(player)
+            player.assign_bot(game, bot)
+        result = game.start()
+        assert all(turn.action == "pass" for turn in result.history)
+        assert "proposal was invalid" in capsys.readouterr().out
+
+    def test_time_left(self, make_game):
+        """Test the clock the bot sees counts down from its remaining time"""
+        game = make_game(ProposingBot, PassingBot, seed=2)
+        game.start()
+        api = game.players[0].api
+        assert api.clocks
+        for time_left, until_deadline in api.clocks:
+            assert 0 < time_left <= 180
+            assert abs(time_left - until_deadline) < 0.01
+        assert api.clocks[-1][0] < api.clocks[0][0]
+
+    def test_propose_move_arguments(self, bot):
+        """Test bad proposals are refused straight away"""
+        with pytest.raises(MoveException):
+            bot.propose_move("cat", "across", 7, 7)
+
+
+class TestUnseenTiles:
+    """Test the unseen tile tracker"""
+
+    def test_start_of_game(self, bot):
+        """Test everything is unseen before anything is dealt"""
+        assert bot.get_unseen_tiles().total == 100
+
+    def test_own_hand_and_board(self, bot, game):
+        """Test the bot's hand and played tiles aren't unseen, blanks counted as blanks"""
+        game._set_player_turn(0)
+        game.players[0].hand = [Tile(letter) for letter in "c?tsee"]
+        unseen = bot.get_unseen_tiles()
+        assert (unseen["c"], unseen["?"], unseen["e"]) == (1, 1, 10)
+        game.place_word(7, 7, "cat", False)  # the blank is the a
+        unseen = bot.get_unseen_tiles()
+        assert (unseen["c"], unseen["?"], unseen["a"], unseen["t"]) == (1, 1, 9, 5)
+        assert unseen.total == 100 - 6
+
+    def test_follows_the_game(self, make_game):
+        """Test the tracker keeps up over a whole game"""
+        result = make_game(CountingBot, CountingBot, seed=2).start()
+        assert len(result.moves) > 4
@@ -1,6 +1,10 @@
 """Tests for Board class"""
+import pickle
+from copy import deepcopy
+
 import pytest
 from src.board import Board
+from src.move import Move
 from src.tile import BoardTile
 
 
@@ -133,3 +137,230 @@ class TestBoard:
         empty_board.place(7, 7, "h")
         empty_board.place(7, 8, "i")
         empty_board.display()
+
+
+class TestBoardArrays:
+    """Test the array backed board state"""
+
+    def test_board_arrays(self, empty_board):
+        """Test that letters are stored as codes in a flat array"""
+        empty_board.place(7, 8, "q")
+        index = empty_board.index(7, 8)
+        assert index == 7 * 15 + 8
+        assert empty_board.cells[index] == ord("q")
+        assert empty_board.letter_at(7, 8) == "q"
+        assert empty_board.letter_at(0, 0) == ""
+
+    def test_board_premium_arrays(self, empty_board):
+        """Test the shared premium layout"""
+        assert empty_board.word_multipliers[empty_board.index(0, 0)] == 3
+        assert empty_board.letter_multipliers[empty_board.index(0, 3)] == 2
+        assert empty_board.word_multipliers is Board().word_multipliers
+
+    def test_board_tiles_are_views(self, empty_board):
+        """Test that tiles from get/grid read and write the board arrays"""
+        tile = empty_board.get(7, 7)
+        tile.place("a")
+        assert empty_board.letter_at(7, 7) == "a"
+        tile.use_up()
+        assert empty_board.used[empty_board.index(7, 7)] == 1
+        tile.clear()
+        assert empty_board.is_empty()
+
+        empty_board.place(3, 4, "z")
+        assert empty_board.grid[3][4].letter == "z"
+
+    def test_board_clear(self, empty_board):
+        """Test clearing a square"""
+        empty_board.place(7, 7, "a")
+        empty_board.clear(7, 7)
+        assert empty_board.is_empty()
+        assert empty_board.get(7, 7).is_empty()
+
+    def test_board_copy_is_independent(self, empty_board):
+        """Test that copies share nothing mutable with the original"""
+        empty_board.place(7, 7, "a")
+        copy = empty_board.copy()
+        copy.place(7, 8, "t")
+        copy.get(7, 7).use_up()
+        assert copy.letter_at(7, 8) == "t"
+        assert empty_board.letter_at(7, 8) == ""
+        assert not empty_board.get(7, 7).used_up
+        assert copy.get(7, 7).used_up
+
+    def test_board_state_hashable(self, empty_board):
+        """Test that equal positions give equal state keys"""
+        other = Board()
+        assert hash(empty_board.state()) == hash(other.state())
+        empty_board.place(7, 7, "a")
+        assert empty_board.state() != other.state()
+        other.place(7, 7, "a")
+        assert empty_board.state() == other.state()
+
+    def test_board_layout_size(self):
+        """Test that only the size of blankboard.txt is supported"""
+        with pytest.raises(ValueError):
+            Board(10, 10)
+
+
+class TestBoardMoves:
+    """Test applying and undoing moves"""
+
+    def test_apply_places_and_scores(self, empty_board):
+        """Test that applying a move places tiles and scores the word"""
+        move = empty_board.apply(Move(7, 7, "cat", False))
+        assert [empty_board.letter_at(7, 7 + i) for i in range(3)] == ["c", "a", "t"]
+        assert move.placed == (empty_board.index(7, 7), empty_board.index(7, 8), empty_board.index(7, 9))
+        assert move.score == 10  # (3 + 1 + 1) * 2, centre is 2W
+
+    def test_apply_uses_up_premiums(self, empty_board):
+        """Test that premiums of the formed words are used up"""
+        empty_board.apply(Move(7, 7, "cat", False))
+        assert empty_board.get(7, 7).used_up
+        assert empty_board.get(7, 9).used_up
+
+        move = empty_board.apply(Move(6, 7, "ace", True))  # reuses the c, no 2W this time
+        assert move.placed == (empty_board.index(6, 7), empty_board.index(8, 7))
+        assert move.score == 1 + 3 + 1
+
+    def test_apply_scores_cross_words(self, empty_board):
+        """Test that perpendicular words through new tiles are scored"""
+        empty_board.apply(Move(7, 7, "cat", False))
+        move = empty_board.apply(Move(8, 8, "ae", False))  # aa down, te down, ae across
+        assert len(move.words) == 3
+        assert move.score == 3 + 2 + 3  # the new a is on a 2L
+
+    def test_apply_conflict_changes_nothing(self, empty_board):
+        """Test that a move clashing with the board is rejected untouched"""
+        empty_board.apply(Move(7, 7, "cat", False))
+        state = empty_board.state()
+        with pytest.raises(ValueError, match="invalid placement"):
+            empty_board.apply(Move(7, 6, "dog", False))
+        assert empty_board.state() == state
+        assert len(empty_board.moves) == 1
+
+    def test_undo_restores_everything(self, empty_board):
+        """Test that undo takes back letters and used up premiums"""
+        empty = empty_board.state()
+        empty_board.apply(Move(7, 7, "cat", False))
+        after_cat = empty_board.state()
+        empty_board.apply(Move(6, 7, "ace", True))
+
+        assert empty_board.undo().word == "ace"
+        assert empty_board.state() == after_cat
+        empty_board.undo()
+        assert empty_board.state() == empty
+        assert empty_board.is_empty()
+
+
+class TestBoardHash:
+    """Test the incremental Zobrist hash"""
+
+    def test_empty_boards_hash_equal(self, empty_board):
+        """Test that fresh boards share a hash"""
+        assert empty_board.hash == Board().hash == 0
+
+    def test_hash_changes_with_letters(self, empty_board):
+        """Test that placing and clearing updates the hash"""
+        empty_board.place(7, 7, "a")
+        assert empty_board.hash != 0
+        a_hash = empty_board.hash
+        empty_board.clear(7, 7)
+        assert empty_board.hash == 0
+        empty_board.place(7, 7, "b")
+        assert empty_board.hash not in (0, a_hash)
+
+    def test_hash_covers_used_up(self, empty_board):
+        """Test that used up premiums are part of the position"""
+        empty_board.place(7, 7, "a")
+        before = empty_board.hash
+        empty_board.get(7, 7).use_up()
+        assert empty_board.hash != before
+        empty_board.get(7, 7).used_up = False
+        assert empty_board.hash == before
+
+    def test_hash_ignores_move_order(self, empty_board):
+        """Test that transpositions reach the same hash"""
+        other = Board()
+        empty_board.apply(Move(7, 7, "cat", False))
+        empty_board.apply(Move(6, 7, "ace", True))
+        other.place(8, 7, "e")
+        other.place(7, 9, "t")
+        other.place(6, 7, "a")
+        other.place(7, 8, "a")
+        other.place(7, 7, "c")
+        for index in set(empty_board.moves[0].used + empty_board.moves[1].used):
+            other._set_used(index, True)
+        assert empty_board.state() == other.state()
+        assert empty_board.hash == other.hash
+
+    def test_hash_restored_by_undo(self, empty_board):
+        """Test that undo gives back the old hash"""
+        empty_board.apply(Move(7, 7, "cat", False))
+        before = empty_board.hash
+        empty_board.apply(Move(6, 7, "ace", True))
+        empty_board.undo()
+        assert empty_board.hash == before
+        assert empty_board.copy().hash == before
+
+
+class TestBoardSnapshot:
+    """Test read only board snapshots"""
+
+    def test_snapshot_matches_board(self, empty_board):
+        """Test a snapshot reads like the grid"""
+        empty_board.place(7, 7, "q")
+        snapshot = empty_board.snapshot()
+        assert snapshot[7][7].letter == "q"
+        assert snapshot.letter_at(7, 7) == "q"
+        assert snapshot[7][8].is_empty()
+        assert snapshot[0][0].multiplier == 3 and snapshot[0][0].is_word_multiplier
+        assert [len(row) for row in snapshot] == [15] * 15
+        assert len(snapshot) == 15
+
+    def test_snapshot_is_cached_until_change(self, empty_board):
+        """Test reading twice is free and changes give a new version"""
+        first = empty_board.snapshot()
+        assert empty_board.snapshot() is first
+        empty_board.place(7, 7, "a")
+        second = empty_board.snapshot()
+        assert second is not first
+        assert second.version > first.version
+        assert first.letter_at(7, 7) == ""  # old snapshots don't change
+
+    def test_squares_are_slotted(self, empty_board):
+        """Test board and snapshot squares carry no per instance dict"""
+        assert not hasattr(empty_board.grid[7][7], "__dict__")
+        assert not hasattr(empty_board.snapshot()[7][7], "__dict__")
+
+    def test_snapshot_is_read_only(self, empty_board):
+        """Test nothing can be written through a snapshot"""
+        snapshot = empty_board.snapshot()
+        with pytest.raises(AttributeError):
+            snapshot.version = 5
+        with pytest.raises(AttributeError):
+            snapshot[7][7].letter = "a"
+        with pytest.raises(AttributeError):
+            snapshot[7][7].place("a")
+        with pytest.raises(TypeError):
+            snapshot.cells[0] = 1
+        assert empty_board.is_empty()
+
+    def test_copies_dont_share_versions(self, empty_board):
+        """Test a copy and the original never give different positions the same version"""
+        empty_board.place(7, 7, "a")
+        copy = empty_board.copy()
+        assert copy.snapshot().version == empty_board.snapshot().version
+        empty_board.place(7, 8, "t")
+        copy.place(8, 7, "x")
+        assert copy.snapshot() != empty_board.snapshot()
+        assert copy.version != empty_board.version
+
+    def test_snapshot_pickles(self, empty_board):
+        """Test snapshots survive pickling and compare by position"""
+        empty_board.place(7, 7, "a")
+        snapshot = empty_board.snapshot()
+        copied = pickle.loads(pickle.dumps(snapshot))
+        assert copied == snapshot
+        assert copied.version == snapshot.version
+        assert deepcopy(snapshot) is snapshot
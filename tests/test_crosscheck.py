@@ -0,0 +1,111 @@
+"""Tests for the cross-check tables"""
+import pytest
+from src.board import Board
+from src.crosscheck import CrossChecks
+from src.dawg import ANY_LETTER, Dawg
+
+
+def letters(mask):
+    return "".join(chr(ord("a") + i) for i in range(26) if mask >> i & 1)
+
+
+@pytest.fixture
+def board():
+    return Board()
+
+
+@pytest.fixture
+def cross_checks(board):
+    dawg = Dawg.from_words(["at", "cat", "bat", "ta", "to", "cats", "act", "ax"])
+    return CrossChecks(board, dawg)
+
+
+class TestCrossChecks:
+    """Test CrossChecks functionality"""
+
+    def test_empty_board_allows_everything(self, board, cross_checks):
+        """Test that an empty board has no constraints"""
+        assert all(mask == ANY_LETTER for mask in cross_checks.masks(False))
+        assert all(mask == ANY_LETTER for mask in cross_checks.masks(True))
+        assert cross_checks.anchors() == [board.index(7, 7)]
+
+    def test_masks_above_and_below_a_word(self, board, cross_checks):
+        """Test squares above/below a horizontal word when playing across"""
+        for i, letter in enumerate("at"):
+            board.place(7, 7 + i, letter)
+
+        masks = cross_checks.masks(False)
+        assert letters(masks[board.index(6, 8)]) == "a"  # ?t -> at
+        assert letters(masks[board.index(6, 7)]) == "t"  # ?a -> ta
+        assert letters(masks[board.index(8, 7)]) == "tx"  # a? -> at, ax
+        assert letters(masks[board.index(8, 8)]) == "ao"  # t? -> ta, to
+        assert masks[board.index(0, 0)] == ANY_LETTER
+
+    def test_masks_at_ends_of_a_word(self, board, cross_checks):
+        """Test squares before/after a horizontal word when playing down"""
+        for i, letter in enumerate("at"):
+            board.place(7, 7 + i, letter)
+
+        masks = cross_checks.masks(True)
+        assert letters(masks[board.index(7, 6)]) == "bc"  # ?at
+        assert masks[board.index(7, 9)] == 0  # at? -> nothing
+        assert cross_checks.has_cross_word(True)[board.index(7, 6)]
+        assert not cross_checks.has_cross_word(True)[board.index(6, 7)]
+
+    def test_square_between_two_words(self, board, cross_checks):
+        """Test a gap that joins two runs of tiles"""
+        board.place(7, 5, "c")
+        board.place(7, 7, "t")
+        masks = cross_checks.masks(True)
+        assert letters(masks[board.index(7, 6)]) == "a"  # c?t
+
+    def test_masks_follow_board_changes(self, board, cross_checks):
+        """Test that masks are updated after the board changes, including clears"""
+        board.place(7, 7, "a")
+        assert letters(cross_checks.masks(False)[board.index(8, 7)]) == "tx"
+        board.place(8, 7, "t")
+        assert letters(cross_checks.masks(False)[board.index(9, 7)]) == ""
+        board.clear(8, 7)
+        assert letters(cross_checks.masks(False)[board.index(8, 7)]) == "tx"
+
+    def test_allows(self, board, cross_checks):
+        """Test checking a single letter"""
+        board.place(7, 7, "a")
+        assert cross_checks.allows(8, 7, "t", False)
+        assert cross_checks.allows(8, 7, "T", False)
+        assert not cross_checks.allows(8, 7, "q", False)
+        assert not cross_checks.allows(8, 7, "?", False)
+
+    def test_anchors(self, board, cross_checks):
+        """Test anchor squares are the empty neighbours of tiles"""
+        board.place(0, 0, "a")
+        assert sorted(cross_checks.anchors()) == [board.index(0, 1), board.index(1, 0)]
+
+    def test_edges_do_not_wrap(self, board, cross_checks):
+        """Test that a tile at the end of a row doesn't constrain the next row"""
+        board.place(6, 14, "c")
+        assert cross_checks.masks(True)[board.index(7, 0)] == ANY_LETTER
+
+
+class TestCrossCheckValidation:
+    """Test that game validation uses the cross checks"""
+
+    def test_invalid_cross_word_rejected(self, game):
+        """Test a placement making a bad perpendicular word"""
+        game.board.place(7, 7, "q")
+        assert not game.is_placement_valid(8, 6, "at", False)
+
+    def test_valid_cross_word_accepted(self, game):
+        """Test a placement making good perpendicular words"""
+        for i, letter in enumerate("cat"):
+            game.board.place(7, 7 + i, letter)
+        assert game.is_placement_valid(8, 8, "ae", False)  # aa, te
+        assert not game.is_placement_valid(8, 8, "ax", False)  # tx
+
+    def test_word_running_into_tiles(self, game):
+        """Test that the main word is checked including tiles touching its ends"""
+        game.board.place(7, 10, "s")
+        assert game.is_placement_valid(7, 7, "cat", False)  # cats
+        game.board.clear(7, 10)
+        game.board.place(7, 10, "x")
+        assert not game.is_placement_valid(7, 7, "cat", False)  # catx
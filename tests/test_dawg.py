@@ -0,0 +1,166 @@
+"""Tests for the DAWG and GADDAG word graphs"""
+import pytest
+from src.dawg import AnagramIndex, Dawg, Gaddag, parse_pattern
+
+WORDS = ["cat", "cats", "car", "card", "care", "cared", "dog", "dogs", "do", "at"]
+
+
+@pytest.fixture
+def dawg():
+    return Dawg.from_words(WORDS)
+
+
+@pytest.fixture
+def gaddag():
+    return Gaddag.from_words(WORDS)
+
+
+@pytest.fixture
+def anagram_index():
+    return AnagramIndex.from_words(WORDS + ["act", "race", "acre"])
+
+
+class TestDawg:
+    """Test Dawg functionality"""
+
+    def test_dawg_contains(self, dawg):
+        """Test membership of every word and a few non-words"""
+        for word in WORDS:
+            assert word in dawg
+        assert "ca" not in dawg
+        assert "cards" not in dawg
+        assert "" not in dawg
+        assert "CAT" not in dawg  # the graph is lower case only
+
+    def test_dawg_contains_matches_graph(self, dawg):
+        """Test the word table agrees with walking the graph"""
+        assert dawg.table is not None
+        for word in WORDS + ["c", "ca", "card", "cardx", "dogsx", "zebra", "a"]:
+            found = dawg.follow(word)
+            assert (word in dawg) == (found is not None and found[1]), word
+
+    def test_dawg_iter_words_sorted(self, dawg):
+        """Test that iterating the graph gives back the sorted word list"""
+        assert list(dawg.iter_words()) == sorted(WORDS)
+
+    def test_dawg_is_prefix(self, dawg):
+        """Test prefix lookups"""
+        assert dawg.is_prefix("ca")
+        assert dawg.is_prefix("care")
+        assert not dawg.is_prefix("cb")
+
+    def test_dawg_walk(self, dawg):
+        """Test walking a prefix and then listing what is below it"""
+        node = dawg.walk("car")
+        assert node is not None
+        assert list(dawg.iter_words(node, "car")) == ["card", "care", "cared"]
+        assert dawg.walk("xyz") is None
+
+    def test_dawg_children(self, dawg):
+        """Test child edge iteration"""
+        node = dawg.walk("ca")
+        children = {letter: terminal for letter, _, terminal in dawg.children(node)}
+        assert children == {"r": True, "t": True}
+
+    def test_dawg_child(self, dawg):
+        """Test following a single edge"""
+        node = dawg.walk("do")
+        child, terminal = dawg.child(node, "g")
+        assert terminal  # "dog"
+        assert dawg.child(child, "s") == (0, True)
+        assert dawg.child(node, "x") is None
+
+    def test_dawg_shares_suffixes(self):
+        """Test that common suffixes are merged into one path"""
+        trie_edges = len(set(p for w in WORDS for p in (w[:i] for i in range(1, len(w) + 1))))
+        assert len(Dawg.from_words(WORDS)) < trie_edges
+
+    def test_dawg_match_wildcards(self, dawg):
+        """Test matching fixed letters and wildcards"""
+        assert list(dawg.match("ca??")) == ["card", "care", "cats"]
+        assert list(dawg.match("?o?")) == ["dog"]
+        assert list(dawg.match("[cd]a?")) == ["car", "cat"]
+
+    def test_dawg_match_lengths(self, dawg):
+        """Test words stopping before the end of the pattern"""
+        assert list(dawg.match("ca???", lengths=range(3, 6))) == ["car", "card", "care", "cared", "cat", "cats"]
+        assert list(dawg.match("d??", lengths=[2])) == ["do"]
+
+    def test_dawg_match_rack(self, dawg):
+        """Test open squares being filled from a rack, with blanks"""
+        assert list(dawg.match("c??", rack="tar")) == ["car", "cat"]
+        assert list(dawg.match("c??", rack="tr")) == []
+        assert list(dawg.match("c??", rack="r?")) == ["car"]
+        assert list(dawg.match("c??", rack="??")) == ["car", "cat"]
+        assert list(dawg.match("??r?", rack="cae")) == ["care"]
+
+    def test_dawg_match_must_contain(self, dawg):
+        """Test required letters"""
+        assert list(dawg.match("????", must_contain="s")) == ["cats", "dogs"]
+        assert list(dawg.match("????", must_contain="ss")) == []
+
+    def test_parse_pattern(self):
+        """Test pattern parsing and errors"""
+        slots = parse_pattern("a?[bc]")
+        assert slots[0] == (1, False)
+        assert slots[1][1] is True
+        assert slots[2] == (0b110, True)
+        with pytest.raises(ValueError):
+            parse_pattern("a[bc")
+        with pytest.raises(ValueError):
+            parse_pattern("a1")
+
+    def test_dawg_empty(self):
+        """Test a graph with no words"""
+        dawg = Dawg.from_words([])
+        assert "a" not in dawg
+        assert list(dawg.iter_words()) == []
+
+
+class TestGaddag:
+    """Test Gaddag functionality"""
+
+    def test_gaddag_contains(self, gaddag):
+        """Test membership"""
+        for word in WORDS:
+            assert word in gaddag
+        assert "ca" not in gaddag
+
+    def test_gaddag_words_with_suffix(self, gaddag):
+        """Test suffix queries"""
+        assert sorted(gaddag.words_with_suffix("ed")) == ["cared"]
+        assert sorted(gaddag.words_with_suffix("s")) == ["cats", "dogs"]
+        assert sorted(gaddag.words_with_suffix("at")) == ["at", "cat"]
+
+    def test_gaddag_words_through(self, gaddag):
+        """Test extending both ways through a fragment"""
+        assert sorted(gaddag.words_through("ar")) == ["car", "card", "care", "cared"]
+        assert sorted(gaddag.words_through("o")) == ["do", "dog", "dogs"]
+        assert list(gaddag.words_through("qq")) == []
+
+
+class TestAnagramIndex:
+    """Test AnagramIndex functionality"""
+
+    def test_anagrams_exact(self, anagram_index):
+        """Test words using exactly the given letters"""
+        assert anagram_index.anagrams("tac") == ["act", "cat"]
+        assert anagram_index.anagrams("erac") == ["acre", "care", "race"]
+        assert anagram_index.anagrams("zzz") == []
+
+    def test_formable_from_rack(self, anagram_index):
+        """Test every word makeable from some of the rack"""
+        assert sorted(anagram_index.formable("tacsxyz")) == ["act", "at", "cat", "cats"]
+
+    def test_formable_with_blanks(self, anagram_index):
+        """Test blanks stand in for any letter"""
+        assert sorted(anagram_index.formable("ca?")) == ["act", "at", "car", "cat"]
+        assert "cared" in anagram_index.formable("??r??")
+        assert "cared" not in anagram_index.formable("??r?")
+
+    def test_formable_through_board_letters(self, anagram_index):
+        """Test that every letter in through must be used"""
+        assert sorted(anagram_index.formable("dgo", through="s")) == ["dogs"]
+        assert sorted(anagram_index.formable("ace", through="rd")) == ["card", "cared"]
+        assert list(anagram_index.formable("", through="dog")) == ["dog"]
+        assert list(anagram_index.formable("aaaa", through="q")) == []
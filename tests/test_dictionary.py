@@ -1,6 +1,9 @@
 """Tests for Dictionary class"""
+import os
+import pickle
 import pytest
 from pathlib import Path
+from src.dawg import Dawg
 from src.dictionary import Dictionary
 
 
@@ -58,3 +61,97 @@ class TestDictionary:
         """Test that real dictionary has reasonable size (SOWPODS has ~267k words)"""
         assert len(real_dictionary) > 200000
         assert len(real_dictionary) < 300000
+
+    def test_dictionary_walk_and_children(self, test_dictionary):
+        """Test prefix walking and child edges on the compiled DAWG"""
+        node = test_dictionary.walk("qu")
+        assert node is not None
+        assert {letter for letter, _, _ in test_dictionary.children(node)} == {"i"}
+        assert test_dictionary.walk("QU") == node
+        assert test_dictionary.walk("qx") is None
+
+    def test_dictionary_prefix_queries(self, test_dictionary):
+        """Test prefix queries"""
+        assert test_dictionary.is_prefix("hel")
+        assert not test_dictionary.is_prefix("hex")
+        assert list(test_dictionary.words_with_prefix("qui")) == ["quick", "quiz"]
+        assert list(test_dictionary.words_with_prefix("cat")) == ["cat"]
+
+    def test_dictionary_suffix_queries(self, test_dictionary):
+        """Test suffix and infix queries on the GADDAG"""
+        assert sorted(test_dictionary.words_with_suffix("rd")) == ["board", "word"]
+        assert sorted(test_dictionary.words_through("az")) == ["jazz", "lazy"]
+
+    def test_dictionary_formable(self, test_dictionary):
+        """Test rack queries, including blanks and board letters"""
+        assert sorted(test_dictionary.formable(["t", "a", "c", "e", "s", "t", "?"])) == ["cat", "test"]
+        assert sorted(test_dictionary.formable("zb?a", through="er")) == ["zebra"]
+        assert test_dictionary.anagrams("GDO") == ["dog"]
+
+    def test_dictionary_match(self, test_dictionary):
+        """Test pattern queries"""
+        assert list(test_dictionary.match("?a??")) == ["game", "jazz", "lazy"]
+        assert list(test_dictionary.match("?a??", must_contain="z")) == ["jazz", "lazy"]
+        assert list(test_dictionary.match("qu???", length=4)) == ["quiz"]
+        assert list(test_dictionary.match("?u???", rack=["q", "i", "c", "k", "?"], length=range(2, 6))) == ["quick", "quiz"]
+
+
+class TestCompiledDictionary:
+    """Test the memory mapped binary lexicon"""
+
+    def test_compiled_file_written(self, tmp_path):
+        """Test that opening a word list writes the compiled DAWG next to it"""
+        source = tmp_path / "words.txt"
+        source.write_text("cat\ndog\n")
+        dictionary = Dictionary(source)
+        assert (tmp_path / "words.dawg").exists()
+        # every graph is ready before any bot gets the dictionary
+        assert (tmp_path / "words.gaddag").exists()
+        assert (tmp_path / "words.anagrams").exists()
+        assert "dog" in dictionary
+        assert len(dictionary) == 2
+
+    def test_compiled_file_is_mapped(self, tmp_path):
+        """Test that an up to date compiled file is opened, not rebuilt"""
+        source = tmp_path / "words.txt"
+        source.write_text("cat\ndog\n")
+        Dawg.from_words(["cat", "dog"]).save(tmp_path / "words.dawg", source)
+        graph = Dawg.open(tmp_path / "words.dawg", source)
+        assert isinstance(graph.edges, memoryview)
+        assert isinstance(graph.table, memoryview)
+        with pytest.raises(TypeError):
+            graph.strings[0] = 0
+        assert "cat" in graph
+        assert "ca" not in graph
+        assert list(graph.iter_words()) == ["cat", "dog"]
+        assert graph.word_count == 2
+
+    def test_compiled_file_rebuilt_when_source_changes(self, tmp_path):
+        """Test that editing the .txt invalidates the compiled file"""
+        source = tmp_path / "words.txt"
+        source.write_text("cat\ndog\n")
+        Dictionary(source)
+
+        source.write_text("cat\ndog\nfox\n")
+        os.utime(source, ns=(0, 10**9))
+        assert Dawg.open(tmp_path / "words.dawg", source) is None
+
+        dictionary = Dictionary(source)
+        assert "fox" in dictionary
+        assert Dawg.open(tmp_path / "words.dawg", source) is not None
+
+    def test_dictionary_pickles(self, test_dictionary):
+        """Test that a dictionary survives pickling by reopening its file"""
+        copy = pickle.loads(pickle.dumps(test_dictionary))
+        assert copy.path == test_dictionary.path
+        assert "zebra" in copy
+        assert len(copy) == len(test_dictionary)
+
+    def test_dictionary_words_set(self, test_dictionary):
+        """Test the materialised word set"""
+        assert "quiz" in test_dictionary.words
+        assert len(test_dictionary.words) == len(test_dictionary)
+
+    def test_dictionary_words_set_shared(self, test_dictionary):
+        """Test the word set is only built once per lexicon, not per game"""
+        assert Dictionary(test_dictionary.path).words is test_dictionary.words
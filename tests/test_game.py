@@ -1,8 +1,12 @@
 """Tests for Game class"""
+import random
+
 import pytest
-from src.game import Game, NotAWordException
+from src.api import Api
+from src.game import Game, GameResult, NotAWordException
 from src.player import Player
-from src.tile import BoardTile
+from src.tile import BoardTile, Tile
+from tests.bots import ExchangingBot, OpeningBot
 
 
 class TestGame:
@@ -357,3 +361,196 @@ class TestGameTurnManagement:
         assert len(game.players) == 2
         assert game.players[0].name == "Alice"
         assert game.players[1].name == "Bob"
+
+
+class BadBot(Api):
+    def _on_turn(self):
+        self.place_word("zzzzz", False, 7, 7)
+
+
+class TestHeadlessGame:
+    """Test running whole games without a GUI or console output"""
+
+    def test_headless_game_has_no_gui(self):
+        """Test that a headless game never opens a window"""
+        assert Game(headless=True).gui is None
+
+    def test_headless_game_returns_result(self, make_game, capsys):
+        """Test that start() plays the game out silently and returns a result"""
+        game = make_game(OpeningBot, OpeningBot, seed=1)
+        result = game.start()
+
+        assert isinstance(result, GameResult)
+        assert capsys.readouterr().out == ""
+        assert result.players == ["Bot0", "Bot1"]
+        assert result.scores == [player.score for player in game.players]
+        assert result.duration_s > 0
+        assert len(result.moves) == 1
+        assert result.history[0].action == "place"
+        assert result.history[0].score == max(result.scores)
+        assert [turn.action for turn in result.history[1:]] == ["pass"] * 2
+
+    def test_passes_reset_after_a_move(self, make_game):
+        """Test that the game only ends after every player passes in a row"""
+        result = make_game(OpeningBot, OpeningBot, seed=1).start()
+        # opening move, then one pass each
+        assert len(result.history) == 3
+
+    def test_exchanges_are_recorded(self, make_game):
+        """Test that exchanges show up in the history"""
+        result = make_game(ExchangingBot, ExchangingBot).start()
+        assert [turn.action for turn in result.history] == ["exchange", "exchange"]
+        assert all(turn.elapsed_s >= 0 for turn in result.history)
+        assert result.winner is None
+        assert result.winners == [0, 1]
+
+    def test_bad_move_is_a_pass(self, make_game):
+        """Test that an invalid move from a bot passes instead of ending the simulation"""
+        result = make_game(BadBot, BadBot).start()
+        assert [turn.action for turn in result.history] == ["pass", "pass"]
+        assert result.scores == [0, 0]
+
+    def test_time_used_from_each_clock(self, make_game):
+        """Test time used counts from each player's own starting clock, not a fixed 3 minutes"""
+        game = make_game(ExchangingBot, ExchangingBot)
+        game.players[0].time_remaining_s = 10
+        result = game.start()
+        assert all(0 <= used < 1 for used in result.time_used_s)
+        assert game.players[0].time_remaining_s == 10 - result.time_used_s[0]
+
+    def test_headless_needs_bots(self):
+        """Test that a headless game refuses human players"""
+        game = Game(headless=True)
+        game.add_player(Player("Human"))
+        with pytest.raises(ValueError):
+            game.start()
+
+    def test_failed_exchange_keeps_hand(self, game):
+        """Test that exchanging a letter you don't have leaves the hand alone"""
+        player = Player("P")
+        player.hand.extend(game.tile_bag.draw_n(7))
+        before = [tile.letter for tile in player.hand]
+        with pytest.raises(ValueError):
+            game.discard_letters(player, [before[0], "not a letter"])
+        assert [tile.letter for tile in player.hand] == before
+
+
+class TestSeededGame:
+    """Test that seeded games can be replayed"""
+
+    def test_same_seed_same_game(self, make_game):
+        """Test that two runs with the same seed and bots are identical"""
+        results = [make_game(OpeningBot, ExchangingBot, seed=7).start() for _ in range(2)]
+        assert results[0].seed == 7
+        assert results[0].scores == results[1].scores
+        assert [(t.player, t.action, repr(t.move), t.score) for t in results[0].history] == [
+            (t.player, t.action, repr(t.move), t.score) for t in results[1].history
+        ]
+
+    def test_same_seed_same_hands(self, make_game):
+        """Test that the seed decides the hands and who goes first"""
+        hands = []
+        for _ in range(2):
+            game = make_game(ExchangingBot, ExchangingBot, seed=123)
+            game.start()
+            hands.append([[tile.letter for tile in player.hand] for player in game.players])
+            hands.append(game.history[0].player)
+        assert hands[:2] == hands[2:]
+
+    def test_rng_instance(self):
+        """Test that a random.Random can be passed in instead of a seed"""
+        rng = random.Random(5)
+        game = Game(headless=True, seed=rng)
+        assert game.rng is rng
+        assert game.tile_bag.rng is rng
+
+
+@pytest.fixture
+def playing_game():
+    """Provides a game with one player to move, holding the given letters"""
+    def make(letters: str) -> Game:
+        game = Game(have_gui=False)
+        player = Player("P")
+        player.hand = [Tile(letter) for letter in letters]
+        game.add_player(player)
+        game._set_player_turn(0)
+        return game
+    return make
+
+
+class TestEvaluateMove:
+    """Test single pass move evaluation"""
+
+    def test_evaluate_first_move(self, playing_game):
+        """Test a valid opening, scored without touching the board"""
+        game = playing_game("cat")
+        evaluation = game.evaluate_move(7, 7, "cat", False)
+        assert evaluation.valid
+        assert evaluation.error is None
+        assert evaluation.words == ["cat"]
+        assert evaluation.score == 10  # centre is a double word
+        assert game.board.is_empty()
+        assert game.board.hash == 0
+
+    def test_evaluate_ignores_case(self, playing_game):
+        """Test a word the dictionary has is valid whatever its case, and goes down lower case"""
+        game = playing_game("cat")
+        assert "CAT" in game.dictionary
+        evaluation = game.evaluate_move(7, 7, "CAT", False)
+        assert evaluation.valid
+        assert evaluation.score == game.evaluate_move(7, 7, "cat", False).score
+        game.place_word(7, 7, "CaT", False)
+        assert game.board.letter_at(7, 8) == "a"
+
+    def test_evaluate_matches_place_word(self, playing_game):
+        """Test that the evaluated score is what place_word scores"""
+        game = playing_game("catse")
+        game.place_word(7, 7, "cat", False)
+        evaluation = game.evaluate_move(7, 7, "cats", False)
+        assert evaluation.words == ["cats"]
+        game.place_word(7, 7, "cats", False)
+        assert game.players[0].score == 10 + evaluation.score
+
+    def test_evaluate_cross_words(self, playing_game):
+        """Test that every word formed is listed, perpendicular ones first"""
+        game = playing_game("catae")
+        game.place_word(7, 7, "cat", False)
+        evaluation = game.evaluate_move(8, 8, "ae", False)
+        assert evaluation.valid
+        assert evaluation.words == ["aa", "te", "ae"]
+
+    def test_evaluate_errors(self, playing_game):
+        """Test that invalid moves carry the error place_word would raise"""
+        game = playing_game("cat")
+        assert "center square" in str(game.evaluate_move(0, 0, "cat", False).error)
+        assert isinstance(game.evaluate_move(7, 7, "xqz", False).error, NotAWordException)
+        assert "out of bounds" in str(game.evaluate_move(7, 12, "cats", False).error)
+
+        game.place_word(7, 7, "cat", False)
+        assert "connect" in str(game.evaluate_move(0, 0, "dog", False).error)
+        assert "invalid placement" in str(game.evaluate_move(7, 7, "dog", False).error)
+        assert "new tiles" in str(game.evaluate_move(7, 7, "cat", False).error)
+        cross = game.evaluate_move(8, 8, "ax", False)
+        assert not cross
+        assert "tx" in str(cross.error)
+
+    def test_evaluate_bingo(self, playing_game):
+        """Test the 50 point bonus for using all 7 tiles"""
+        game = playing_game("example")
+        evaluation = game.evaluate_move(7, 7, "example", False)
+        assert evaluation.bingo
+        assert evaluation.score == evaluation.move.score + 50
+
+    def test_place_word_missing_letters(self, playing_game):
+        """Test that a word you don't hold the tiles for changes nothing"""
+        game = playing_game("ca")
+        with pytest.raises(ValueError, match="not in"):
+            game.place_word(7, 7, "cat", False)
+        assert game.board.is_empty()
+        assert len(game.players[0].hand) == 2
+
+    def test_place_word_uses_blank(self, playing_game):
+        """Test that a blank stands in for a missing letter"""
+        game = playing_game("ca?")
+        game.place_word(7, 7, "cat", False)
+        assert game.players[0].hand == []
@@ -0,0 +1,154 @@
+"""Tests for the move generator"""
+from collections import Counter
+
+import pytest
+from src.board import Board
+from src.crosscheck import CrossChecks
+from src.dawg import Dawg
+from src.move import Move
+from src.movegen import GeneratedMove, MoveGenerator
+
+WORDS = ["at", "cat", "bat", "ta", "to", "cats", "act", "ax", "tact", "tax", "oat", "coat", "taco", "tab", "abs"]
+
+
+@pytest.fixture
+def board():
+    return Board()
+
+
+@pytest.fixture
+def generator(board):
+    dawg = Dawg.from_words(sorted(WORDS))
+    return MoveGenerator(board, dawg, CrossChecks(board, dawg))
+
+
+def brute_force(board: Board, rack: str) -> set[tuple[int, int, str, bool]]:
+    """every legal move, by trying every word everywhere"""
+    legal = set()
+    centre = board.index(7, 7)
+    for word in WORDS:
+        for is_vertical in (False, True):
+            for row in range(15):
+                for col in range(15):
+                    move = Move(row, col, word, is_vertical)
+                    try:
+                        board.measure(move)
+                    except ValueError:
+                        continue
+                    if not move.placed:
+                        continue
+                    needed = Counter(move.letters) - Counter(rack)
+                    if sum(needed.values()) > rack.count("?"):
+                        continue
+                    if board.is_empty():
+                        if centre not in move.placed:
+                            continue
+                    elif all(not board.cells[i] for squares in move.words for i in squares):
+                        continue
+                    spelled = [
+                        "".join(
+                            chr(board.cells[i]) if board.cells[i] else move.letters[move.placed.index(i)]
+                            for i in squares
+                        )
+                        for squares in move.words
+                    ]
+                    if all(formed in WORDS for formed in spelled) and word in spelled:
+                        if is_vertical and len(move.placed) == 1 and len(move.words) == 2:
+                            continue  # one tile making words both ways, it's the across move
+                        legal.add((row, col, word, is_vertical))
+    return legal
+
+
+def generated(generator, rack) -> set[tuple[int, int, str, bool]]:
+    moves = list(generator.generate(rack))
+    found = {(move.row, move.col, move.word, move.is_vertical) for move in moves}
+    assert len(found) == len(moves)  # no duplicates
+    return found
+
+
+class TestMoveGenerator:
+    """Test MoveGenerator functionality"""
+
+    def test_empty_board(self, board, generator):
+        """Test openings all cover the centre"""
+        found = generated(generator, "cat")
+        assert found == brute_force(board, "cat")
+        assert (7, 7, "cat", False) in found
+        assert (7, 5, "act", True) not in found  # doesn't reach the centre
+        assert (5, 7, "act", True) in found
+
+    def test_matches_brute_force(self, board, generator):
+        """Test every legal move is found, and nothing else"""
+        for i, letter in enumerate("cat"):
+            board.place(7, 7 + i, letter)
+        board.place(8, 8, "x")
+        for rack in ("tabs", "oat", "to?", "s"):
+            assert generated(generator, rack) == brute_force(board, rack), rack
+
+    def test_single_tile_both_ways_once(self, board, generator):
+        """Test one tile making a word each way is one move, not one per direction"""
+        board.place(7, 8, "t")
+        board.place(8, 7, "x")
+        found = generated(generator, "a")
+        assert (7, 7, "at", False) in found
+        assert (7, 7, "ax", True) not in found
+        assert found == brute_force(board, "a")
+
+    def test_plays_through_tiles(self, board, generator):
+        """Test words through tiles already on the board"""
+        for i, letter in enumerate("at"):
+            board.place(7, 7 + i, letter)
+        found = generated(generator, "co")
+        assert (7, 5, "coat", False) in found
+        assert (7, 6, "cat", False) in found
+
+    def test_blanks(self, board, generator):
+        """Test a blank stands in for any letter"""
+        assert (7, 7, "tax", False) in generated(generator, "t?x")
+        assert generated(generator, "t?x") == brute_force(board, "t?x")
+
+    def test_scores_match_board(self, board, generator):
+        """Test generated moves score exactly what playing them scores"""
+        for i, letter in enumerate("cat"):
+            board.place(7, 7 + i, letter)
+        for move in generator.generate("tabos"):
+            score = move.score
+            board.apply(Move(move.row, move.col, move.word, move.is_vertical))
+            assert board.moves[-1].score == score
+            board.undo()
+
+    def test_best(self, generator):
+        """Test best() picks the top scoring moves"""
+        moves = list(generator.generate("tacos"))
+        best = generator.best("tacos", 3)
+        assert len(best) == 3
+        assert [move.total_score for move in best] == sorted((m.total_score for m in moves), reverse=True)[:3]
+
+    def test_lazy(self, generator):
+        """Test moves can be taken one at a time"""
+        moves = generator.generate("cat")
+        assert isinstance(next(moves), Move)
+
+    def test_as_tuple(self, generator):
+        """Test the Api shape of a move"""
+        move = generator.best("cat")[0]
+        assert MoveGenerator.as_tuple(move) == GeneratedMove(
+            move.word, move.is_vertical, move.col, move.row, move.total_score
+        )
+
+    def test_nothing_to_play(self, generator):
+        """Test an empty rack has no moves"""
+        assert list(generator.generate("")) == []
+
+
+class TestGameMoveGenerator:
+    """Test the generator against the real game"""
+
+    def test_every_move_is_valid(self, game):
+        """Test each generated move passes Game's own checks with the same score"""
+        game.board.place(7, 7, "q")
+        game.board.place(7, 8, "i")
+        for move in game.move_generator.generate("ratsie?"):
+            evaluation = game.evaluate_move(move.row, move.col, move.word, move.is_vertical)
+            assert evaluation.valid, move
+            assert evaluation.score == move.total_score
@@ -0,0 +1,142 @@
+"""Tests for count vector racks"""
+from collections import Counter
+
+import numpy as np
+import pytest
+from src.game import Game
+from src.player import Player
+from src.rack import Rack, WordCounts, letter_counts
+from src.tile import Tile
+
+WORDS = ["cat", "act", "at", "tact", "cats", "a", "scat", "taxes", "tax", "zoo", "attack"]
+
+
+def brute_force(rack: str, words: list[str], min_length: int = 2) -> set[str]:
+    """words the rack can make, by counting letters one word at a time"""
+    have = Counter(rack)
+    return {
+        word for word in words
+        if len(word) >= min_length and sum((Counter(word) - have).values()) <= have["?"]
+    }
+
+
+class TestRack:
+    """Test Rack functionality"""
+
+    def test_counts(self):
+        """Test a rack counts its letters and blanks"""
+        rack = Rack("aab?")
+        assert rack["a"] == 2
+        assert rack["b"] == 1
+        assert rack.blanks == 1
+        assert len(rack) == 4
+        assert rack.letters() == "aab?"
+        assert rack.counts.shape == (27,)
+
+    def test_from_tiles(self):
+        """Test a rack from a hand of tiles"""
+        assert Rack.from_tiles([Tile("c"), Tile("a"), Tile("?")]) == Rack("?ac")
+
+    def test_read_only(self):
+        """Test racks can't be changed"""
+        rack = Rack("abc")
+        with pytest.raises(AttributeError):
+            rack.counts = None
+        with pytest.raises(ValueError):
+            rack.counts[0] = 5
+
+    def test_can_make(self):
+        """Test single words, with and without blanks"""
+        assert Rack("tca").can_make("cat")
+        assert not Rack("tca").can_make("tact")
+        assert Rack("tca?").can_make("tact")
+        assert not Rack("tc?").can_make("tact")
+        assert Rack("??").can_make("zq")
+        assert Rack("").can_make("")
+
+    def test_can_make_not_a_letter(self):
+        """Test typos in a word are a no rather than an error"""
+        assert not Rack("abc").can_make("ca1")
+        assert not Rack("abc?").can_make("c a")
+
+    def test_blanked(self):
+        """Test real tiles are used before blanks, in order"""
+        assert Rack("tac?").blanked("tact") == [False, False, False, True]
+        assert Rack("ta?").blanked("tat") == [False, False, True]
+
+    def test_can_make_all(self):
+        """Test many words in one go agree with one at a time"""
+        rack = Rack("stac?x")
+        counts = np.array([letter_counts(word)[:26] for word in WORDS])
+        assert list(rack.can_make_all(counts)) == [rack.can_make(word) for word in WORDS]
+
+    def test_formable(self):
+        """Test every word the rack can make, against counting"""
+        word_counts = WordCounts(WORDS)
+        for rack in ("tac", "stac?", "taxes", "??", "zoo", "attack?"):
+            assert set(Rack(rack).formable(word_counts)) == brute_force(rack, WORDS), rack
+        assert set(Rack("tac").formable(word_counts, min_length=1)) == brute_force("tac", WORDS, 1)
+        assert set(Rack("stac?").formable(word_counts, max_length=3)) == {"cat", "act", "at", "tax"}
+
+    def test_formable_real_dictionary(self, real_dictionary):
+        """Test the whole lexicon in one go"""
+        words = real_dictionary.word_counts
+        assert len(words) == len(real_dictionary)
+        found = Rack("retains").formable(words)
+        assert "retains" in found and "nastier" in found and "stain" in found
+        assert all(len(word) <= 7 for word in found)
+        assert set(Rack("qz?").formable(words)) == {word for word in real_dictionary.words
+                                                    if len(word) in (2, 3) and Rack("qz?").can_make(word)}
+
+
+class TestWordCounts:
+    """Test the per word count vectors"""
+
+    def test_counts(self):
+        """Test each row counts its word's letters"""
+        word_counts = WordCounts(WORDS)
+        for word, counts in zip(word_counts.words, word_counts.counts):
+            assert list(counts) == list(letter_counts(word)[:26])
+
+    def test_shortest_first(self):
+        """Test words are ordered by length, keeping their order otherwise"""
+        word_counts = WordCounts(WORDS)
+        assert list(word_counts.lengths) == sorted(len(word) for word in WORDS)
+        assert word_counts.words[:3] == ("a", "at", "cat")
+        assert word_counts.up_to(2) == 2
+        assert word_counts.up_to(100) == len(WORDS)
+
+    def test_shared(self, real_dictionary):
+        """Test the counts are only built once"""
+        assert real_dictionary.word_counts is real_dictionary.read_only().word_counts
+
+    def test_shared_is_read_only(self, test_dictionary):
+        """Test a bot can't change the words another game's racks see"""
+        word_counts = test_dictionary.read_only().word_counts
+        with pytest.raises(TypeError):
+            word_counts.words[0] = "zzz"
+        with pytest.raises(ValueError):
+            word_counts.lengths[0] = 1
+        with pytest.raises(ValueError):
+            word_counts.counts[0, 0] = 1
+        assert "zzz" not in Rack("cat").formable(test_dictionary.word_counts)
+
+
+class TestPlayerRack:
+    """Test racks of real hands"""
+
+    def test_player_rack(self, player):
+        """Test a player's rack follows the hand"""
+        player.hand = [Tile(letter) for letter in "cat?"]
+        assert player.rack == Rack("cat?")
+
+    def test_place_word_keeps_hand_order(self):
+        """Test the tiles played come out and the rest keep their order"""
+        game = Game(have_gui=False)
+        player = Player("P")
+        player.hand = [Tile(letter) for letter in "zc?tqa?"]
+        game.add_player(player)
+        game._set_player_turn(0)
+        game.place_word(7, 7, "cart", False)
+        assert [tile.letter for tile in player.hand] == ["z", "q", "?"]
+        assert game.board.moves[-1].blanks == (game.board.index(7, 9),)
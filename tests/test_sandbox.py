@@ -0,0 +1,186 @@
+"""Tests for running bots in their own process"""
+import os
+
+import pytest
+
+from src.api import Api
+from tests.bots import BestMoveBot
+
+
+class LoopingBot(Api):
+    def _on_turn(self):
+        while True:
+            pass
+
+
+class ThinkingBot(Api):
+    """proposes the best move, then keeps thinking until it's stopped"""
+
+    def _on_turn(self):
+        for word, is_vertical, x, y, _ in self.generate_moves(best=1):
+            self.propose_move(word, is_vertical, x, y)
+        while True:
+            pass
+
+
+class CrashingBot(Api):
+    def _on_turn(self):
+        raise RuntimeError("oops")
+
+
+class CountingBot(Api):
+    """remembers things between turns, and writes down which process it ran in"""
+
+    log_path = None
+
+    def _init(self):
+        self.turns = 0
+
+    def _on_turn(self):
+        self.turns += 1
+        with open(self.log_path, "a") as f:
+            f.write(f"{self.turns} {os.getpid()}\n")
+        self.pass_turn()
+
+
+class SnoopingBot(Api):
+    """checks its copy of the game is kept up to date"""
+
+    def _init(self):
+        self.seen = []
+
+    def _on_turn(self):
+        moves = self.get_moves_since_last_turn()
+        letters = sum(1 for code in self.board.cells if code)
+        placed = sum(len(move.placed) for move in moves)
+        if self.seen and placed and letters != self.seen[-1] + placed:
+            raise AssertionError("board out of sync")
+        for word, is_vertical, x, y, _ in self.generate_moves(best=1):
+            self.seen.append(letters + sum(1 for letter in word) - sum(
+                1 for i in range(len(word)) if self.board.letter_at(y + i * is_vertical, x + i * (not is_vertical))
+            ))
+            self.place_word(word, is_vertical, x, y)
+        self.pass_turn()
+
+
+class HelperBot(Api):
+    """has helpers named like the host's own, which mustn't get in the way"""
+
+    def _decide(self):
+        return next(iter(self.generate_moves(best=1)), None)
+
+    def _release(self):
+        raise AssertionError("the host called the bot's _release")
+
+    def _load_state(self, state):
+        raise AssertionError("the host called the bot's _load_state")
+
+    def _on_turn(self):
+        move = self._decide()
+        if move:
+            self.place_word(*move[:4])
+        self.pass_turn()
+
+
+class PipeSnoopingBot(Api):
+    """tries the host's end of the first bot's pipe, which its process got a copy of"""
+
+    log_path = None
+
+    def _on_turn(self):
+        other = self._Api__game.players[0].api._Api__process._BotProcess__conn
+        try:
+            other.poll()
+            state = "open"
+        except OSError:
+            state = "closed"
+        with open(self.log_path, "a") as f:
+            f.write(f"{state}\n")
+        self.pass_turn()
+
+
+class TestBotProcess:
+    """Test isolated bots"""
+
+    def test_isolated_game_matches_in_process(self, make_game):
+        """Test a game plays out the same with bots in their own processes"""
+        results = []
+        for isolate in (False, True):
+            game = make_game(BestMoveBot, BestMoveBot, seed=4, isolate_bots=isolate)
+            results.append(game.start())
+        assert results[0].scores == results[1].scores
+        assert [repr(turn.move) for turn in results[0].history] == [repr(turn.move) for turn in results[1].history]
+
+    def test_looping_bot_is_stopped(self, make_game):
+        """Test a bot that never returns is killed, passes, and loses its clock"""
+        game = make_game(LoopingBot, BestMoveBot, time_s=0.3, seed=1, isolate_bots=True)
+        result = game.start()
+        looper = game.players[0]
+        turns = [turn for turn in result.history if turn.player == looper.name]
+        assert turns[0].timed_out
+        assert turns[0].action == "pass"
+        assert turns[0].elapsed_s < 2
+        assert all(not turn.timed_out for turn in turns[1:])  # out of time, not asked again
+        assert looper.time_remaining_s <= 0
+        assert result.scores[1] > 0
+
+    def test_stopped_bot_plays_its_proposal(self, make_game):
+        """Test a bot stopped at its deadline still plays its best move so far"""
+        game = make_game(ThinkingBot, BestMoveBot, time_s=0.5, seed=1, isolate_bots=True)
+        result = game.start()
+        thinker = game.players[0]
+        first = next(turn for turn in result.history if turn.player == thinker.name)
+        assert first.timed_out
+        assert first.action == "place"
+        assert first.score > 0
+        assert thinker.time_remaining_s <= 0
+
+    def test_crashing_bot_passes(self, make_game):
+        """Test a bot that raises just passes"""
+        result = make_game(CrashingBot, BestMoveBot, seed=1, isolate_bots=True).start()
+        assert all(turn.action == "pass" for turn in result.history if turn.player == "Bot0")
+        assert result.scores[1] > 0
+
+    def test_bot_keeps_state_between_turns(self, make_game, tmp_path):
+        """Test one bot process lives for the whole game"""
+        CountingBot.log_path = tmp_path / "turns.txt"
+        game = make_game(CountingBot, BestMoveBot, seed=1, isolate_bots=True)
+        game.start()
+        lines = [line.split() for line in CountingBot.log_path.read_text().splitlines()]
+        assert len(lines) > 2
+        assert [int(turn) for turn, _ in lines] == list(range(1, len(lines) + 1))
+        assert len({pid for _, pid in lines}) == 1
+        assert lines[0][1] != str(os.getpid())
+        assert game.players[0].api.turns == 0  # the host's copy never runs the bot
+
+    def test_bot_sees_game_state(self, make_game):
+        """Test the bot's copy of the game follows the real one"""
+        result = make_game(SnoopingBot, SnoopingBot, seed=8, isolate_bots=True).start()
+        assert len(result.moves) > 4
+
+    def test_latency_recorded(self, make_game):
+        """Test every turn has its latency"""
+        result = make_game(BestMoveBot, BestMoveBot, seed=1, isolate_bots=True).start()
+        assert all(turn.elapsed_s > 0 for turn in result.history)
+
+    def test_bot_helpers_dont_clash(self, make_game):
+        """Test a bot's own _decide, _release etc. are left alone by the host"""
+        for isolate in (False, True):
+            game = make_game(HelperBot, HelperBot, seed=3, isolate_bots=isolate)
+            result = game.start()
+            assert all(score > 0 for score in result.scores)
+
+    def test_host_cant_serve(self, make_game):
+        """Test a bot in the host's process can't feed itself fake states through serve"""
+        game = make_game(BestMoveBot, BestMoveBot, seed=1, isolate_bots=True)
+        with pytest.raises(RuntimeError):
+            game.players[0].api.serve(None)
+        assert game.players[1].score == 0
+
+    def test_bots_cant_reach_each_others_pipes(self, make_game, tmp_path):
+        """Test a bot forked after another can't use the host's end of the other's pipe"""
+        PipeSnoopingBot.log_path = tmp_path / "pipes.txt"
+        result = make_game(BestMoveBot, PipeSnoopingBot, seed=1, isolate_bots=True).start()
+        assert set(PipeSnoopingBot.log_path.read_text().split()) == {"closed"}
+        assert not any(turn.timed_out for turn in result.history)
+        assert result.scores[0] > 0
@@ -0,0 +1,89 @@
+"""Tests for async bots and playing games concurrently"""
+import asyncio
+import time
+
+from src.api import Api
+from src.scheduler import play_games, run_games
+
+
+class WaitingBot(Api):
+    """asks a pretend server for a move: plays the best one after a wait"""
+
+    waiting = 0
+    most_waiting = 0
+
+    async def _on_turn(self):
+        WaitingBot.waiting += 1
+        WaitingBot.most_waiting = max(WaitingBot.most_waiting, WaitingBot.waiting)
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            WaitingBot.waiting -= 1
+        if self.board.is_empty():
+            for word, is_vertical, x, y, _ in self.generate_moves(best=1):
+                self.place_word(word, is_vertical, x, y)
+        self.pass_turn()
+
+
+class BlockingBot(Api):
+    def _on_turn(self):
+        if self.board.is_empty():
+            for word, is_vertical, x, y, _ in self.generate_moves(best=1):
+                self.place_word(word, is_vertical, x, y)
+        self.pass_turn()
+
+
+class TestAsyncBots:
+    """Test bots with an async _on_turn"""
+
+    def test_async_bot_in_blocking_game(self, make_game):
+        """Test start() runs an async bot to completion"""
+        result = make_game(WaitingBot, BlockingBot, seed=0).start()
+        assert sum(result.scores) > 0
+        assert all(turn.elapsed_s >= 0.05 for turn in result.history if turn.player == "Bot0")
+
+    def test_play(self, make_game):
+        """Test play() gives the same game as start()"""
+        started = make_game(WaitingBot, BlockingBot, seed=5).start()
+        played = asyncio.run(make_game(WaitingBot, BlockingBot, seed=5).play())
+        assert started.scores == played.scores
+        assert [repr(turn.move) for turn in started.history] == [repr(turn.move) for turn in played.history]
+
+
+class TestScheduler:
+    """Test playing many games on one event loop"""
+
+    def test_games_overlap(self, make_game):
+        """Test games progress while bots wait, instead of one after another"""
+        games = [make_game(WaitingBot, WaitingBot, seed=seed) for seed in range(40)]
+        started = time.perf_counter()
+        results = run_games(games)
+        elapsed = time.perf_counter() - started
+        waited = sum(len(result.history) for result in results) * 0.05
+        assert elapsed < waited / 4
+        assert all(result.duration_s >= 0.1 for result in results)
+
+    def test_results_in_order(self, make_game):
+        """Test results line up with the games, and match playing them one at a time"""
+        seeds = [3, 1, 4, 1, 5]
+        results = run_games([make_game(WaitingBot, BlockingBot, seed=seed) for seed in seeds])
+        assert [result.seed for result in results] == seeds
+        for seed, result in zip(seeds, results):
+            alone = make_game(WaitingBot, BlockingBot, seed=seed).start()
+            assert result.scores == alone.scores
+
+    def test_concurrency_limit(self, make_game):
+        """Test no more than concurrency games run at once"""
+        WaitingBot.most_waiting = 0
+        run_games([make_game(WaitingBot, WaitingBot, seed=seed) for seed in range(12)], concurrency=3)
+        assert WaitingBot.most_waiting == 3
+
+    def test_blocking_bots(self, make_game):
+        """Test ordinary bots can share the loop"""
+        results = run_games([make_game(BlockingBot, BlockingBot, seed=seed) for seed in range(3)])
+        assert all(sum(result.scores) > 0 for result in results)
+
+    def test_isolated_bots(self, make_game):
+        """Test bots in their own processes can be scheduled too"""
+        results = asyncio.run(play_games([make_game(WaitingBot, BlockingBot, seed=2, isolate_bots=True)]))
+        assert results[0].scores == make_game(WaitingBot, BlockingBot, seed=2).start().scores
@@ -0,0 +1,101 @@
+"""Tests for batch scoring of placements"""
+import random
+
+import numpy as np
+import pytest
+from src.board import Board
+from src.move import BINGO_BONUS, Move
+from src.scoring import PlacementScorer
+
+
+@pytest.fixture
+def board():
+    return Board()
+
+
+@pytest.fixture
+def scorer(board):
+    return PlacementScorer(board)
+
+
+def measured(board, placements) -> list[int]:
+    return [board.measure(Move(*placement)).total_score for placement in placements]
+
+
+class TestPlacementScorer:
+    """Test PlacementScorer functionality"""
+
+    def test_empty_board(self, board, scorer):
+        """Test premiums under new tiles count, on both axes"""
+        placements = [(7, 7, "cat", False), (7, 5, "cat", True), (3, 7, "quiz", True)]
+        assert scorer.score(placements).tolist() == measured(board, placements)
+
+    def test_through_tiles(self, board, scorer):
+        """Test words running through and on past tiles already there"""
+        for i, letter in enumerate("cat"):
+            board.place(7, 7 + i, letter)
+        placements = [(7, 7, "cats", False), (7, 5, "bocat", False), (6, 8, "oat", True), (8, 6, "to", False)]
+        assert scorer.score(placements).tolist() == measured(board, placements)
+
+    def test_used_premiums(self, board, scorer):
+        """Test premiums already used up don't count again, for old tiles or new"""
+        board.apply(Move(7, 3, "quiz", False))
+        board.apply(Move(7, 3, "quizzes", False))
+        placements = [(6, 3, "aqua", True), (7, 3, "quizzes", False)]
+        assert scorer.score(placements).tolist() == measured(board, placements)
+
+    def test_bingo(self, board, scorer):
+        """Test placing seven tiles adds the bonus"""
+        score = scorer.score([(7, 1, "jackpot", False)])[0]
+        assert score == board.measure(Move(7, 1, "jackpot", False)).total_score
+        assert score > BINGO_BONUS
+
+    def test_misfits(self, board, scorer):
+        """Test placements that don't fit the board raise"""
+        board.place(7, 7, "c")
+        with pytest.raises(ValueError):
+            scorer.score([(7, 7, "at", False)])
+        with pytest.raises(ValueError):
+            scorer.score([(7, 13, "cat", False)])
+        with pytest.raises(ValueError):
+            scorer.score([(-1, 7, "cat", True)])
+
+    def test_nothing_to_score(self, scorer):
+        """Test an empty batch"""
+        scores = scorer.score([])
+        assert isinstance(scores, np.ndarray)
+        assert len(scores) == 0
+
+    def test_follows_board(self, board, scorer):
+        """Test scores change when the board does, and change back on undo"""
+        placement = (7, 8, "at", True)
+        empty = scorer.score([placement])[0]
+        board.apply(Move(8, 6, "cat", False))
+        assert scorer.score([placement])[0] == board.measure(Move(*placement)).total_score != empty
+        board.undo()
+        assert scorer.score([placement])[0] == empty
+
+
+class TestGameScoring:
+    """Test batch scores against the real game"""
+
+    def test_matches_measure(self, game):
+        """Test every generated move over a game scores what measuring it does"""
+        generator = game.move_generator
+        rng = random.Random(3)
+        for _ in range(8):
+            rack = "".join(rng.choice("aabcdeeeilmnorsstu?") for _ in range(7))
+            candidates, scores = generator.scored(rack)
+            assert scores.tolist() == measured(game.board, candidates)
+            if not candidates:
+                break
+            game.board.apply(generator.best(rack)[0])
+            game.cross_checks.update()
+
+    def test_best(self, game):
+        """Test best() agrees with ranking measured moves"""
+        game.board.apply(Move(7, 5, "quest", False))
+        game.cross_checks.update()
+        moves = list(game.move_generator.generate("ratsie?"))
+        best = game.move_generator.best("ratsie?", 5)
+        assert [move.total_score for move in best] == sorted((m.total_score for m in moves), reverse=True)[:5]
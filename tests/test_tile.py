@@ -1,4 +1,6 @@
 """Tests for Tile, TileBag, and BoardTile classes"""
+import random
+
 import pytest
 from src.tile import Tile, TileBag, BoardTile
 
@@ -26,6 +28,11 @@ class TestTile:
         assert tile.letter == "?"
         assert tile  # Blank tile is truthy
 
+    def test_tile_is_slotted(self):
+        """Test tiles carry no per instance dict"""
+        assert not hasattr(Tile("a"), "__dict__")
+        assert not hasattr(BoardTile(), "__dict__")
+
     def test_tile_bool_none(self):
         """Test tile with None is falsy"""
         tile = Tile(None)
@@ -40,6 +47,15 @@ class TestTileBag:
         bag = TileBag()
         assert len(bag) == 100
 
+    def test_tile_bag_seeded(self):
+        """Test that the same seed draws the same way, including after an exchange"""
+        bags = [TileBag(random.Random(42)) for _ in range(2)]
+        drawn = [[tile.letter for tile in bag.draw_n(7)] for bag in bags]
+        assert drawn[0] == drawn[1]
+        for bag in bags:
+            bag.add(bag.draw_n(3))
+        assert [tile.letter for tile in bags[0].draw_n(93)] == [tile.letter for tile in bags[1].draw_n(93)]
+
     def test_tile_bag_distribution(self):
         """Test that tile bag has correct distribution"""
         bag = TileBag()
@@ -101,6 +117,63 @@ class TestTileBag:
         bag.add(tiles_drawn)
         assert len(bag) == 100
 
+    def test_tile_bag_counts(self):
+        """Test counts follow draws and returns"""
+        bag = TileBag()
+        counts = bag.counts()
+        assert len(counts) == 27
+        assert counts[TileBag.slots["e"]] == 12
+        assert counts[TileBag.slots["?"]] == 2
+        assert sum(counts) == 100
+        tiles = bag.draw_n(10)
+        for tile in tiles:
+            counts[TileBag.slots[tile.letter]] -= 1
+        assert bag.counts() == counts
+        bag.add(tiles)
+        assert bag.counts() == TileBag().counts()
+
+    def test_tile_bag_counts_is_a_copy(self):
+        """Test changing counts() doesn't change the bag"""
+        bag = TileBag()
+        bag.counts()[0] = 0
+        assert bag.counts()[0] == 9
+
+    def test_tile_bag_copy(self):
+        """Test a copy draws independently of the original"""
+        bag = TileBag(random.Random(1))
+        bag.draw_n(20)
+        copy = bag.copy()
+        assert copy.counts() == bag.counts()
+        copy.draw_n(50)
+        assert len(bag) == 80
+        assert len(copy) == 30
+        seeded = [bag.copy(random.Random(5)) for _ in range(2)]
+        assert [t.letter for t in seeded[0].draw_n(80)] == [t.letter for t in seeded[1].draw_n(80)]
+
+    def test_tile_bag_interned_tiles(self):
+        """Test bags hand out the same 27 shared tiles"""
+        tiles = TileBag(random.Random(3)).draw_n(100) + TileBag(random.Random(4)).draw_n(100)
+        assert len({id(tile) for tile in tiles}) == 27
+        assert all(tile is TileBag.tiles[tile.letter] for tile in tiles)
+
+    def test_tile_bag_empty(self):
+        """Test drawing everything"""
+        bag = TileBag()
+        assert len(bag.draw_n(120)) == 100
+        assert bag.is_empty()
+        assert bag.draw() is None
+
+    def test_tile_bag_draw_odds(self):
+        """Test each letter comes out as often as its share of the bag"""
+        rng = random.Random(0)
+        draws = 20000
+        seen = dict.fromkeys(TileBag.distribution, 0)
+        for _ in range(draws):
+            seen[TileBag(rng).draw().letter] += 1
+        for letter, count in TileBag.distribution.items():
+            expected = draws * count / 100
+            assert abs(seen[letter] - expected) < 5 * (expected * (1 - count / 100)) ** 0.5 + 1, letter
+
     def test_tile_scores(self):
         """Test that tile scores match Scrabble rules"""
         assert TileBag.scores["?"] == 0
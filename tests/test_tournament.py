@@ -0,0 +1,117 @@
+"""Tests for the tournament runner"""
+import pytest
+from src.tournament import Standing, Tournament, round_robin, swiss_pairings
+from tests.bots import OpeningBot, PassingBot
+
+
+class TestPairings:
+    """Test round robin and Swiss pairings"""
+
+    def test_round_robin(self):
+        """Test that every pair meets exactly once"""
+        assert round_robin(3) == [(0, 1), (0, 2), (1, 2)]
+
+    def test_swiss_pairs_by_points(self):
+        """Test that Swiss pairs the leaders together"""
+        standings = [Standing(str(i)) for i in range(4)]
+        for i, wins in enumerate((0, 3, 1, 2)):
+            standings[i].wins = wins
+        assert swiss_pairings(standings, set()) == [(1, 3), (0, 2)]
+
+    def test_swiss_avoids_rematches(self):
+        """Test that Swiss skips an opponent already played"""
+        standings = [Standing(str(i)) for i in range(4)]
+        for i, wins in enumerate((3, 2, 1, 0)):
+            standings[i].wins = wins
+        assert swiss_pairings(standings, {(0, 1)}) == [(0, 2), (1, 3)]
+
+    def test_swiss_odd_entrant_sits_out(self):
+        """Test that the lowest entrant gets the bye"""
+        standings = [Standing(str(i)) for i in range(3)]
+        standings[0].wins = 1
+        assert swiss_pairings(standings, set()) == [(0, 1)]
+
+
+class TestStanding:
+    """Test a single entrant's record"""
+
+    def test_record(self):
+        """Test wins, draws and losses"""
+        standing = Standing("Bot")
+        standing.record(10, 5)
+        standing.record(5, 5)
+        standing.record(0, 5)
+        assert (standing.wins, standing.draws, standing.losses) == (1, 1, 1)
+        assert standing.points == 1.5
+        assert standing.win_rate == 0.5
+        assert standing.mean_spread == 0
+
+    def test_confidence_interval(self):
+        """Test the interval contains the win rate and narrows with more games"""
+        few, many = Standing("few"), Standing("many")
+        for _ in range(10):
+            few.record(1, 0)
+            few.record(0, 1)
+        for _ in range(1000):
+            many.record(1, 0)
+            many.record(0, 1)
+        low, high = few.confidence_interval()
+        assert low < 0.5 < high
+        many_low, many_high = many.confidence_interval()
+        assert high - low > many_high - many_low
+
+    def test_confidence_interval_no_games(self):
+        """Test an empty record knows nothing"""
+        assert Standing("Bot").confidence_interval() == (0.0, 1.0)
+
+
+class TestTournament:
+    """Test running tournaments"""
+
+    def test_needs_two_bots(self):
+        """Test that one bot can't have a tournament"""
+        with pytest.raises(ValueError):
+            Tournament([PassingBot])
+
+    def test_duplicate_names(self):
+        """Test that the same bot twice gets told apart"""
+        tournament = Tournament([PassingBot, PassingBot], workers=1)
+        assert tournament.names == ["PassingBot#1", "PassingBot#2"]
+
+    def test_round_robin_in_process(self):
+        """Test that a bot that plays beats one that doesn't"""
+        table = Tournament([PassingBot, OpeningBot], games_per_pair=4, workers=1).run()
+        assert [standing.name for standing in table] == ["OpeningBot", "PassingBot"]
+        assert table[0].wins == 4
+        assert table[1].losses == 4
+
+    def test_swiss(self):
+        """Test that each Swiss round plays every pairing"""
+        tournament = Tournament([PassingBot, OpeningBot, PassingBot], games_per_pair=2, swiss_rounds=2, workers=1)
+        table = tournament.run()
+        assert tournament.games_played == 4
+        assert sum(standing.games for standing in table) == 8
+
+    def test_process_pool(self):
+        """Test that games spread over processes give the same results"""
+        in_process = Tournament([PassingBot, OpeningBot], games_per_pair=4, workers=1).run()
+        pooled = Tournament([PassingBot, OpeningBot], games_per_pair=4, workers=2).run()
+        assert [(s.name, s.wins, s.total_score) for s in pooled] == [
+            (s.name, s.wins, s.total_score) for s in in_process
+        ]
+
+    def test_latency(self):
+        """Test each entrant's time per turn is kept"""
+        table = Tournament([PassingBot, OpeningBot], games_per_pair=2, workers=1).run()
+        for standing in table:
+            assert standing.turns > 0
+            assert 0 < standing.mean_latency_s <= standing.max_latency_s
+            assert standing.timeouts == 0
+
+    def test_isolated_bots(self):
+        """Test bots in their own processes give the same results, in a pool too"""
+        in_process = Tournament([PassingBot, OpeningBot], games_per_pair=2, workers=1).run()
+        isolated = Tournament([PassingBot, OpeningBot], games_per_pair=2, workers=2, isolate_bots=True).run()
+        assert [(s.name, s.wins, s.total_score, s.turns) for s in isolated] == [
+            (s.name, s.wins, s.total_score, s.turns) for s in in_process
+        ]
@@ -0,0 +1,61 @@
+"""Tests for TranspositionTable"""
+import pytest
+from src.board import Board
+from src.transposition import TranspositionTable
+
+
+class TestTranspositionTable:
+    """Test TranspositionTable functionality"""
+
+    def test_put_and_get(self):
+        """Test storing and fetching a result"""
+        table = TranspositionTable()
+        table.put(1234, ["a", "b"], 42)
+        assert table.get(1234, ["a", "b"]) == 42
+        assert (1234, ["a", "b"]) in table
+        assert table.get(1234, ["a"]) is None
+        assert table.get(99, ["a", "b"], default="miss") == "miss"
+
+    def test_rack_order_ignored(self):
+        """Test that racks are keyed as multisets"""
+        table = TranspositionTable()
+        table.put(1, "cab", "x")
+        assert table.get(1, ["b", "a", "c"]) == "x"
+
+    def test_bounded(self):
+        """Test that the oldest entry is evicted when full"""
+        table = TranspositionTable(max_size=2)
+        table.put(1, "", "one")
+        table.put(2, "", "two")
+        table.get(1)  # 1 is now the most recently used
+        table.put(3, "", "three")
+        assert len(table) == 2
+        assert (2, "") not in table
+        assert table.get(1) == "one"
+        assert table.get(3) == "three"
+
+    def test_hit_counts(self):
+        """Test hit and miss statistics"""
+        table = TranspositionTable()
+        table.put(1, "a", 0)
+        table.get(1, "a")
+        table.get(2, "a")
+        assert (table.hits, table.misses) == (1, 1)
+        table.clear()
+        assert len(table) == 0 and table.hits == 0
+
+    def test_invalid_size(self):
+        """Test that the table must hold something"""
+        with pytest.raises(ValueError):
+            TranspositionTable(0)
+
+    def test_keyed_by_board_hash(self):
+        """Test using a real board position as the key"""
+        table = TranspositionTable()
+        board = Board()
+        board.place(7, 7, "a")
+        table.put(board.hash, "xyz", 10)
+
+        other = Board()
+        other.place(7, 7, "a")
+        assert table.get(other.hash, "zyx") == 10
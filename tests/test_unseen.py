@@ -0,0 +1,104 @@
+"""Tests for unseen tile counts and draw odds"""
+import random
+from itertools import combinations
+from math import comb
+
+import numpy as np
+import pytest
+from src.tile import TileBag
+from src.unseen import LETTERS, SLOTS, UnseenTiles, full_counts
+
+
+def unseen_of(letters: str) -> UnseenTiles:
+    counts = [0] * len(LETTERS)
+    for letter in letters:
+        counts[SLOTS[letter]] += 1
+    return UnseenTiles(counts)
+
+
+def brute_force(pool: str, n: int, accept) -> float:
+    """share of all the n tile draws from pool that accept likes"""
+    draws = list(combinations(range(len(pool)), n))
+    return sum(bool(accept("".join(pool[i] for i in draw))) for draw in draws) / len(draws)
+
+
+class TestUnseenTiles:
+    """Test UnseenTiles counts and probabilities"""
+
+    def test_full_counts(self):
+        """Test a full set matches the bag"""
+        unseen = UnseenTiles(full_counts())
+        assert unseen.total == 100
+        assert unseen["e"] == 12
+        assert unseen["?"] == 2
+        assert unseen.as_dict() == {letter: TileBag.distribution[letter] for letter in LETTERS}
+
+    def test_read_only(self):
+        """Test the counts can't be changed by accident"""
+        with pytest.raises(ValueError):
+            UnseenTiles(full_counts()).counts[0] = 0
+
+    def test_pmf(self):
+        """Test the table is hypergeometric and each row sums to one"""
+        unseen = UnseenTiles(full_counts())
+        table = unseen.pmf(7)
+        assert table.shape == (27, 8)
+        assert np.allclose(table.sum(axis=1), 1)
+        e = SLOTS["e"]
+        for j in range(8):
+            assert table[e, j] == pytest.approx(comb(12, j) * comb(88, 7 - j) / comb(100, 7))
+        assert table[SLOTS["z"], 2] == 0
+
+    def test_p_at_least(self):
+        """Test at least k against counting every draw"""
+        pool = "aabcsse?"
+        unseen = unseen_of(pool)
+        for k in (1, 2):
+            odds = unseen.p_at_least(3, k)
+            for letter in set(pool):
+                assert odds[SLOTS[letter]] == pytest.approx(
+                    brute_force(pool, 3, lambda draw: draw.count(letter) >= k)
+                )
+        assert odds[SLOTS["z"]] == 0
+
+    def test_p_any(self):
+        """Test any of some letters against counting every draw"""
+        pool = "aabcsse?"
+        assert unseen_of(pool).p_any("s?", 2) == pytest.approx(
+            brute_force(pool, 2, lambda draw: "s" in draw or "?" in draw)
+        )
+
+    def test_p_draw(self):
+        """Test drawing a set of letters against counting every draw"""
+        pool = "aabcssee?t"
+        unseen = unseen_of(pool)
+        for letters in ("s", "es", "ss", "sse", "ab?"):
+            for n in (2, 3, 4):
+                expected = brute_force(
+                    pool, n, lambda draw: all(draw.count(letter) >= letters.count(letter) for letter in letters)
+                )
+                assert unseen.p_draw(letters, n) == pytest.approx(expected), (letters, n)
+
+    def test_p_draw_impossible(self):
+        """Test letters that aren't there, or too many of them for the draws"""
+        unseen = unseen_of("aabcs")
+        assert unseen.p_draw("z", 3) == 0
+        assert unseen.p_draw("ss", 3) == 0
+        assert unseen.p_draw("abc", 2) == 0
+
+    def test_draws_capped_at_pool(self):
+        """Test drawing more than there is draws everything"""
+        unseen = unseen_of("abs")
+        assert unseen.p_draw("abs", 7) == 1
+        with pytest.raises(ValueError):
+            unseen.pmf(-1)
+
+    def test_matches_bag(self):
+        """Test the odds agree with really drawing from a bag"""
+        rng = random.Random(0)
+        trials = 4000
+        hits = sum(
+            any(tile.letter == "s" for tile in TileBag(rng).draw_n(7)) for _ in range(trials)
+        )
+        expected = UnseenTiles(full_counts()).p_at_least(7)[SLOTS["s"]]
+        assert abs(hits / trials - expected) < 0.03